@@ -1,7 +1,4 @@
 
-import pandas as pd
-import numpy as np
-import yfinance as yf
 from datetime import datetime  # Correct import
 import logging
 
@@ -13,6 +10,7 @@ class RealTimeExtractor:
         
     def get_financial_data(self, symbols=None):
         """Extract real-time financial data"""
+        import yfinance as yf  # deferred: keeps `import AutoDataAnalyst` cheap
         if symbols is None:
             symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA']
             
@@ -42,6 +40,7 @@ class RealTimeExtractor:
 
     def get_historical_data(self, symbol, period="1y"):
         """Get historical price data"""
+        import yfinance as yf
         try:
             ticker = yf.Ticker(symbol)
             hist = ticker.history(period=period)
@@ -3,6 +3,9 @@ AutoDataAnalyst - Advanced Financial Data Analysis
 High-precision ML models with 95%+ accuracy
 """
 
+# Bound eagerly: the submodule shares the class name, so importing it first
+# would otherwise leave the package attribute pointing at the module.
+# yfinance is imported inside the methods, so this stays cheap.
 from .RealTimeExtractor import RealTimeExtractor
 
 __version__ = "1.0.0"
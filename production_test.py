@@ -6,108 +6,116 @@ Tests the entire pipeline from data to trading signals
 
 import sys
 import os
-import importlib.util
-import pandas as pd
 
-def import_class(file_path, class_name):
-    """Import a class directly from file path"""
-    try:
-        spec = importlib.util.spec_from_file_location(class_name, file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return getattr(module, class_name)
-    except Exception as e:
-        print(f"❌ Failed to import {class_name}: {e}")
-        return None
+from src.analytics_engine.business_analytics import BusinessAnalytics
+from src.analytics_engine.portfolio_optimizer import IncrementalCovarianceEstimator, PortfolioOptimizer
+from src.analytics_engine.report_generation import ReportGenerator
+from src.analytics_engine.streaming_metrics import StreamingAnalytics
+from src.analytics_engine.trading_strategy import TradingStrategy
+from src.data_pipeline.data_ingestion import DataIngestionEngine
+from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+from src.orchestration.stage_pipeline import StagePipeline
+from src.utils.config_loader import ConfigLoader
+from src.utils.instrumentation import instrumentation
 
 def run_production_test():
     print("🚀 PRODUCTION READY PIPELINE TEST")
     print("=" * 60)
-    
-    # Import all production components
-    components = {
-        'DataIngestion': ('src/data_pipeline/data_ingestion.py', 'DataIngestionEngine'),
-        'EnhancedFeatures': ('src/data_pipeline/enhanced_features.py', 'EnhancedFeatureEngine'),
-        'OptimizedTraining': ('src/ml_pipeline/optimized_training.py', 'OptimizedMLTrainingEngine'),
-        'TradingStrategy': ('src/analytics_engine/trading_strategy.py', 'TradingStrategy'),
-        'BusinessAnalytics': ('src/analytics_engine/business_analytics.py', 'BusinessAnalytics'),
-        'ReportGenerator': ('src/analytics_engine/report_generation.py', 'ReportGenerator'),
-        'ConfigLoader': ('src/utils/config_loader.py', 'ConfigLoader')
-    }
-    
-    engines = {}
-    print("🔧 Loading production engines...")
-    for name, (path, class_name) in components.items():
-        engines[name] = import_class(path, class_name)
-        if engines[name]:
-            print(f"   ✅ {name}: Loaded")
-        else:
-            print(f"   ❌ {name}: Failed")
-            return False
-    
-    print("\n🎯 All engines loaded successfully!")
+    instrumentation.configure_from_env()
     
     # Initialize engines
-    config_loader = engines['ConfigLoader']()
-    data_engine = engines['DataIngestion']()
-    feature_engine = engines['EnhancedFeatures']()
-    ml_engine = engines['OptimizedTraining']()
-    strategy_engine = engines['TradingStrategy']()
-    analytics_engine = engines['BusinessAnalytics']()
-    report_engine = engines['ReportGenerator']()
+    config_loader = ConfigLoader()
+    data_engine = DataIngestionEngine()
+    feature_engine = EnhancedFeatureEngine()
+    ml_engine = OptimizedMLTrainingEngine()
+    strategy_engine = TradingStrategy()
+    retention_seconds = config_loader.get('analytics.retention_days', 30) * 86400
+    analytics_engine = BusinessAnalytics(StreamingAnalytics(
+        config_loader.get('analytics.rollup_path', 'reports/metrics_rollups.sqlite'),
+        bucket_seconds=config_loader.get('analytics.bucket_seconds', 3600),
+        retention_seconds=retention_seconds
+    ))
+    report_engine = ReportGenerator()
     
     # Get configuration
     symbols = config_loader.get('data_sources.symbols', ['AAPL', 'MSFT', 'GOOGL'])
     portfolio_value = config_loader.get('trading.portfolio_value', 10000)
+    portfolio_optimizer = PortfolioOptimizer(
+        max_positions=config_loader.get('trading.max_positions', 5),
+        risk_per_trade=config_loader.get('trading.risk_per_trade', 0.02),
+        max_weight=config_loader.get('trading.max_weight'),
+        target_volatility=config_loader.get('trading.target_volatility', 0.10)
+    )
+    allocation_method = config_loader.get('trading.allocation_method', 'risk_parity')
     
-    print(f"\n📊 PHASE 1: Data Collection")
-    print(f"   Symbols: {symbols}")
-    raw_data = data_engine.get_financial_data(symbols, period='1y')
+    # Stream each symbol through fetch -> features -> training as soon as
+    # its previous stage finishes, instead of strict phase barriers
+    raw_closes = {}
     
-    if not raw_data:
-        print("❌ No data collected")
-        return False
-    
-    print(f"   ✅ Collected {len(raw_data)} symbols")
+    def fetch(symbol, _):
+        data = data_engine.get_financial_data([symbol], period='1y').get(symbol)
+        if data is not None:
+            raw_closes[symbol] = data[['Close']]
+        return data
     
-    print(f"\n🔧 PHASE 2: Enhanced Feature Engineering")
-    features_data = {}
-    for symbol, data in raw_data.items():
-        features = feature_engine.create_enhanced_features(data, symbol)
+    def featurize(symbol, data):
+        with instrumentation.symbol_scope(symbol):
+            features = feature_engine.create_enhanced_features(data, symbol)
         if features is not None:
-            features_data[symbol] = features
             print(f"   ✅ {symbol}: {len(features.columns)} features, {len(features)} samples")
+        return features
+    
+    def train(symbol, features_df):
+        if 'target' not in features_df.columns or len(features_df) <= 30:
+            return None
+        X = features_df.drop('target', axis=1)
+        y = features_df['target']
+        with instrumentation.symbol_scope(symbol):
+            results = ml_engine.train_optimized_models(X, y)
+        if results:
+            best_acc = max(r['accuracy'] for r in results.values())
+            print(f"   ✅ {symbol}: {best_acc:.1%} accuracy")
+        return results
     
-    if not features_data:
-        print("❌ No features generated")
+    pipeline = StagePipeline([
+        ('fetch', fetch, config_loader.get('pipeline.fetch_workers', 8)),
+        ('features', featurize, config_loader.get('pipeline.feature_workers', 2)),
+        ('training', train, config_loader.get('pipeline.training_workers', 2))
+    ], queue_size=config_loader.get('pipeline.queue_size', 16))
+    
+    print(f"\n📊 PHASES 1-3: Data Collection → Enhanced Features → Optimized Training")
+    print(f"   Symbols: {symbols}")
+    model_results = pipeline.run((symbol, None) for symbol in symbols)
+    
+    if not raw_closes:
+        print("❌ No data collected")
         return False
     
-    print(f"\n🤖 PHASE 3: Optimized Model Training")
-    model_results = {}
-    for symbol, features_df in features_data.items():
-        if 'target' in features_df.columns and len(features_df) > 30:
-            X = features_df.drop('target', axis=1)
-            y = features_df['target']
-            results = ml_engine.train_optimized_models(X, y)
-            model_results[symbol] = results
-            
-            if results:
-                best_acc = max(r['accuracy'] for r in results.values())
-                print(f"   ✅ {symbol}: {best_acc:.1%} accuracy")
+    print(f"   ✅ Collected {len(raw_closes)} symbols, trained {len(model_results)}")
+    pipeline.print_report()
     
     print(f"\n💼 PHASE 4: Trading Strategy & Analytics")
     if model_results:
-        # Generate trading signals
-        signals = strategy_engine.generate_signals(model_results)
-        positions = strategy_engine.calculate_position_size(signals, portfolio_value)
+        # Generate trading signals (best-model reduction shared with analytics)
+        signal_frame = strategy_engine.generate_signal_frame(model_results)
+        covariance = IncrementalCovarianceEstimator.from_price_data(raw_closes)
+        portfolio_optimizer.allocate(signal_frame, covariance, portfolio_value, allocation_method)
+        signals = signal_frame.to_dict()
+        positions = signal_frame.positions()
         
         # Generate analytics
-        metrics = analytics_engine.calculate_performance_metrics(model_results)
+        analytics_engine.record_results(signal_frame)
+        metrics = analytics_engine.calculate_performance_metrics(signal_frame)
+        rolling = analytics_engine.rolling_performance_metrics(retention_seconds)
+        analytics_engine.streaming.close()
         report = report_engine.generate_trading_report(signals, positions, portfolio_value)
         
         print(f"   📈 Performance Metrics:")
         print(f"      • Average Accuracy: {metrics.get('average_accuracy', 0):.1%}")
         print(f"      • Success Rate: {metrics.get('success_rate', 0):.1%}")
+        print(f"      • Rolling Accuracy: {rolling.get('average_accuracy', 0):.1%} "
+              f"over {rolling.get('total_observations', 0)} symbol runs")
         print(f"      • Strong Signals: {len([s for s in signals.values() if s['action'] == 'BUY'])}")
         
         print(f"\n   💰 Portfolio Allocation:")
@@ -122,6 +130,14 @@ def run_production_test():
         print(f"      • Allocated: ${total_allocated:,.2f}")
         print(f"      • Cash: ${portfolio_value - total_allocated:,.2f}")
         print(f"      • Allocation Rate: {total_allocated/portfolio_value:.1%}")
+        print(f"      • Failed Symbols: {len(pipeline.report['errors'])}")
+        for symbol, error in pipeline.report['errors'].items():
+            print(f"         ❌ {symbol} ({error})")
+        
+        if instrumentation.enabled:
+            metrics_dir = os.environ.get('AUTODATA_METRICS_DIR', 'reports')
+            instrumentation.write(metrics_dir)
+            print(f"\n   🔬 Instrumentation written to {metrics_dir}/instrumentation.json|.prom")
         
         print(f"\n🎉 PRODUCTION TEST COMPLETED SUCCESSFULLY! 🚀")
         return True
@@ -129,7 +145,7 @@ def run_production_test():
         print("❌ No model results for trading")
         return False
 
-if __name__ == "__main__":
+def main():
     success = run_production_test()
     if success:
         print("\n" + "=" * 60)
@@ -143,3 +159,6 @@ if __name__ == "__main__":
     else:
         print("\n💥 PRODUCTION TEST FAILED")
         sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+AutoDataAnalyst - Benchmark Script
+Times every pipeline stage on seeded synthetic market data and flags regressions
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cli import benchmark
+
+if __name__ == "__main__":
+    benchmark()
@@ -4,22 +4,34 @@ AutoDataAnalyst - Model Evaluation Script
 Evaluates model performance with comprehensive metrics
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
-import matplotlib.pyplot as plt
-import seaborn as sns
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ml_pipeline.evaluation import BatchEvaluationEngine
+
+def evaluate_batch(predictions: pd.DataFrame, n_bootstrap: int = 200):
+    """Evaluate stacked (symbol, model, fold) predictions into one results table"""
+    return BatchEvaluationEngine(n_bootstrap=n_bootstrap).evaluate(predictions)
 
 def evaluate_model(y_true, y_pred, y_proba=None):
     """Comprehensive model evaluation"""
     print("🎯 MODEL PERFORMANCE EVALUATION")
     print("=" * 40)
     
-    accuracy = accuracy_score(y_true, y_pred)
-    precision = precision_score(y_true, y_pred)
-    recall = recall_score(y_true, y_pred)
-    f1 = f1_score(y_true, y_pred)
+    predictions = pd.DataFrame({'y_true': y_true, 'y_pred': y_pred})
+    if y_proba is not None:
+        predictions['y_score'] = y_proba
+    row = evaluate_batch(predictions).iloc[0]
+    
+    accuracy = row['accuracy']
+    precision = row['precision']
+    recall = row['recall']
+    f1 = row['f1']
     
     print(f"📊 Accuracy: {accuracy:.4f} ({accuracy*100:.2f}%)")
     print(f"🎯 Precision: {precision:.4f} ({precision*100:.2f}%)")
@@ -27,11 +39,11 @@ def evaluate_model(y_true, y_pred, y_proba=None):
     print(f"⚖️ F1-Score: {f1:.4f} ({f1*100:.2f}%)")
     
     if y_proba is not None:
-        roc_auc = roc_auc_score(y_true, y_proba)
+        roc_auc = row['roc_auc']
         print(f"📈 ROC-AUC: {roc_auc:.4f} ({roc_auc*100:.2f}%)")
     
     print("\n📋 Classification Report:")
-    print(classification_report(y_true, y_pred))
+    print(classification_report(row))
     
     return {
         'accuracy': accuracy,
@@ -41,6 +53,22 @@ def evaluate_model(y_true, y_pred, y_proba=None):
         'roc_auc': roc_auc if y_proba is not None else None
     }
 
+def classification_report(row) -> str:
+    """Per-class precision/recall/F1 table from a row of confusion counts"""
+    tn, fp, fn, tp = (int(row[c]) for c in ('tn', 'fp', 'fn', 'tp'))
+    lines = [f"{'':>12}{'precision':>10}{'recall':>10}{'f1-score':>10}{'support':>10}", ""]
+
+    # Class 0 swaps the roles of positives and negatives
+    for label, (hit, false_pos, miss) in ((0, (tn, fn, fp)), (1, (tp, fp, fn))):
+        precision = hit / (hit + false_pos) if hit + false_pos else 0.0
+        recall = hit / (hit + miss) if hit + miss else 0.0
+        f1 = 2 * hit / (2 * hit + false_pos + miss) if hit else 0.0
+        lines.append(f"{label:>12}{precision:>10.2f}{recall:>10.2f}{f1:>10.2f}{hit + miss:>10}")
+
+    lines.append("")
+    lines.append(f"{'accuracy':>12}{'':>20}{row['accuracy']:>10.2f}{int(row['n']):>10}")
+    return "\n".join(lines)
+
 def main():
     print("🚀 AutoDataAnalyst - Model Evaluation")
     print("=" * 40)
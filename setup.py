@@ -12,6 +12,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     packages=find_packages(),
+    py_modules=["production_test"],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Financial and Insurance Industry",
@@ -29,4 +30,11 @@ setup(
         "seaborn>=0.11.0",
         "yfinance>=0.2.0",
     ],
+    entry_points={
+        "console_scripts": [
+            "autodata-pipeline=src.cli:pipeline",
+            "autodata-benchmark=src.cli:benchmark",
+            "autodata-serve=src.cli:serve",
+        ],
+    },
 )
@@ -1,35 +1,65 @@
 
 import pandas as pd
 import numpy as np
+from typing import Dict, Optional, Union
+
+from src.analytics_engine.signal_frame import SignalFrame
+from src.analytics_engine.streaming_metrics import StreamingAnalytics
 
 class BusinessAnalytics:
     """Business intelligence and performance analytics"""
     
-    def __init__(self):
-        """Initialize Business Analytics engine"""
-        pass
+    def __init__(self, streaming: Optional[StreamingAnalytics] = None):
+        """Initialize Business Analytics engine, optionally feeding streaming rollups"""
+        self.streaming = streaming
+    
+    def record_results(self, model_results: Union[Dict, SignalFrame], timestamp: Optional[float] = None):
+        """Feed one training round into the streaming rollups, once per round"""
+        if self.streaming is not None:
+            self.streaming.update_results(model_results, timestamp)
     
-    def calculate_performance_metrics(self, model_results: dict):
-        """Calculate key performance metrics"""
+    def calculate_performance_metrics(self, model_results: Union[Dict, SignalFrame]):
+        """Calculate key performance metrics (read-only; see record_results)"""
         metrics = {}
         
-        if model_results:
-            accuracies = []
-            for symbol, results in model_results.items():
-                if results:
-                    best_acc = max(r['accuracy'] for r in results.values())
-                    accuracies.append(best_acc)
-            
-            if accuracies:
-                metrics['average_accuracy'] = np.mean(accuracies)
-                metrics['max_accuracy'] = np.max(accuracies)
-                metrics['min_accuracy'] = np.min(accuracies)
-                metrics['success_rate'] = len([acc for acc in accuracies if acc > 0.55]) / len(accuracies)
-                metrics['total_symbols'] = len(accuracies)
+        if isinstance(model_results, SignalFrame):
+            frame = model_results
+        else:
+            frame = SignalFrame.from_model_results(model_results or {})
+        
+        accuracies = frame.accuracy
+        if len(accuracies):
+            metrics['average_accuracy'] = np.mean(accuracies)
+            metrics['max_accuracy'] = np.max(accuracies)
+            metrics['min_accuracy'] = np.min(accuracies)
+            metrics['success_rate'] = np.count_nonzero(accuracies > 0.55) / len(accuracies)
+            metrics['total_symbols'] = len(accuracies)
+        
+        return metrics
+    
+    def rolling_performance_metrics(self, window_seconds: Optional[float] = None):
+        """Performance metrics over a trailing window from the streaming rollups"""
+        metrics = {}
+        if self.streaming is None:
+            return metrics
+        
+        accuracy = self.streaming.query('accuracy', window_seconds)
+        if accuracy.stats.count:
+            metrics['average_accuracy'] = accuracy.stats.mean
+            metrics['max_accuracy'] = accuracy.stats.max
+            metrics['min_accuracy'] = accuracy.stats.min
+            metrics['median_accuracy'] = accuracy.sketch.quantile(0.5)
+            metrics['success_rate'] = self.streaming.query('success', window_seconds).stats.mean
+            metrics['total_observations'] = accuracy.stats.count
+        
+        hits = self.streaming.query('hit_rate', window_seconds)
+        if hits.stats.count:
+            metrics['hit_rate'] = hits.stats.mean
+            metrics['realized_outcomes'] = hits.stats.count
         
         return metrics
     
-    def generate_performance_report(self, model_results: dict):
+    def generate_performance_report(self, model_results: Union[Dict, SignalFrame]):
         """Generate a comprehensive performance report"""
         metrics = self.calculate_performance_metrics(model_results)
         
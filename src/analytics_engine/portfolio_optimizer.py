@@ -0,0 +1,258 @@
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from src.analytics_engine.signal_frame import SignalFrame
+
+TRADING_DAYS = 252
+
+def _closes(financial_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Close prices side by side, oldest first"""
+    return pd.DataFrame({symbol: df['Close'] for symbol, df in financial_data.items()}).sort_index()
+
+class IncrementalCovarianceEstimator:
+    """Running mean/covariance of daily returns with shrinkage"""
+
+    def __init__(self, symbols: List[str]):
+        """Initialize an empty estimator for a fixed symbol universe"""
+        self.symbols = list(symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        n = len(self.symbols)
+        self.count = 0
+        self.mean = np.zeros(n)
+        self._m2 = np.zeros((n, n))
+        self._shrunk = None
+        self.shrinkage = None
+        self.last_timestamp = None
+
+    @classmethod
+    def from_price_data(cls, financial_data: Dict[str, pd.DataFrame]):
+        """Seed an estimator from per-symbol OHLCV frames"""
+        closes = _closes(financial_data)
+        estimator = cls(list(closes.columns))
+        estimator.update(closes.pct_change().iloc[1:])
+        estimator.last_timestamp = closes.index[-1] if len(closes) else None
+        return estimator
+
+    def extended(self, financial_data: Dict[str, pd.DataFrame]) -> 'IncrementalCovarianceEstimator':
+        """Copy with only the returns after last_timestamp merged in
+
+        The original is left untouched for readers still using it. A
+        changed symbol universe cannot be merged, so it re-seeds instead.
+        """
+        closes = _closes(financial_data)
+        if self.last_timestamp is None or set(closes.columns) != set(self.symbols):
+            return type(self).from_price_data(financial_data)
+
+        returns = closes.pct_change()
+        new = returns[returns.index > self.last_timestamp]
+        if new.empty:
+            return self
+
+        estimator = type(self)(self.symbols)
+        estimator.count, estimator.mean, estimator._m2 = self.count, self.mean.copy(), self._m2.copy()
+        estimator.update(new)
+        estimator.last_timestamp = new.index[-1]
+        return estimator
+
+    def update(self, returns):
+        """Merge one day (1-D) or a block of days (2-D) of returns into the estimate"""
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(columns=self.symbols).to_numpy(dtype=float)
+        elif isinstance(returns, pd.Series):
+            returns = returns.reindex(self.symbols).to_numpy(dtype=float)
+
+        block = np.atleast_2d(np.asarray(returns, dtype=float))
+        if block.shape[0] == 0:
+            return self
+
+        # Missing returns are treated as flat days
+        block = np.nan_to_num(block, nan=0.0, posinf=0.0, neginf=0.0)
+
+        # Chan et al. parallel merge of (count, mean, co-moment)
+        n_b = block.shape[0]
+        mean_b = block.mean(axis=0)
+        centered = block - mean_b
+        m2_b = centered.T @ centered
+
+        total = self.count + n_b
+        delta = mean_b - self.mean
+        self._m2 += m2_b + np.outer(delta, delta) * (self.count * n_b / total)
+        self.mean += delta * (n_b / total)
+        self.count = total
+        self._shrunk = None
+        return self
+
+    def covariance(self) -> np.ndarray:
+        """Sample covariance of the returns seen so far"""
+        if self.count < 2:
+            return np.zeros_like(self._m2)
+        return self._m2 / (self.count - 1)
+
+    def shrunk_covariance(self) -> np.ndarray:
+        """Oracle Approximating Shrinkage estimate toward a scaled identity"""
+        if self._shrunk is not None:
+            return self._shrunk
+
+        n_assets = len(self.symbols)
+        if self.count < 2 or n_assets == 0:
+            return np.zeros_like(self._m2)
+
+        emp = self._m2 / self.count
+        mu = np.trace(emp) / n_assets
+        alpha = np.mean(emp ** 2)
+        num = alpha + mu ** 2
+        den = (self.count + 1.0) * (alpha - mu ** 2 / n_assets)
+        self.shrinkage = 1.0 if den == 0 else min(num / den, 1.0)
+
+        shrunk = (1.0 - self.shrinkage) * emp
+        shrunk.flat[::n_assets + 1] += self.shrinkage * mu
+        self._shrunk = shrunk
+        return shrunk
+
+    def indices(self, symbols: List[str]) -> np.ndarray:
+        """Positions of the given symbols in the estimator's universe"""
+        return np.array([self._index[s] for s in symbols], dtype=int)
+
+class PortfolioOptimizer:
+    """Risk-aware portfolio construction on top of trading signals"""
+
+    METHODS = ('mean_variance', 'risk_parity', 'volatility_target')
+
+    def __init__(self, max_positions: Optional[int] = 5, risk_per_trade: float = 0.02,
+                 max_weight: Optional[float] = None, target_volatility: float = 0.10):
+        """Initialize with the trading.* limits
+
+        max_weight caps each position (default 1 / max_positions) and
+        target_volatility is the annualized goal of 'volatility_target'.
+        """
+        self.max_positions = max_positions
+        self.risk_per_trade = risk_per_trade
+        if max_weight is None:
+            max_weight = 1.0 / max_positions if max_positions else 1.0
+        self.max_weight = max_weight
+        self.target_volatility = target_volatility
+
+    def allocate(self, frame: SignalFrame, estimator: IncrementalCovarianceEstimator,
+                 portfolio_value: float = 10000, method: str = 'risk_parity'):
+        """Fill the frame's allocation array using the chosen construction method"""
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown allocation method: {method}")
+
+        frame.allocation = np.zeros(len(frame))
+        selected = self._select(frame, estimator)
+        if len(selected) == 0:
+            return frame
+
+        idx = estimator.indices([frame.symbols[i] for i in selected])
+        cov = estimator.shrunk_covariance()[np.ix_(idx, idx)]
+        vol = np.sqrt(np.clip(np.diag(cov), 1e-12, None))
+
+        gross = 1.0
+        if method == 'mean_variance':
+            weights = self._mean_variance(cov, estimator.mean[idx])
+        elif method == 'risk_parity':
+            weights = self._risk_parity(cov)
+        else:
+            weights, gross = self._volatility_target(cov, vol)
+
+        weights = self._apply_risk_limits(weights, vol, gross)
+        frame.allocation[selected] = weights * portfolio_value
+        return frame
+
+    def _select(self, frame: SignalFrame, estimator: IncrementalCovarianceEstimator) -> np.ndarray:
+        """Buy signals with return history, strongest first, capped at max_positions"""
+        known = np.array([s in estimator._index for s in frame.symbols], dtype=bool)
+        candidates = np.flatnonzero((frame.codes > 0) & known)
+
+        order = np.lexsort((-frame.accuracy[candidates], -frame.codes[candidates]))
+        candidates = candidates[order]
+        if self.max_positions is not None:
+            candidates = candidates[:self.max_positions]
+        return candidates
+
+    def _mean_variance(self, cov: np.ndarray, expected: np.ndarray) -> np.ndarray:
+        """Long-only tangency weights via an active-set solve, min-variance fallback
+
+        A singular covariance (under two return observations it is all zeros,
+        or returns are perfectly collinear) falls back to risk parity.
+        """
+        try:
+            weights = self._long_only_solve(cov, expected)
+            if weights.sum() <= 0:
+                weights = self._long_only_solve(cov, np.ones(len(expected)))
+        except np.linalg.LinAlgError:
+            return self._risk_parity(cov)
+        return weights / weights.sum() if weights.sum() > 0 else weights
+
+    def _long_only_solve(self, cov: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """Solve cov @ w = rhs, dropping negative weights until all are positive"""
+        weights = np.zeros(len(rhs))
+        active = np.ones(len(rhs), dtype=bool)
+
+        while active.any():
+            sub = np.linalg.solve(cov[np.ix_(active, active)], rhs[active])
+            if (sub > 0).all():
+                weights[active] = sub
+                break
+            active[np.flatnonzero(active)[sub <= 0]] = False
+
+        return weights
+
+    def _risk_parity(self, cov: np.ndarray, tol: float = 1e-8, max_iter: int = 500) -> np.ndarray:
+        """Equal risk contribution weights by multiplicative fixed-point iteration"""
+        vol = np.sqrt(np.clip(np.diag(cov), 1e-12, None))
+        weights = (1.0 / vol) / (1.0 / vol).sum()
+        target = 1.0 / len(weights)
+
+        for _ in range(max_iter):
+            marginal = cov @ weights
+            contrib = weights * marginal
+            total = contrib.sum()
+            if total <= 0:
+                break
+            share = contrib / total
+            if np.max(np.abs(share - target)) < tol:
+                break
+            weights = weights * np.sqrt(target / np.clip(share, 1e-12, None))
+            weights /= weights.sum()
+
+        return weights
+
+    def _volatility_target(self, cov: np.ndarray, vol: np.ndarray):
+        """Inverse-volatility weights and the gross exposure that hits target_volatility"""
+        weights = (1.0 / vol) / (1.0 / vol).sum()
+        daily_target = self.target_volatility / np.sqrt(TRADING_DAYS)
+        portfolio_vol = np.sqrt(max(weights @ cov @ weights, 0.0))
+        gross = min(daily_target / portfolio_vol, 1.0) if portfolio_vol > 0 else 1.0
+        return weights, gross
+
+    def _apply_risk_limits(self, weights: np.ndarray, vol: np.ndarray, gross: float = 1.0) -> np.ndarray:
+        """Scale to gross exposure, then cap each position and hand the excess to the rest
+
+        A position is capped at max_weight and at risk_per_trade of one-day
+        volatility. Whatever cannot be placed under the caps stays in cash.
+        """
+        weights = np.clip(weights, 0, None)
+        if weights.sum() <= 0:
+            return weights
+        weights = weights / weights.sum() * gross
+
+        caps = np.full(len(weights), self.max_weight)
+        if self.risk_per_trade:
+            caps = np.minimum(caps, self.risk_per_trade / vol)
+
+        capped = np.zeros(len(weights), dtype=bool)
+        while True:
+            over = ~capped & (weights > caps)
+            if not over.any():
+                break
+            excess = (weights[over] - caps[over]).sum()
+            weights[over] = caps[over]
+            capped |= over
+            free = ~capped & (weights > 0)
+            if not free.any():
+                break
+            weights[free] += excess * weights[free] / weights[free].sum()
+        return weights
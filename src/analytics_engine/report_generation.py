@@ -1,6 +1,11 @@
 
 import pandas as pd
+from collections import Counter
 from datetime import datetime
+from typing import List, Optional, Union
+
+from src.analytics_engine.trade_sink import TradeReportSink
+from src.utils.instrumentation import instrumented
 
 class ReportGenerator:
     """Generate professional reports"""
@@ -9,32 +14,53 @@ class ReportGenerator:
         """Initialize Report Generator"""
         pass
     
+    @instrumented('report.trading')
     def generate_trading_report(self, signals: dict, positions: dict, portfolio_value: float):
         """Generate a comprehensive trading report"""
         
+        total_allocated = sum(positions.values())
         report = {
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'portfolio_value': portfolio_value,
             'signals': signals,
             'positions': positions,
-            'total_allocated': sum(positions.values()),
-            'cash_remaining': portfolio_value - sum(positions.values()),
-            'allocation_rate': sum(positions.values()) / portfolio_value
+            'total_allocated': total_allocated,
+            'cash_remaining': portfolio_value - total_allocated,
+            'allocation_rate': total_allocated / portfolio_value
         }
         
         return report
     
-    def generate_execution_report(self, trades: list):
-        """Generate trade execution report"""
+    @instrumented('report.execution')
+    def generate_execution_report(self, trades: Union[List, TradeReportSink],
+                                  include_trades: Optional[bool] = None):
+        """Generate trade execution report
+        
+        include_trades defaults to True for lists. A TradeReportSink is
+        summarized from its running aggregates and points at its file via
+        trades_path; include_trades=True reads the full log into a list.
+        """
+        if isinstance(trades, TradeReportSink):
+            if not len(trades):
+                return {"message": "No trades executed"}
+            report = trades.summary()
+            if include_trades:
+                report['trades'] = list(trades.iter_trades())
+            return report
+        
+        if include_trades is None:
+            include_trades = True
         if not trades:
             return {"message": "No trades executed"}
-            
+        
+        actions = Counter(t.get('action') for t in trades)
         report = {
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'total_trades': len(trades),
-            'buy_trades': len([t for t in trades if t.get('action') == 'BUY']),
-            'sell_trades': len([t for t in trades if t.get('action') == 'SELL']),
-            'trades': trades
+            'buy_trades': actions.get('BUY', 0),
+            'sell_trades': actions.get('SELL', 0)
         }
+        if include_trades:
+            report['trades'] = trades
         
         return report
@@ -0,0 +1,78 @@
+
+import numpy as np
+from typing import Dict, List, Optional
+
+# Signal codes shared by the columnar strategy and analytics paths
+HOLD, BUY, STRONG_BUY = 0, 1, 2
+SIGNAL_NAMES = np.array(['HOLD', 'BUY', 'STRONG_BUY'])
+CONFIDENCE_NAMES = np.array(['LOW', 'MEDIUM', 'HIGH'])
+ACTION_NAMES = np.array(['HOLD', 'BUY', 'BUY'])
+
+
+class SignalFrame:
+    """Columnar trading signals: one array entry per symbol"""
+
+    def __init__(self, symbols: List[str], accuracy: np.ndarray,
+                 probability: Optional[np.ndarray] = None,
+                 codes: Optional[np.ndarray] = None,
+                 allocation: Optional[np.ndarray] = None):
+        """Initialize the frame from aligned per-symbol arrays"""
+        self.symbols = list(symbols)
+        self.accuracy = np.asarray(accuracy, dtype=float)
+        n = len(self.symbols)
+        self.probability = (np.asarray(probability, dtype=float)
+                            if probability is not None else np.full(n, np.nan))
+        self.codes = (np.asarray(codes, dtype=np.int8)
+                      if codes is not None else np.zeros(n, dtype=np.int8))
+        self.allocation = (np.asarray(allocation, dtype=float)
+                           if allocation is not None else np.zeros(n))
+
+    @classmethod
+    def from_model_results(cls, model_results: Dict):
+        """Reduce per-symbol model results to their best accuracy in one pass"""
+        symbols, accuracy, probability = [], [], []
+
+        for symbol, results in model_results.items():
+            if results:
+                best = max(results.values(), key=lambda r: r['accuracy'])
+                symbols.append(symbol)
+                accuracy.append(best['accuracy'])
+                probability.append(best.get('probability', np.nan))
+
+        return cls(symbols, np.array(accuracy, dtype=float), np.array(probability, dtype=float))
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def counts(self) -> np.ndarray:
+        """Number of symbols per signal code"""
+        return np.bincount(self.codes, minlength=len(SIGNAL_NAMES))
+
+    def to_dict(self) -> Dict:
+        """Adapter to the nested per-symbol dict returned by generate_signals"""
+        signals = SIGNAL_NAMES[self.codes]
+        confidence = CONFIDENCE_NAMES[self.codes]
+        action = ACTION_NAMES[self.codes]
+
+        return {
+            symbol: {
+                'signal': str(signals[i]),
+                'confidence': str(confidence[i]),
+                'accuracy': float(self.accuracy[i]),
+                'action': str(action[i])
+            }
+            for i, symbol in enumerate(self.symbols)
+        }
+
+    def positions(self) -> Dict[str, float]:
+        """Adapter to the per-symbol allocation dict returned by calculate_position_size"""
+        return dict(zip(self.symbols, self.allocation.tolist()))
+
+    @classmethod
+    def from_signals(cls, signals: Dict):
+        """Build a frame from the nested per-symbol signal dict"""
+        lookup = {name: code for code, name in enumerate(SIGNAL_NAMES)}
+        symbols = list(signals.keys())
+        accuracy = np.array([s['accuracy'] for s in signals.values()], dtype=float)
+        codes = np.array([lookup[s['signal']] for s in signals.values()], dtype=np.int8)
+        return cls(symbols, accuracy, codes=codes)
@@ -0,0 +1,322 @@
+
+import json
+import math
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, Optional
+
+from src.analytics_engine.signal_frame import SignalFrame
+
+class RunningStats:
+    """Mergeable count / Welford mean-variance / min / max accumulator"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value: float):
+        """Fold in one observation (Welford)"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        return self
+
+    def merge(self, other: 'RunningStats'):
+        """Combine with another accumulator (Chan et al. parallel update)"""
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, state: Dict):
+        stats = cls()
+        stats.count, stats.mean, stats.m2 = state['count'], state['mean'], state['m2']
+        stats.min, stats.max = state['min'], state['max']
+        return stats
+
+class QuantileSketch:
+    """Mergeable log-bucketed quantile sketch with bounded relative error (DDSketch)"""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def update(self, value: float):
+        """Add one observation"""
+        self.count += 1
+        if value > 1e-12:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + 1
+        elif value < -1e-12:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + 1
+        else:
+            self.zero_count += 1
+        return self
+
+    def merge(self, other: 'QuantileSketch'):
+        """Add another sketch's bucket counts into this one"""
+        for key, c in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + c
+        for key, c in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0-1)"""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': self.positive,
+            'negative': self.negative,
+            'zero_count': self.zero_count,
+            'count': self.count
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict):
+        sketch = cls(state['relative_accuracy'])
+        sketch.positive = {int(k): v for k, v in state['positive'].items()}
+        sketch.negative = {int(k): v for k, v in state['negative'].items()}
+        sketch.zero_count, sketch.count = state['zero_count'], state['count']
+        return sketch
+
+class MetricAccumulator:
+    """Running stats plus quantile sketch for one metric"""
+
+    def __init__(self, stats: Optional[RunningStats] = None, sketch: Optional[QuantileSketch] = None):
+        self.stats = stats or RunningStats()
+        self.sketch = sketch or QuantileSketch()
+
+    def update(self, value: float):
+        self.stats.update(value)
+        self.sketch.update(value)
+        return self
+
+    def merge(self, other: 'MetricAccumulator'):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, std, min/max and median/p90"""
+        if self.stats.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.stats.count,
+            'mean': self.stats.mean,
+            'std': math.sqrt(self.stats.variance),
+            'min': self.stats.min,
+            'max': self.stats.max,
+            'p50': self.sketch.quantile(0.5),
+            'p90': self.sketch.quantile(0.9)
+        }
+
+    def to_dict(self) -> Dict:
+        return {'stats': self.stats.to_dict(), 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state: Dict):
+        return cls(RunningStats.from_dict(state['stats']), QuantileSketch.from_dict(state['sketch']))
+
+class StreamingAnalytics:
+    """Time-bucketed metric rollups that stay small over long-running operation
+
+    Buckets are flushed to store_path whenever a newer bucket opens, and
+    buckets older than retention_seconds are dropped from memory (they stay
+    in the store). Call close(), or use it as a context manager, to persist
+    the open bucket.
+    """
+
+    def __init__(self, store_path: Optional[str] = None, bucket_seconds: int = 3600,
+                 retention_seconds: Optional[float] = 30 * 86400):
+        """Initialize rollups, reloading retained buckets from store_path"""
+        self.store_path = store_path
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self.buckets: Dict[str, Dict[int, MetricAccumulator]] = {}
+        self.late = 0
+        self._dirty = set()
+        self._latest: Optional[int] = None
+        if store_path and os.path.exists(store_path):
+            self._load()
+
+    def _bucket(self, timestamp: Optional[float]) -> int:
+        timestamp = time.time() if timestamp is None else timestamp
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def _cutoff(self) -> Optional[int]:
+        """Oldest bucket kept in memory"""
+        if self.retention_seconds is None or self._latest is None:
+            return None
+        return self._bucket(self._latest - self.retention_seconds)
+
+    def record(self, metric: str, value: float, timestamp: Optional[float] = None):
+        """Add one observation of a metric to its time bucket
+
+        Observations older than the retention window are counted in late
+        and skipped, since their bucket may already have been evicted.
+        """
+        bucket = self._bucket(timestamp)
+        if self._latest is None or bucket > self._latest:
+            rollover = self._latest is not None
+            self._latest = bucket
+            if rollover:
+                self.flush()
+                self._evict()
+        else:
+            cutoff = self._cutoff()
+            if cutoff is not None and bucket < cutoff:
+                self.late += 1
+                return
+
+        series = self.buckets.setdefault(metric, {})
+        acc = series.get(bucket)
+        if acc is None:
+            acc = series[bucket] = MetricAccumulator()
+        acc.update(float(value))
+        if self.store_path:
+            self._dirty.add((metric, bucket))
+
+    def _evict(self):
+        """Drop buckets that fell out of the retention window"""
+        cutoff = self._cutoff()
+        if cutoff is None:
+            return
+        for series in self.buckets.values():
+            for bucket in [b for b in series if b < cutoff]:
+                del series[bucket]
+
+    def update_results(self, model_results, timestamp: Optional[float] = None):
+        """Record best-model accuracy and success per symbol from a training round"""
+        if isinstance(model_results, SignalFrame):
+            frame = model_results
+        else:
+            frame = SignalFrame.from_model_results(model_results or {})
+        for accuracy in frame.accuracy.tolist():
+            self.record('accuracy', accuracy, timestamp)
+            self.record('success', float(accuracy > 0.55), timestamp)
+
+    def record_outcome(self, predicted_up: bool, realized_return: float,
+                       timestamp: Optional[float] = None):
+        """Record a realized outcome against the signal that was issued"""
+        self.record('hit_rate', float(bool(predicted_up) == (realized_return > 0)), timestamp)
+        self.record('realized_return', realized_return, timestamp)
+        if predicted_up:
+            self.record('signal_return', realized_return, timestamp)
+
+    def query(self, metric: str, window_seconds: Optional[float] = None,
+              end: Optional[float] = None) -> MetricAccumulator:
+        """Merged accumulator over a trailing window, touching only its buckets"""
+        series = self.buckets.get(metric, {})
+        result = MetricAccumulator()
+
+        if window_seconds is None:
+            buckets = series.values()
+        else:
+            last = self._bucket(end)
+            first = self._bucket((end if end is not None else time.time()) - window_seconds)
+            buckets = (series[b] for b in range(first, last + 1, self.bucket_seconds) if b in series)
+
+        for acc in buckets:
+            result.merge(acc)
+        return result
+
+    def summary(self, window_seconds: Optional[float] = None, end: Optional[float] = None) -> Dict:
+        """Summary of every metric over a trailing window"""
+        return {metric: self.query(metric, window_seconds, end).summary() for metric in self.buckets}
+
+    def flush(self):
+        """Persist buckets changed since the last flush"""
+        if not self.store_path or not self._dirty:
+            return
+        directory = os.path.dirname(self.store_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(sqlite3.connect(self.store_path)) as conn, conn:
+            self._ensure_table(conn)
+            conn.executemany(
+                "INSERT OR REPLACE INTO rollups (metric, bucket, state) VALUES (?, ?, ?)",
+                [(m, b, json.dumps(self.buckets[m][b].to_dict())) for m, b in self._dirty]
+            )
+        self._dirty.clear()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load(self):
+        """Reload persisted buckets inside the retention window"""
+        with closing(sqlite3.connect(self.store_path)) as conn, conn:
+            self._ensure_table(conn)
+            self._latest = conn.execute("SELECT MAX(bucket) FROM rollups").fetchone()[0]
+            cutoff = self._cutoff()
+            rows = conn.execute("SELECT metric, bucket, state FROM rollups WHERE bucket >= ?",
+                                (cutoff if cutoff is not None else -2 ** 63,))
+            for metric, bucket, state in rows:
+                self.buckets.setdefault(metric, {})[bucket] = MetricAccumulator.from_dict(json.loads(state))
+
+    @staticmethod
+    def _ensure_table(conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rollups "
+            "(metric TEXT, bucket INTEGER, state TEXT, PRIMARY KEY (metric, bucket))"
+        )
@@ -0,0 +1,103 @@
+
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+import pandas as pd
+
+class TradeReportSink:
+    """Append-only JSONL trade log with running aggregates for summary reports"""
+
+    def __init__(self, path: str, batch_size: int = 10000, append: bool = True):
+        """Initialize sink writing to path in batches of batch_size trades
+
+        With append an existing log is kept and its trades are folded into
+        the aggregates; otherwise the file is truncated.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+
+        self.total_trades = 0
+        self.actions = Counter()
+        self.symbols = Counter()
+        self.notional = Counter()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if append and os.path.exists(path):
+            for trade in self.iter_trades():
+                self._fold(trade)
+        else:
+            open(path, 'w').close()
+
+    def _fold(self, trade: Dict):
+        """Add one trade to the running aggregates"""
+        action = trade.get('action')
+        self.total_trades += 1
+        self.actions[action] += 1
+        self.symbols[trade.get('symbol')] += 1
+        if 'quantity' in trade and 'price' in trade:
+            self.notional[action] += trade['quantity'] * trade['price']
+
+    def append(self, trade: Dict):
+        """Buffer one trade and fold it into the aggregates"""
+        self._fold(trade)
+        self._buffer.append(json.dumps(trade, default=str))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def extend(self, trades: Iterable[Dict]):
+        """Buffer many trades"""
+        for trade in trades:
+            self.append(trade)
+
+    def flush(self):
+        """Write buffered trades to disk in one append"""
+        if self._buffer:
+            with open(self.path, 'a') as file:
+                file.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.total_trades
+
+    def summary(self) -> Dict:
+        """Execution summary computed from the running aggregates only"""
+        return {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'total_trades': self.total_trades,
+            'buy_trades': self.actions.get('BUY', 0),
+            'sell_trades': self.actions.get('SELL', 0),
+            'symbols_traded': len(self.symbols),
+            'notional_by_action': dict(self.notional),
+            'trades_path': self.path
+        }
+
+    def iter_trades(self) -> Iterator[Dict]:
+        """Lazily read trades back one at a time"""
+        self.flush()
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+    def read_trades(self, chunksize: int = 100000):
+        """Lazily read trades back as pandas DataFrame chunks"""
+        self.flush()
+        return pd.read_json(self.path, lines=True, chunksize=chunksize)
@@ -1,64 +1,60 @@
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Union
+
+from src.analytics_engine.signal_frame import SignalFrame, HOLD, BUY, STRONG_BUY
+from src.utils.instrumentation import instrumented
 
 class TradingStrategy:
     """Implements trading strategies based on model predictions"""
     
     def generate_signals(self, model_results: Dict, min_confidence: float = 0.55):
         """Generate trading signals based on model confidence"""
+        return self.generate_signal_frame(model_results, min_confidence).to_dict()
+    
+    @instrumented('strategy.signals')
+    def generate_signal_frame(self, model_results: Union[Dict, SignalFrame], min_confidence: float = 0.55):
+        """Generate columnar trading signals in a single vectorized pass"""
+        
+        if isinstance(model_results, SignalFrame):
+            frame = model_results
+        else:
+            frame = SignalFrame.from_model_results(model_results)
         
-        signals = {}
+        acc = frame.accuracy
+        qualified = acc >= min_confidence
         
-        for symbol, results in model_results.items():
-            if results:
-                best_acc = max(r['accuracy'] for r in results.values())
-                
-                if best_acc >= min_confidence:
-                    # Strong buy signal
-                    if best_acc > 0.60:
-                        signal = "STRONG_BUY"
-                        confidence = "HIGH"
-                    elif best_acc > 0.55:
-                        signal = "BUY" 
-                        confidence = "MEDIUM"
-                    else:
-                        signal = "HOLD"
-                        confidence = "LOW"
-                else:
-                    signal = "HOLD"
-                    confidence = "LOW"
-                    
-                signals[symbol] = {
-                    'signal': signal,
-                    'confidence': confidence,
-                    'accuracy': best_acc,
-                    'action': 'BUY' if signal in ['STRONG_BUY', 'BUY'] else 'HOLD'
-                }
+        # Strong buy above 60%, buy above 55%, otherwise hold
+        frame.codes = np.where(
+            qualified & (acc > 0.60), STRONG_BUY,
+            np.where(qualified & (acc > 0.55), BUY, HOLD)
+        ).astype(np.int8)
         
-        return signals
+        return frame
     
-    def calculate_position_size(self, signals: Dict, portfolio_value: float = 10000):
+    def calculate_position_size(self, signals: Union[Dict, SignalFrame], portfolio_value: float = 10000):
         """Calculate position sizes based on signal strength"""
         
-        positions = {}
-        strong_signals = [s for s in signals.values() if s['signal'] == 'STRONG_BUY']
-        medium_signals = [s for s in signals.values() if s['signal'] == 'BUY']
+        if isinstance(signals, SignalFrame):
+            return self.allocate(signals, portfolio_value).positions()
+        
+        return self.allocate(SignalFrame.from_signals(signals), portfolio_value).positions()
+    
+    @instrumented('strategy.allocation')
+    def allocate(self, frame: SignalFrame, portfolio_value: float = 10000):
+        """Fill the frame's allocation array from signal counts"""
+        
+        counts = frame.counts()
+        n_strong, n_medium = counts[STRONG_BUY], counts[BUY]
+        per_code = np.zeros(len(counts))
         
-        if strong_signals:
+        if n_strong:
             # Allocate more to strong signals
-            strong_allocation = portfolio_value * 0.6 / len(strong_signals)
-            medium_allocation = portfolio_value * 0.4 / len(medium_signals) if medium_signals else 0
+            per_code[STRONG_BUY] = portfolio_value * 0.6 / n_strong
+            per_code[BUY] = portfolio_value * 0.4 / n_medium if n_medium else 0
         else:
-            strong_allocation = 0
-            medium_allocation = portfolio_value * 1.0 / len(medium_signals) if medium_signals else 0
+            per_code[BUY] = portfolio_value * 1.0 / n_medium if n_medium else 0
         
-        for symbol, signal_info in signals.items():
-            if signal_info['signal'] == 'STRONG_BUY':
-                positions[symbol] = strong_allocation
-            elif signal_info['signal'] == 'BUY':
-                positions[symbol] = medium_allocation
-            else:
-                positions[symbol] = 0
-                
-        return positions
+        frame.allocation = per_code[frame.codes]
+        return frame
@@ -0,0 +1,157 @@
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+# Entry points installed by setup.py. Each imports its engines inside the
+# function so `autodata-* --help` and worker spawns start without pandas,
+# sklearn or yfinance.
+
+DEFAULT_BENCHMARK_HISTORY = os.path.join("benchmarks", "history.json")
+
+def pipeline(argv: Optional[List[str]] = None):
+    """autodata-pipeline: run the full data → signals pipeline"""
+    argparse.ArgumentParser(
+        prog='autodata-pipeline', description="Run the AutoDataAnalyst production pipeline"
+    ).parse_args(argv)
+
+    from production_test import main
+    main()
+
+def serve(argv: Optional[List[str]] = None):
+    """autodata-serve: keep data, features and models warm behind a local HTTP API"""
+    parser = argparse.ArgumentParser(prog='autodata-serve', description="AutoDataAnalyst warm pipeline service")
+    parser.add_argument('--config', default="config/config.yaml", help="YAML config path")
+    parser.add_argument('--host', help="bind address (default: service.host or 127.0.0.1)")
+    parser.add_argument('--port', type=int, help="TCP port (default: service.port or 8765)")
+    parser.add_argument('--unix-socket', help="serve on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, help="request worker threads (default: service.workers or 4)")
+    parser.add_argument('--cache-ttl', type=float, help="response cache TTL in seconds")
+    parser.add_argument('--source', choices=('yahoo', 'synthetic', 'replay'), default='yahoo',
+                        help="market data source")
+    parser.add_argument('--replay-dir', help="directory of <SYMBOL>.csv/.parquet files for --source replay")
+    parser.add_argument('--no-warm', action='store_true', help="skip the initial data load and training")
+    parser.add_argument('--no-watch-config', action='store_true', help="don't hot-reload the config file")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    from src.orchestration.service import PipelineService, create_server
+    from src.utils.config_loader import ConfigLoader
+
+    config = ConfigLoader(args.config)
+    if not args.no_watch_config:
+        config.start_watching()
+    data_engine = None
+    if args.source != 'yahoo':
+        from src.data_pipeline.replay_source import BarReplaySource, ReplayDataIngestionEngine
+        symbols = config.get('data_sources.symbols', ['AAPL', 'MSFT', 'GOOGL'])
+        if args.source == 'replay':
+            if not args.replay_dir:
+                parser.error("--source replay requires --replay-dir")
+            source = BarReplaySource.from_directory(args.replay_dir)
+        else:
+            source = BarReplaySource.synthetic(symbols, days=2 * 252)
+        data_engine = ReplayDataIngestionEngine(source)
+
+    service = PipelineService(config, data_engine, cache_ttl=args.cache_ttl)
+    if not args.no_warm:
+        print("🔥 Warming up: loading data, features and models...")
+        result = service.refresh()
+        print(f"✅ Loaded {len(service.state.models)} models in {result['seconds']:.1f}s")
+
+    server = create_server(
+        service,
+        host=args.host or config.get('service.host', '127.0.0.1'),
+        port=args.port or config.get('service.port', 8765),
+        unix_socket=args.unix_socket,
+        workers=args.workers or config.get('service.workers', 4),
+        verbose=args.verbose
+    )
+    where = args.unix_socket or "http://%s:%s" % server.server_address[:2]
+    print(f"🚀 Serving on {where} (GET /health /score /signals /report /stats, POST /refresh)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Shutting down")
+    finally:
+        server.server_close()
+
+def benchmark(argv: Optional[List[str]] = None):
+    """autodata-benchmark: run the benchmark suite or compare recorded runs"""
+    parser = argparse.ArgumentParser(prog='autodata-benchmark', description="AutoDataAnalyst benchmark suite")
+    parser.add_argument('--history', default=DEFAULT_BENCHMARK_HISTORY, help="JSON history file")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run benchmarks and append to the history")
+    run_parser.add_argument('--full', action='store_true', help="10-10,000 symbols x 1-30 years")
+    run_parser.add_argument('--symbols', type=int, nargs='+', help="symbol counts to run")
+    run_parser.add_argument('--years', type=int, nargs='+', help="history lengths in years")
+    run_parser.add_argument('--groups', nargs='+',
+                            choices=('ingestion', 'features', 'training', 'signals', 'reporting'))
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--repeat', type=int, default=3, help="keep the best of N timings")
+    run_parser.add_argument('--sample-cap', type=int,
+                            help="max symbols timed by per-symbol cases (default: the grid's caps, 0: no cap)")
+    run_parser.add_argument('--label', help="free-form note stored with the run")
+    run_parser.add_argument('--compare', action='store_true', help="compare against the previous run")
+    run_parser.add_argument('--threshold', type=float, default=0.10)
+
+    compare_parser = commands.add_parser('compare', help="compare two recorded runs")
+    compare_parser.add_argument('--baseline', type=int, default=-2, help="history index (default: previous)")
+    compare_parser.add_argument('--current', type=int, default=-1, help="history index (default: latest)")
+    compare_parser.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    sys.exit(_run_benchmarks(args) if args.command == 'run' else _compare_benchmarks(args))
+
+def _run_benchmarks(args) -> int:
+    from src.utils.benchmark_suite import (
+        BenchmarkSuite, CASE_GROUPS, FULL_SCALES, QUICK_SCALES, append_history, compare_runs
+    )
+
+    scales = FULL_SCALES if args.full else QUICK_SCALES
+    if args.sample_cap is None:
+        sample_caps = scales['sample_caps']
+    elif args.sample_cap > 0:
+        sample_caps = {group: args.sample_cap for group in ('ingestion', 'features', 'training')}
+    else:
+        sample_caps = None
+    suite = BenchmarkSuite(seed=args.seed, repeat=args.repeat, sample_caps=sample_caps)
+    result = suite.run(args.symbols or scales['symbols'], args.years or scales['years'],
+                       args.groups or CASE_GROUPS)
+    if args.label:
+        result['label'] = args.label
+
+    history = append_history(args.history, result)
+    print(f"\n💾 Recorded run #{len(history)} to {args.history} ({result['wall_time_s']:.1f}s)")
+
+    if args.compare and len(history) > 1:
+        return 1 if _print_comparison(compare_runs(history[-2], result, args.threshold), args.threshold) else 0
+    return 0
+
+def _compare_benchmarks(args) -> int:
+    from src.utils.benchmark_suite import compare_runs, load_history
+
+    history = load_history(args.history)
+    if len(history) < 2:
+        print(f"⚠️ Need at least two runs in {args.history} to compare")
+        return 0
+    baseline, current = history[args.baseline], history[args.current]
+    print(f"🔍 Comparing {baseline['timestamp']} ({baseline.get('commit')}) → "
+          f"{current['timestamp']} ({current.get('commit')})\n")
+    return 1 if _print_comparison(compare_runs(baseline, current, args.threshold), args.threshold) else 0
+
+def _print_comparison(rows, threshold: float) -> int:
+    """Print a comparison table and return the number of regressions"""
+    icons = {'regression': '❌', 'improvement': '🚀', 'ok': '✅'}
+    for row in rows:
+        sampled = row.get('measured_symbols', row['symbols'])
+        scale = f"{row['symbols']} sym" if sampled == row['symbols'] else f"{sampled}/{row['symbols']} sym"
+        print(f"{icons[row['status']]} {row['case']:<28} {scale:>12} {row['years']:>3}y  "
+              f"{row['baseline_per_symbol_s'] * 1000:>10.3f} → {row['current_per_symbol_s'] * 1000:>10.3f} ms/symbol "
+              f"({row['ratio'] - 1:+.1%})")
+
+    regressions = sum(row['status'] == 'regression' for row in rows)
+    print(f"\n📊 {len(rows)} cases compared, {regressions} regressed beyond {threshold:.0%}")
+    return regressions
@@ -1,27 +1,57 @@
-import yfinance as yf
 import pandas as pd
 from typing import Dict, List
 
+from src.utils.instrumentation import instrumentation
+
 class DataIngestionEngine:
     """Handles all data collection from financial markets"""
     
     def get_financial_data(self, symbols: List[str], period: str = "2y") -> Dict[str, pd.DataFrame]:
         """Gets stock data for multiple companies"""
+        # yfinance (and its HTTP stack) is only imported once data is fetched
+        import yfinance as yf
         financial_data = {}
         
         for symbol in symbols:
             try:
                 print(f"📊 Fetching {symbol}...")
-                stock = yf.Ticker(symbol)
-                hist = stock.history(period=period)
+                with instrumentation.timer('ingestion', symbol):
+                    stock = yf.Ticker(symbol)
+                    hist = stock.history(period=period)
+                instrumentation.count('ingestion.rows', len(hist))
                 
                 if len(hist) > 100:
                     financial_data[symbol] = hist
                     print(f"✅ {symbol}: Got {len(hist)} days of data")
                 else:
+                    instrumentation.count('ingestion.insufficient')
                     print(f"⚠️ {symbol}: Not enough data")
                     
             except Exception as e:
+                instrumentation.count('ingestion.failures')
                 print(f"❌ Failed on {symbol}: {e}")
         
         return financial_data
+    
+    def get_intraday_data(self, symbols: List[str], interval: str = "1m", period: str = "7d") -> Dict[str, pd.DataFrame]:
+        """Gets intraday bars (1m/5m/...) for multiple companies"""
+        import yfinance as yf
+        intraday_data = {}
+        
+        for symbol in symbols:
+            try:
+                print(f"📊 Fetching {symbol} {interval} bars...")
+                with instrumentation.timer('ingestion.intraday', symbol):
+                    stock = yf.Ticker(symbol)
+                    hist = stock.history(period=period, interval=interval)
+                
+                if len(hist) > 0:
+                    intraday_data[symbol] = hist
+                    print(f"✅ {symbol}: Got {len(hist)} {interval} bars")
+                else:
+                    print(f"⚠️ {symbol}: No intraday data")
+                    
+            except Exception as e:
+                print(f"❌ Failed on {symbol}: {e}")
+        
+        return intraday_data
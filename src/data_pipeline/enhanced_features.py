@@ -1,55 +1,85 @@
 
 import pandas as pd
 import numpy as np
-from typing import List
+from typing import List, Sequence, Tuple
+
+from src.data_pipeline.labels import LabelEngine
+from src.utils.instrumentation import instrumented
 
 class EnhancedFeatureEngine:
     """Advanced feature engineering for better predictions"""
     
+    # Feature groups in column order; each adds its columns to df in place
+    FEATURE_GROUPS = (
+        'price', 'moving_averages', 'volatility', 'volume',
+        'momentum', 'support_resistance', 'trend', 'target'
+    )
+    
+    @instrumented('features')
     def create_enhanced_features(self, df: pd.DataFrame, symbol: str = ""):
         """Creates more sophisticated trading features"""
         df = df.copy()
-        
-        # 1. Price-based features
+        for group in self.FEATURE_GROUPS:
+            getattr(self, f'add_{group}_features')(df)
+        return df.dropna()
+    
+    def add_price_features(self, df: pd.DataFrame):
+        """1. Price-based features"""
         df['returns'] = df['Close'].pct_change()
         df['log_returns'] = np.log(df['Close'] / df['Close'].shift(1))
-        
-        # 2. Multiple moving averages
+    
+    def add_moving_averages_features(self, df: pd.DataFrame):
+        """2. Multiple moving averages"""
         for window in [5, 10, 20, 50]:
             df[f'sma_{window}'] = df['Close'].rolling(window).mean()
             df[f'ema_{window}'] = df['Close'].ewm(span=window).mean()
             df[f'price_vs_sma_{window}'] = df['Close'] / df[f'sma_{window}'] - 1
-        
-        # 3. Volatility features
+    
+    def add_volatility_features(self, df: pd.DataFrame):
+        """3. Volatility features (needs returns)"""
         df['volatility_5d'] = df['returns'].rolling(5).std()
         df['volatility_20d'] = df['returns'].rolling(20).std()
         df['volatility_ratio'] = df['volatility_5d'] / df['volatility_20d']
-        
-        # 4. Volume features
+    
+    def add_volume_features(self, df: pd.DataFrame):
+        """4. Volume features (needs returns)"""
         df['volume_sma_10'] = df['Volume'].rolling(10).mean()
         df['volume_ratio'] = df['Volume'] / df['volume_sma_10']
         df['volume_price_trend'] = df['Volume'] * df['returns']
-        
-        # 5. Price momentum
+    
+    def add_momentum_features(self, df: pd.DataFrame):
+        """5. Price momentum"""
         df['momentum_5'] = df['Close'] / df['Close'].shift(5) - 1
         df['momentum_10'] = df['Close'] / df['Close'].shift(10) - 1
         df['rsi_14'] = self.calculate_rsi(df['Close'], 14)
-        
-        # 6. Support and resistance levels
+    
+    def add_support_resistance_features(self, df: pd.DataFrame):
+        """6. Support and resistance levels"""
         df['resistance_20'] = df['High'].rolling(20).max()
         df['support_20'] = df['Low'].rolling(20).min()
         df['price_vs_resistance'] = df['Close'] / df['resistance_20'] - 1
         df['price_vs_support'] = df['Close'] / df['support_20'] - 1
-        
-        # 7. Market regime detection - FIXED VERSION
+    
+    def add_trend_features(self, df: pd.DataFrame):
+        """7. Market regime detection - FIXED VERSION"""
         df['trend_strength'] = df['Close'].rolling(20).apply(
             lambda x: (x.iloc[-1] - x.iloc[0]) / (x.std() + 1e-8)
         )
+    
+    def add_target_features(self, df: pd.DataFrame):
+        """8. Better target: Will price increase by 2% in next 5 days?"""
+        df['target'] = LabelEngine().create_target(df['Close'], horizon=5, threshold=0.02)
+    
+    @instrumented('features.labels')
+    def create_feature_label_matrix(self, df: pd.DataFrame, horizons: Sequence[int] = (5,),
+                                    thresholds: Sequence[float] = (0.02,)) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Features once, plus a horizons x thresholds label matrix on the same rows"""
+        features = self.create_enhanced_features(df).drop(columns='target')
+        labels = LabelEngine().create_label_matrix(df['Close'], horizons, thresholds).loc[features.index]
         
-        # 8. Better target: Will price increase by 2% in next 5 days?
-        df['target'] = (df['Close'].shift(-5) > df['Close'] * 1.02).astype(int)
-        
-        return df.dropna()
+        # Keep rows where every horizon has a realized future price
+        complete = labels.notna().all(axis=1)
+        return features[complete], labels[complete].astype(int)
     
     def calculate_rsi(self, prices: pd.Series, window: int = 14):
         """Calculate Relative Strength Index"""
@@ -1,5 +1,8 @@
 import pandas as pd
 import numpy as np
+from typing import Sequence, Tuple
+
+from src.data_pipeline.labels import LabelEngine
 
 class FeatureEngine:
     """Builds smart features from raw market data"""
@@ -24,6 +27,16 @@ class FeatureEngine:
         df['volume_boost'] = df['Volume'] / df['volume_sma_20']
         
         # What we're trying to predict: will stock go up in next 5 days?
-        df['target'] = (df['Close'].shift(-5) > df['Close']).astype(int)
+        df['target'] = LabelEngine().create_target(df['Close'], horizon=5, threshold=0.0)
         
         return df.dropna()
+    
+    def create_feature_label_matrix(self, df: pd.DataFrame, horizons: Sequence[int] = (5,),
+                                    thresholds: Sequence[float] = (0.0,)) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Features once, plus a horizons x thresholds label matrix on the same rows"""
+        features = self.create_advanced_features(df).drop(columns='target')
+        labels = LabelEngine().create_label_matrix(df['Close'], horizons, thresholds).loc[features.index]
+        
+        # Keep rows where every horizon has a realized future price
+        complete = labels.notna().all(axis=1)
+        return features[complete], labels[complete].astype(int)
@@ -0,0 +1,40 @@
+
+import numpy as np
+import pandas as pd
+from typing import Sequence
+
+class LabelEngine:
+    """Forward-looking classification targets over several horizons and thresholds"""
+
+    @staticmethod
+    def label_name(horizon: int, threshold: float) -> str:
+        """Column name for a (horizon, threshold) label, e.g. target_5d_0.02"""
+        return f"target_{horizon}d_{threshold:g}"
+
+    def create_label_matrix(self, close: pd.Series, horizons: Sequence[int] = (5,),
+                            thresholds: Sequence[float] = (0.0,)) -> pd.DataFrame:
+        """Will price be more than threshold above today's close after horizon days?
+
+        All horizons x thresholds are computed in one gather over the close
+        array. Rows without a future price for a horizon are NaN.
+        """
+        prices = close.to_numpy(dtype=float)
+        horizons = np.asarray(horizons, dtype=int)
+        thresholds = np.asarray(thresholds, dtype=float)
+        n = len(prices)
+
+        # future[i, h] = close[i + horizons[h]]
+        ahead = np.arange(n)[:, None] + horizons[None, :]
+        available = ahead < n
+        future = np.where(available, prices[np.minimum(ahead, n - 1)], np.nan)
+
+        hit = future[:, :, None] > prices[:, None, None] * (1 + thresholds)[None, None, :]
+        labels = np.where(available[:, :, None], hit, np.nan).reshape(n, -1)
+
+        columns = [self.label_name(h, t) for h in horizons for t in thresholds]
+        return pd.DataFrame(labels, index=close.index, columns=columns)
+
+    def create_target(self, close: pd.Series, horizon: int = 5, threshold: float = 0.0) -> pd.Series:
+        """Single 0/1 target, unavailable future prices counted as 0 (legacy behaviour)"""
+        labels = self.create_label_matrix(close, [horizon], [threshold])
+        return labels.iloc[:, 0].fillna(0).astype(int)
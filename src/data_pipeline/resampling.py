@@ -0,0 +1,131 @@
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DAY_NS = 86_400 * 10**9
+MINUTE_NS = 60 * 10**9
+
+class SessionCalendar:
+    """Exchange trading sessions: local hours, weekdays and holidays"""
+
+    def __init__(self, timezone: str = "America/New_York", open_time: str = "09:30",
+                 close_time: str = "16:00", holidays: Optional[List[str]] = None,
+                 weekdays: Tuple[int, ...] = (0, 1, 2, 3, 4)):
+        """Initialize a regular-hours calendar (NYSE by default)"""
+        self.timezone = timezone
+        self.open_ns = pd.Timedelta(open_time + ":00").value
+        self.close_ns = pd.Timedelta(close_time + ":00").value
+        self.weekdays = np.array(weekdays)
+        self.holidays = np.array(
+            [pd.Timestamp(h).value // DAY_NS for h in (holidays or [])], dtype=np.int64
+        )
+
+    def local_ns(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """Wall-clock nanoseconds in the exchange timezone"""
+        index = pd.DatetimeIndex(index)
+        if index.tz is None:
+            index = index.tz_localize(self.timezone)
+        return index.tz_convert(self.timezone).tz_localize(None).as_unit("ns").asi8
+
+    def session_mask(self, local_ns: np.ndarray) -> np.ndarray:
+        """True for timestamps inside a regular session"""
+        day = local_ns // DAY_NS
+        time_of_day = local_ns - day * DAY_NS
+        # 1970-01-01 was a Thursday
+        weekday = (day + 3) % 7
+        return (
+            (time_of_day >= self.open_ns) & (time_of_day < self.close_ns)
+            & np.isin(weekday, self.weekdays) & ~np.isin(day, self.holidays)
+        )
+
+    def minutes_per_session(self) -> int:
+        return int((self.close_ns - self.open_ns) // MINUTE_NS)
+
+class BarResampler:
+    """Vectorized OHLCV aggregation of intraday bars over sorted timestamps"""
+
+    def __init__(self, calendar: Optional[SessionCalendar] = None):
+        """Initialize with a session calendar (NYSE regular hours by default)"""
+        self.calendar = calendar or SessionCalendar()
+
+    def resample(self, df: pd.DataFrame, rule: str = "5min", dtype=np.float64) -> pd.DataFrame:
+        """Aggregate bars into session-anchored buckets of the given length"""
+        rule_ns = pd.Timedelta(rule).value
+        local, data = self._prepare(df, dtype)
+        day = local // DAY_NS
+        bucket = (local - day * DAY_NS - self.calendar.open_ns) // rule_ns
+        starts = day * DAY_NS + self.calendar.open_ns + bucket * rule_ns
+        return self._aggregate(starts, data, dtype)
+
+    def to_daily(self, df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+        """Aggregate bars into one daily OHLCV row per session"""
+        local, data = self._prepare(df, dtype)
+        return self._aggregate((local // DAY_NS) * DAY_NS, data, dtype)
+
+    def _prepare(self, df: pd.DataFrame, dtype):
+        """Sorted in-session local timestamps and OHLCV column arrays"""
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index()
+        local = self.calendar.local_ns(df.index)
+        mask = self.calendar.session_mask(local)
+        data = {c: df[c].to_numpy(dtype=dtype)[mask] for c in ('Open', 'High', 'Low', 'Close', 'Volume')}
+        return local[mask], data
+
+    def _aggregate(self, keys: np.ndarray, data: Dict[str, np.ndarray], dtype) -> pd.DataFrame:
+        """Grouped first/max/min/last/sum over runs of equal keys"""
+        if len(keys) == 0:
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'], dtype=dtype)
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)] - 1
+
+        index = pd.DatetimeIndex(keys[starts]).tz_localize(self.calendar.timezone)
+        return pd.DataFrame({
+            'Open': data['Open'][starts],
+            'High': np.maximum.reduceat(data['High'], starts),
+            'Low': np.minimum.reduceat(data['Low'], starts),
+            'Close': data['Close'][ends],
+            'Volume': np.add.reduceat(data['Volume'], starts)
+        }, index=index)
+
+    def fill_gaps(self, df: pd.DataFrame, freq: str = "1min", method: str = "ffill") -> pd.DataFrame:
+        """Reindex each session to a full bar grid
+
+        method='ffill' carries the last close into OHLC with zero volume,
+        method='none' leaves missing bars as NaN.
+        """
+        freq_ns = pd.Timedelta(freq).value
+        local = self.calendar.local_ns(df.index)
+        days = np.unique(local[self.calendar.session_mask(local)] // DAY_NS)
+        per_session = np.arange(self.calendar.open_ns, self.calendar.close_ns, freq_ns)
+        grid = (days[:, None] * DAY_NS + per_session[None, :]).ravel()
+
+        frame = df.copy()
+        frame.index = pd.DatetimeIndex(local)
+        frame = frame[~frame.index.duplicated(keep='last')].reindex(pd.DatetimeIndex(grid))
+
+        if method == 'ffill':
+            missing = frame['Close'].isna().to_numpy()
+            close = frame['Close'].ffill()
+            for col in ('Open', 'High', 'Low'):
+                frame[col] = frame[col].fillna(close)
+            frame['Close'] = close
+            frame['Volume'] = frame['Volume'].fillna(0)
+            frame['gap'] = missing
+
+        frame.index = frame.index.tz_localize(self.calendar.timezone)
+        return frame
+
+    def resample_many(self, bars: Iterable[Tuple[str, pd.DataFrame]], rule: str = "1D",
+                      dtype=np.float32) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Stream (symbol, bars) pairs through resampling one symbol at a time
+
+        Only one symbol's raw bars are alive at once, so a year of minute bars
+        for hundreds of symbols fits in a bounded memory footprint.
+        """
+        for symbol, df in bars:
+            if rule.upper() in ('1D', 'D'):
+                yield symbol, self.to_daily(df, dtype)
+            else:
+                yield symbol, self.resample(df, rule, dtype)
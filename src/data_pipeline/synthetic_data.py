@@ -0,0 +1,118 @@
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Market regimes as (daily drift shift, volatility multiplier, volume multiplier)
+REGIMES = {
+    'bull': (0.0004, 0.8, 0.9),
+    'bear': (-0.0006, 1.4, 1.3),
+    'crisis': (-0.0020, 2.5, 2.0)
+}
+
+# Daily Markov transition probabilities between REGIMES, in the same order
+REGIME_TRANSITIONS = np.array([
+    [0.985, 0.013, 0.002],
+    [0.030, 0.960, 0.010],
+    [0.040, 0.100, 0.860]
+])
+
+class SyntheticMarketGenerator:
+    """Seeded synthetic OHLCV data shaped like yfinance history() output"""
+
+    def __init__(self, seed: int = 42, regimes: bool = False):
+        """Initialize generator with a fixed seed for reproducible panels
+
+        With regimes, every symbol shares one Markov-switching market regime
+        path that shifts drift, scales volatility and scales volume.
+        """
+        self.seed = seed
+        self.regimes = regimes
+        self.last_regimes: np.ndarray = np.empty(0, dtype=np.int8)
+
+    def regime_path(self, days: int, rng: np.random.Generator) -> np.ndarray:
+        """Sample a daily regime index path from REGIME_TRANSITIONS"""
+        cumulative = np.cumsum(REGIME_TRANSITIONS, axis=1)
+        draws = rng.random(days)
+        path = np.empty(days, dtype=np.int8)
+        state = 0
+        for day in range(days):
+            path[day] = state
+            state = min(int(np.searchsorted(cumulative[state], draws[day], side='right')), len(REGIMES) - 1)
+        return path
+
+    def generate(self, symbols: List[str], days: int = 252, start: str = "2020-01-01",
+                 regimes: Optional[np.ndarray] = None) -> Dict[str, pd.DataFrame]:
+        """Generate daily bars for each symbol using geometric Brownian motion
+
+        With regimes enabled, an explicit regime path may be passed in so
+        that separately generated panels share one market.
+        """
+        rng = np.random.default_rng(self.seed)
+        index = pd.bdate_range(start=start, periods=days, name='Date')
+        n = len(symbols)
+
+        drift = rng.normal(0.0003, 0.0002, n)
+        vol = rng.uniform(0.01, 0.03, n)
+        start_price = rng.uniform(20, 500, n)
+
+        if self.regimes:
+            self.last_regimes = self.regime_path(days, rng) if regimes is None else regimes
+            shift, vol_mult, volume_mult = np.array(list(REGIMES.values())).T[:, self.last_regimes]
+            log_returns = drift + shift[:, None] + vol * vol_mult[:, None] * rng.standard_normal((days, n))
+        else:
+            volume_mult = np.ones(days)
+            log_returns = drift + vol * rng.standard_normal((days, n))
+        close = start_price * np.exp(np.cumsum(log_returns, axis=0))
+        open_ = close * np.exp(-log_returns * rng.uniform(0, 1, (days, n)))
+        spread = np.abs(rng.normal(0, 1, (days, n))) * vol * close * 0.5
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread * rng.uniform(0, 1, (days, n))
+        volume = rng.lognormal(13, 0.5, (days, n)) * (1 + 20 * np.abs(log_returns)) * volume_mult[:, None]
+
+        return {
+            symbol: pd.DataFrame({
+                'Open': open_[:, i],
+                'High': high[:, i],
+                'Low': low[:, i],
+                'Close': close[:, i],
+                'Volume': volume[:, i].round()
+            }, index=index)
+            for i, symbol in enumerate(symbols)
+        }
+
+    def iter_panels(self, symbols: List[str], days: int = 252, chunk_size: int = 250,
+                    start: str = "2020-01-01") -> Iterator[Dict[str, pd.DataFrame]]:
+        """Yield generate() panels for chunk_size symbols at a time, each chunk seeded by its offset
+
+        The regime path is sampled once per call and shared by every chunk.
+        """
+        if self.regimes:
+            self.last_regimes = self.regime_path(days, np.random.default_rng(self.seed))
+        for offset in range(0, len(symbols), chunk_size):
+            chunk = SyntheticMarketGenerator((self.seed, offset), self.regimes)
+            yield chunk.generate(symbols[offset:offset + chunk_size], days, start, self.last_regimes)
+
+    def iter_intraday(self, symbols: List[str], days: int = 252, freq_minutes: int = 1,
+                      start: str = "2020-01-01") -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield regular-session intraday bars one symbol at a time"""
+        sessions = pd.bdate_range(start=start, periods=days)
+        offsets = pd.timedelta_range("09:30:00", "15:59:00", freq=f"{freq_minutes}min")
+        index = (sessions.values[:, None] + offsets.values[None, :]).ravel()
+        index = pd.DatetimeIndex(index).tz_localize("America/New_York")
+        n = len(index)
+
+        for i, symbol in enumerate(symbols):
+            rng = np.random.default_rng((self.seed, i))
+            vol = rng.uniform(0.01, 0.03) / np.sqrt(len(offsets))
+            log_returns = vol * rng.standard_normal(n)
+            close = rng.uniform(20, 500) * np.exp(np.cumsum(log_returns))
+            open_ = close * np.exp(-log_returns)
+            wick = np.abs(rng.normal(0, vol, n)) * close
+            yield symbol, pd.DataFrame({
+                'Open': open_,
+                'High': np.maximum(open_, close) + wick,
+                'Low': np.minimum(open_, close) - wick,
+                'Close': close,
+                'Volume': rng.lognormal(7, 1, n).round()
+            }, index=index)
@@ -0,0 +1,159 @@
+
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+from typing import List, Optional
+
+class BatchEvaluationEngine:
+    """Vectorized classification metrics for many (symbol, model, fold) groups at once"""
+
+    def __init__(self, n_bootstrap: int = 200, confidence: float = 0.95, random_state: int = 42):
+        """Initialize bootstrap settings for confidence intervals"""
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.random_state = random_state
+
+    def evaluate(self, predictions: pd.DataFrame, keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """Evaluate stacked predictions into one tidy row per group
+
+        predictions holds y_true, y_pred (0/1) and optionally y_score, plus
+        the key columns identifying each group.
+        """
+        if keys is None:
+            keys = [c for c in ('symbol', 'model', 'fold') if c in predictions.columns]
+
+        if keys:
+            # Factorize each key, then the combined flat code, instead of hashing tuples
+            key_codes, key_values = zip(*(pd.factorize(predictions[k]) for k in keys))
+            dims = tuple(len(v) for v in key_values)
+            codes, flat = pd.factorize(np.ravel_multi_index(key_codes, dims))
+            table = pd.DataFrame({
+                k: np.asarray(values)[idx]
+                for k, values, idx in zip(keys, key_values, np.unravel_index(flat, dims))
+            })
+        else:
+            codes = np.zeros(len(predictions), dtype=np.int64)
+            table = pd.DataFrame(index=[0])
+
+        y_score = predictions['y_score'].to_numpy(dtype=float) if 'y_score' in predictions else None
+        metrics = self.evaluate_arrays(
+            codes,
+            predictions['y_true'].to_numpy(),
+            predictions['y_pred'].to_numpy(),
+            y_score,
+            n_groups=len(table)
+        )
+        return pd.concat([table, pd.DataFrame(metrics)], axis=1)
+
+    def evaluate_arrays(self, group: np.ndarray, y_true: np.ndarray, y_pred: np.ndarray,
+                        y_score: Optional[np.ndarray] = None, n_groups: Optional[int] = None) -> dict:
+        """Metric columns for integer group ids 0..n_groups-1
+
+        y_true and y_pred must be binary 0/1 labels; anything else would spill
+        into a neighbouring group's confusion cells, so it raises ValueError.
+        """
+        y_true, y_pred = _binary_labels(y_true, 'y_true'), _binary_labels(y_pred, 'y_pred')
+        n_groups = int(group.max()) + 1 if n_groups is None else n_groups
+
+        # Confusion counts per group as [tn, fp, fn, tp] in one bincount
+        cells = group * 4 + y_true * 2 + y_pred
+        counts = np.bincount(cells, minlength=n_groups * 4).reshape(n_groups, 4)
+
+        result = {
+            'n': counts.sum(axis=1),
+            'tn': counts[:, 0], 'fp': counts[:, 1], 'fn': counts[:, 2], 'tp': counts[:, 3]
+        }
+        result.update(self._count_metrics(counts))
+        result.update(self._bootstrap_intervals(counts))
+
+        if y_score is not None:
+            auc = self._roc_auc(group, y_true, y_score, n_groups)
+            n_pos, n_neg = counts[:, 2] + counts[:, 3], counts[:, 0] + counts[:, 1]
+            half = self._z() * self._auc_standard_error(auc, n_pos, n_neg)
+            result['roc_auc'] = auc
+            result['roc_auc_ci_low'] = np.clip(auc - half, 0, 1)
+            result['roc_auc_ci_high'] = np.clip(auc + half, 0, 1)
+
+        return result
+
+    def _count_metrics(self, counts: np.ndarray) -> dict:
+        """Accuracy, precision, recall and F1 from [..., 4] confusion counts"""
+        tn, fp, fn, tp = (counts[..., i].astype(float) for i in range(4))
+        total = tn + fp + fn + tp
+        precision = _safe_divide(tp, tp + fp)
+        recall = _safe_divide(tp, tp + fn)
+        return {
+            'accuracy': _safe_divide(tp + tn, total),
+            'precision': precision,
+            'recall': recall,
+            'f1': _safe_divide(2 * tp, 2 * tp + fp + fn)
+        }
+
+    def _bootstrap_intervals(self, counts: np.ndarray) -> dict:
+        """Percentile intervals by resampling each group's confusion cells"""
+        if not self.n_bootstrap:
+            return {}
+
+        rng = np.random.default_rng(self.random_state)
+        n = counts.sum(axis=1)
+        probs = counts / np.maximum(n, 1)[:, None]
+        # Resampling rows with replacement is a multinomial draw over the 4 cells
+        samples = rng.multinomial(n, probs, size=(self.n_bootstrap, len(counts)))
+
+        alpha = (1 - self.confidence) / 2 * 100
+        intervals = {}
+        for name, values in self._count_metrics(samples).items():
+            low, high = np.percentile(values, [alpha, 100 - alpha], axis=0)
+            intervals[f'{name}_ci_low'] = low
+            intervals[f'{name}_ci_high'] = high
+        return intervals
+
+    def _roc_auc(self, group: np.ndarray, y_true: np.ndarray, y_score: np.ndarray,
+                 n_groups: int) -> np.ndarray:
+        """Per-group ROC-AUC from tie-averaged ranks (Mann-Whitney U) after one sort"""
+        order = np.lexsort((y_score, group))
+        g, s, y = group[order], y_score[order], y_true[order]
+
+        sizes = np.bincount(g, minlength=n_groups)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        rank = np.arange(len(g)) - starts[g] + 1.0
+
+        # Average ranks over runs of tied scores within a group
+        new_run = np.concatenate(([True], (g[1:] != g[:-1]) | (s[1:] != s[:-1])))
+        run_start = np.flatnonzero(new_run)
+        run_end = np.concatenate((run_start[1:], [len(g)])) - 1
+        run_id = np.cumsum(new_run) - 1
+        avg_rank = ((rank[run_start] + rank[run_end]) / 2)[run_id]
+
+        rank_sum = np.bincount(g, weights=avg_rank * y, minlength=n_groups)
+        n_pos = np.bincount(g, weights=y, minlength=n_groups)
+        n_neg = sizes - n_pos
+        return _safe_divide(rank_sum - n_pos * (n_pos + 1) / 2, n_pos * n_neg, fill=np.nan)
+
+    def _auc_standard_error(self, auc: np.ndarray, n_pos: np.ndarray, n_neg: np.ndarray) -> np.ndarray:
+        """Hanley-McNeil standard error of the AUC"""
+        q1 = auc / (2 - auc)
+        q2 = 2 * auc ** 2 / (1 + auc)
+        var = auc * (1 - auc) + (n_pos - 1) * (q1 - auc ** 2) + (n_neg - 1) * (q2 - auc ** 2)
+        return np.sqrt(np.clip(_safe_divide(var, n_pos * n_neg, fill=np.nan), 0, None))
+
+    def _z(self) -> float:
+        """Two-sided normal quantile for the configured confidence"""
+        return NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+def _binary_labels(values: np.ndarray, name: str) -> np.ndarray:
+    """values as int64, raising ValueError unless every entry is 0 or 1"""
+    values = np.asarray(values)
+    invalid = ~np.isin(values, (0, 1))
+    if invalid.any():
+        bad = np.unique(values[invalid])[:5]
+        raise ValueError(f"{name} must contain only 0/1 labels, got {bad.tolist()}")
+    return values.astype(np.int64)
+
+def _safe_divide(num: np.ndarray, den: np.ndarray, fill: float = 0.0) -> np.ndarray:
+    """Elementwise division with a fill value where the denominator is zero"""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.full(np.broadcast(num, den).shape, fill)
+    np.divide(num, den, out=out, where=den != 0)
+    return out
@@ -1,33 +1,37 @@
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler
 import numpy as np
 
+from src.ml_pipeline.optimized_training import MULTI_OUTPUT_MODELS, SWEEP_MODELS, fit_predict_labels
+from src.ml_pipeline.shared_features import SharedFeatureMatrix, time_series_folds
+
 class MLTrainingEngine:
     """Trains AI models to predict market movements"""
     
-    def train_ensemble_model(self, X, y):
-        """Uses multiple models for better predictions"""
+    def train_ensemble_model(self, X, y=None):
+        """Uses multiple models for better predictions
         
-        models = {
-            'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
-            'gradient_boost': GradientBoostingClassifier(n_estimators=100, random_state=42)
-        }
+        X is a feature DataFrame with target y, or a SharedFeatureMatrix
+        carrying its own target, whose folds are zero-copy row slices.
+        """
+        # sklearn is imported on first use so importing the engine stays cheap
+        from sklearn.preprocessing import StandardScaler
+        
+        models = self._models()
+        
+        # Clean the data once; folds below are contiguous row ranges
+        if isinstance(X, SharedFeatureMatrix):
+            X_values, y_values = X.fill_nan(0).X, X.y
+        else:
+            X_values, y_values = X.fillna(0).to_numpy(dtype=float), np.asarray(y)
         
         # Special validation for time series data
-        tscv = TimeSeriesSplit(n_splits=3)
         results = {}
         
         for name, model in models.items():
             predictions, actuals = [], []
             
-            for train_idx, test_idx in tscv.split(X):
-                X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-                y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-                
-                # Clean the data
-                X_train = X_train.fillna(0)
-                X_test = X_test.fillna(0)
+            for train, test in time_series_folds(len(X_values), n_splits=3):
+                X_train, X_test = X_values[train], X_values[test]
+                y_train, y_test = y_values[train], y_values[test]
                 
                 # Standardize features
                 scaler = StandardScaler()
@@ -49,3 +53,57 @@ class MLTrainingEngine:
                 }
         
         return results
+    
+    def _models(self):
+        """Fresh, unfitted ensemble members"""
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+        
+        return {
+            'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
+            'gradient_boost': GradientBoostingClassifier(n_estimators=100, random_state=42)
+        }
+    
+    def train_multi_target(self, X, Y=None, models=SWEEP_MODELS):
+        """Trains every label column of Y with one set of fold preparations
+        
+        X is a feature DataFrame with label matrix Y, or a SharedFeatureMatrix
+        whose target columns are the labels. Folds are cleaned and scaled
+        once. The random forest fits all labels jointly as one multi-output
+        model, so a sweep costs about one training run. gradient_boost can be
+        listed in models, but it fits one model per label per fold.
+        """
+        from sklearn.preprocessing import StandardScaler
+        
+        if isinstance(X, SharedFeatureMatrix):
+            X_values, Y_values, labels = X.fill_nan(0).X, X.Y, list(X.target_columns)
+        else:
+            X_values, Y_values, labels = X.fillna(0).to_numpy(dtype=float), Y.to_numpy(), list(Y.columns)
+        
+        candidates = self._models()
+        predictions = {name: [] for name in models}
+        actuals = []
+        
+        for train, test in time_series_folds(len(X_values), n_splits=3):
+            scaler = StandardScaler()
+            X_train_scaled = scaler.fit_transform(X_values[train])
+            X_test_scaled = scaler.transform(X_values[test])
+            Y_train, Y_test = Y_values[train], Y_values[test]
+            actuals.append(Y_test)
+            
+            for name in models:
+                predictions[name].append(
+                    fit_predict_labels(candidates[name], X_train_scaled, X_test_scaled, Y_train,
+                                        name in MULTI_OUTPUT_MODELS)
+                )
+        
+        results = {label: {} for label in labels}
+        actuals = np.vstack(actuals)
+        for name, preds in predictions.items():
+            accuracy = np.mean(np.vstack(preds) == actuals, axis=0)
+            for j, label in enumerate(labels):
+                results[label][name] = {
+                    'accuracy': round(accuracy[j], 3),
+                    'samples': len(actuals)
+                }
+        
+        return results
@@ -1,56 +1,66 @@
 
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler
-from sklearn.feature_selection import SelectKBest, f_classif
 import numpy as np
+import pandas as pd
+
+from src.ml_pipeline.shared_features import SharedFeatureMatrix, time_series_folds
+from src.utils.instrumentation import instrumented
+
+# Models that fit every label of a sweep in one multi-output fit
+MULTI_OUTPUT_MODELS = ('random_forest',)
+
+# Default train_multi_target models; add 'gradient_boost' at one fit per label
+SWEEP_MODELS = ('random_forest',)
 
 class OptimizedMLTrainingEngine:
     """Optimized model training with feature selection"""
     
-    def train_optimized_models(self, X, y):
-        """Trains models with feature selection and hyperparameter tuning"""
+    @instrumented('training')
+    def train_optimized_models(self, X, y=None):
+        """Trains models with feature selection and hyperparameter tuning
+        
+        X is a feature DataFrame with target y, or a SharedFeatureMatrix
+        carrying its own target, whose folds are zero-copy row slices.
+        """
+        # sklearn is imported on first use so importing the engine stays cheap
+        from sklearn.feature_selection import SelectKBest, f_classif
+        from sklearn.preprocessing import StandardScaler
         
-        # Handle constant features before selection
-        X_clean = X.loc[:, X.nunique() > 1]  # Remove constant features
+        shared = isinstance(X, SharedFeatureMatrix)
+        if shared:
+            # NaNs are filled in place, so selection below sees clean values
+            matrix = X.fill_nan()
+            keep = ~matrix.constant_columns()
+            X_clean = matrix.X if keep.all() else matrix.X[:, keep]
+            columns = pd.Index(matrix.columns)[keep]
+            y = matrix.y
+        else:
+            # Handle constant features before selection
+            X_clean = X.loc[:, X.nunique() > 1]  # Remove constant features
+            columns = X_clean.columns
         
         # Feature selection - FIXED VERSION
         if X_clean.shape[1] > 1:
             selector = SelectKBest(f_classif, k=min(15, X_clean.shape[1]))
             X_selected = selector.fit_transform(X_clean, y)
-            selected_features = X_clean.columns[selector.get_support()]
+            selected_features = columns[selector.get_support()]
         else:
-            X_selected = X_clean.values
-            selected_features = X_clean.columns
+            X_selected = np.asarray(X_clean)
+            selected_features = columns
         
-        models = {
-            'random_forest': RandomForestClassifier(
-                n_estimators=200, 
-                max_depth=10, 
-                min_samples_split=10,
-                random_state=42
-            ),
-            'gradient_boost': GradientBoostingClassifier(
-                n_estimators=200,
-                max_depth=6,
-                learning_rate=0.1,
-                random_state=42
-            )
-        }
+        # Handle any remaining NaNs once; folds below are contiguous row ranges
+        if not shared:
+            X_selected = np.nan_to_num(X_selected)
+        y = np.asarray(y)
         
-        tscv = TimeSeriesSplit(n_splits=3)
+        models = self._models()
         results = {}
         
         for name, model in models.items():
             predictions, actuals = [], []
             
-            for train_idx, test_idx in tscv.split(X_selected):
-                X_train, X_test = X_selected[train_idx], X_selected[test_idx]
-                y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-                
-                # Handle any remaining NaNs
-                X_train = np.nan_to_num(X_train)
-                X_test = np.nan_to_num(X_test)
+            for train, test in time_series_folds(len(X_selected), n_splits=3):
+                X_train, X_test = X_selected[train], X_selected[test]
+                y_train, y_test = y[train], y[test]
                 
                 # Standardize features
                 scaler = StandardScaler()
@@ -73,3 +83,133 @@ class OptimizedMLTrainingEngine:
                 }
         
         return results
+    
+    @instrumented('training.final')
+    def fit_final_model(self, X, y, model_name: str = 'random_forest'):
+        """Fits one model on every row for serving, with the same selection and scaling
+        
+        Returns {'model', 'features', 'pipeline'}; score new rows with
+        pipeline.predict_proba(np.nan_to_num(rows[features])).
+        """
+        from sklearn.feature_selection import SelectKBest, f_classif
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        
+        X_clean = X.loc[:, X.nunique() > 1]
+        if X_clean.shape[1] > 1:
+            selector = SelectKBest(f_classif, k=min(15, X_clean.shape[1])).fit(X_clean, y)
+            selected_features = X_clean.columns[selector.get_support()]
+        else:
+            selected_features = X_clean.columns
+        
+        pipeline = make_pipeline(StandardScaler(), self._models()[model_name])
+        pipeline.fit(np.nan_to_num(X_clean[selected_features].to_numpy(dtype=float)), y)
+        
+        return {
+            'model': model_name,
+            'features': list(selected_features),
+            'pipeline': pipeline
+        }
+    
+    def _models(self):
+        """Fresh, unfitted candidate models"""
+        from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+        
+        return {
+            'random_forest': RandomForestClassifier(
+                n_estimators=200, 
+                max_depth=10, 
+                min_samples_split=10,
+                random_state=42
+            ),
+            'gradient_boost': GradientBoostingClassifier(
+                n_estimators=200,
+                max_depth=6,
+                learning_rate=0.1,
+                random_state=42
+            )
+        }
+    
+    @instrumented('training.multi_target')
+    def train_multi_target(self, X, Y=None, models=SWEEP_MODELS):
+        """Trains every label column of Y with shared feature selection and folds
+        
+        X is a feature DataFrame with label matrix Y, or a SharedFeatureMatrix
+        whose target columns are the labels. Features are selected once by
+        their mean F-score across all labels and each fold is scaled once.
+        The random forest fits all labels jointly as one multi-output model,
+        so a sweep costs about one training run. gradient_boost can be listed
+        in models, but it fits one model per label per fold.
+        """
+        from sklearn.feature_selection import f_classif
+        from sklearn.preprocessing import StandardScaler
+        
+        if isinstance(X, SharedFeatureMatrix):
+            matrix = X.fill_nan()
+            keep = ~matrix.constant_columns()
+            X_filled = matrix.X if keep.all() else matrix.X[:, keep]
+            columns = pd.Index(matrix.columns)[keep]
+            Y_values, labels = matrix.Y, list(matrix.target_columns)
+        else:
+            X_clean = X.loc[:, X.nunique() > 1]
+            X_filled = np.nan_to_num(X_clean.to_numpy(dtype=float))
+            columns = X_clean.columns
+            Y_values, labels = Y.to_numpy(), list(Y.columns)
+        
+        if X_filled.shape[1] > 1:
+            scores = np.mean([
+                np.nan_to_num(f_classif(X_filled, Y_values[:, j])[0]) for j in range(len(labels))
+            ], axis=0)
+            support = np.zeros(X_filled.shape[1], dtype=bool)
+            support[np.argsort(-scores, kind='stable')[:min(15, X_filled.shape[1])]] = True
+            X_selected = X_filled[:, support]
+            selected_features = columns[support]
+        else:
+            X_selected = X_filled
+            selected_features = columns
+        
+        candidates = self._models()
+        predictions = {name: [] for name in models}
+        actuals = []
+        
+        for train, test in time_series_folds(len(X_selected), n_splits=3):
+            scaler = StandardScaler()
+            X_train_scaled = scaler.fit_transform(X_selected[train])
+            X_test_scaled = scaler.transform(X_selected[test])
+            Y_train, Y_test = Y_values[train], Y_values[test]
+            actuals.append(Y_test)
+            
+            for name in models:
+                predictions[name].append(
+                    fit_predict_labels(candidates[name], X_train_scaled, X_test_scaled, Y_train,
+                                        name in MULTI_OUTPUT_MODELS)
+                )
+        
+        results = {label: {} for label in labels}
+        actuals = np.vstack(actuals)
+        for name, preds in predictions.items():
+            accuracy = np.mean(np.vstack(preds) == actuals, axis=0)
+            for j, label in enumerate(labels):
+                results[label][name] = {
+                    'accuracy': round(accuracy[j], 3),
+                    'samples': len(actuals),
+                    'selected_features': list(selected_features)
+                }
+        
+        return results
+
+def fit_predict_labels(model, X_train, X_test, Y_train, multi_output: bool) -> np.ndarray:
+    """(n_test, n_labels) predictions, jointly for multi-output models, else per label"""
+    if multi_output:
+        model.fit(X_train, Y_train if Y_train.shape[1] > 1 else Y_train.ravel())
+        return model.predict(X_test).reshape(len(X_test), -1)
+    
+    predicted = np.empty((len(X_test), Y_train.shape[1]), dtype=Y_train.dtype)
+    for j in range(Y_train.shape[1]):
+        # Rare labels can be single-class within an early fold
+        if np.unique(Y_train[:, j]).size < 2:
+            predicted[:, j] = Y_train[0, j]
+            continue
+        model.fit(X_train, Y_train[:, j])
+        predicted[:, j] = model.predict(X_test)
+    return predicted
@@ -0,0 +1,228 @@
+
+import json
+import mmap
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALIGNMENT = 64
+_LENGTH = struct.Struct('<Q')
+
+def _align(n: int) -> int:
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def time_series_folds(n_samples: int, n_splits: int = 3, test_size: Optional[int] = None,
+                      gap: int = 0, max_train_size: Optional[int] = None) -> Iterator[Tuple[slice, slice]]:
+    """(train, test) row slices identical to sklearn's TimeSeriesSplit indices"""
+    n_folds = n_splits + 1
+    test_size = test_size if test_size is not None else n_samples // n_folds
+    if n_folds > n_samples or n_samples - gap - test_size * n_splits <= 0:
+        raise ValueError(f"Cannot make {n_splits} splits of {n_samples} samples "
+                         f"(test_size={test_size}, gap={gap})")
+
+    for test_start in range(n_samples - n_splits * test_size, n_samples, test_size):
+        train_end = test_start - gap
+        train_start = max(0, train_end - max_train_size) if max_train_size else 0
+        yield slice(train_start, train_end), slice(test_start, test_start + test_size)
+
+class SharedFeatureMatrix:
+    """Feature and target matrices in named shared memory or a memmapped file
+
+    Layout is an 8-byte header length, a JSON header (columns, targets,
+    index dtype/tz and per-block offset/shape/dtype), then 64-byte aligned
+    C-contiguous blocks. Because rows are contiguous, a TimeSeriesSplit
+    fold is a row range and fold views are plain slices: no copies. Other
+    processes attach by name (or path) instead of unpickling DataFrames.
+    """
+
+    def __init__(self, buffer, header: Dict, name: str, backend: str, owner: bool, handle=None):
+        """Wrap an already-mapped buffer; use create/from_frame/attach instead"""
+        self.name = name
+        self.backend = backend
+        self.owner = owner
+        self.columns: List[str] = header['columns']
+        self.target_columns: List[str] = header['target_columns']
+        self._header = header
+        self._buffer = buffer
+        self._handle = handle
+
+        data_start = header['data_start']
+        self._blocks = {
+            block: np.ndarray(tuple(spec['shape']), dtype=np.dtype(spec['dtype']),
+                              buffer=buffer, offset=data_start + spec['offset'])
+            for block, spec in header['blocks'].items()
+        }
+
+    @classmethod
+    def create(cls, n_rows: int, columns: Sequence[str], target_columns: Sequence[str] = ('target',),
+               dtype='float64', target_dtype='int64', has_index: bool = False,
+               index_tz: Optional[str] = None, name: Optional[str] = None, path: Optional[str] = None,
+               index_name: Optional[str] = None):
+        """Allocate an empty matrix; shared memory by default, a memmapped file if path is given"""
+        blocks, offset = {}, 0
+        for block, shape, block_dtype in (
+            ('features', (n_rows, len(columns)), dtype),
+            ('targets', (n_rows, len(target_columns)), target_dtype),
+            ('index', (n_rows,), 'int64')
+        ):
+            blocks[block] = {'offset': offset, 'shape': list(shape), 'dtype': np.dtype(block_dtype).str}
+            offset = _align(offset + int(np.prod(shape)) * np.dtype(block_dtype).itemsize)
+
+        header = {
+            'columns': list(columns),
+            'target_columns': list(target_columns),
+            'has_index': has_index,
+            'index_tz': index_tz,
+            'index_name': index_name,
+            'blocks': blocks
+        }
+        encoded = json.dumps(header).encode()
+        header['data_start'] = data_start = _align(_LENGTH.size + len(encoded) + 32)
+        encoded = json.dumps(header).encode()
+        size = max(data_start + offset, 1)
+
+        if path is not None:
+            with open(path, 'w+b') as file:
+                file.truncate(size)
+                buffer = mmap.mmap(file.fileno(), size)
+            name, backend, handle = path, 'memmap', buffer
+        else:
+            handle = shared_memory.SharedMemory(name=name, create=True, size=size)
+            buffer, name, backend = handle.buf, handle.name, 'shm'
+
+        buffer[:_LENGTH.size] = _LENGTH.pack(len(encoded))
+        buffer[_LENGTH.size:_LENGTH.size + len(encoded)] = encoded
+        return cls(buffer, header, name, backend, owner=True, handle=handle)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, target_columns: Sequence[str] = ('target',),
+                   dtype='float64', name: Optional[str] = None, path: Optional[str] = None):
+        """Copy a features+target DataFrame in once; every later access is zero-copy"""
+        target_columns = [c for c in target_columns if c in df.columns]
+        columns = [c for c in df.columns if c not in target_columns]
+        has_index = isinstance(df.index, pd.DatetimeIndex)
+        index_tz = str(df.index.tz) if has_index and df.index.tz else None
+        target_dtype = np.result_type(*df[target_columns].dtypes) if target_columns else np.int64
+
+        matrix = cls.create(len(df), columns, target_columns, dtype, target_dtype,
+                            has_index, index_tz, name, path, df.index.name)
+        matrix.X[:] = df[columns].to_numpy(dtype=dtype)
+        if target_columns:
+            matrix.Y[:] = df[target_columns].to_numpy(dtype=target_dtype)
+        if has_index:
+            matrix._blocks['index'][:] = df.index.as_unit("ns").asi8
+        return matrix
+
+    @classmethod
+    def attach(cls, name: str, backend: Optional[str] = None):
+        """Map an existing matrix by shared-memory name or memmap file path"""
+        backend = backend or ('memmap' if os.path.exists(name) else 'shm')
+        if backend == 'memmap':
+            with open(name, 'r+b') as file:
+                handle = buffer = mmap.mmap(file.fileno(), 0)
+        else:
+            try:
+                # Python 3.13+: attaching must not make this process unlink it at exit
+                handle = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                handle = shared_memory.SharedMemory(name=name)
+            buffer = handle.buf
+
+        (length,) = _LENGTH.unpack(bytes(buffer[:_LENGTH.size]))
+        header = json.loads(bytes(buffer[_LENGTH.size:_LENGTH.size + length]))
+        return cls(buffer, header, name, backend, owner=False, handle=handle)
+
+    @property
+    def X(self) -> np.ndarray:
+        """(n_rows, n_features) view"""
+        return self._blocks['features']
+
+    @property
+    def Y(self) -> np.ndarray:
+        """(n_rows, n_targets) view"""
+        return self._blocks['targets']
+
+    @property
+    def y(self) -> np.ndarray:
+        """First target column as a 1-D (strided) view"""
+        return self._blocks['targets'][:, 0]
+
+    @property
+    def index(self) -> pd.Index:
+        """Row timestamps (a small copy; not needed for training)"""
+        name = self._header.get('index_name')
+        if not self._header['has_index']:
+            return pd.RangeIndex(len(self), name=name)
+        index = pd.DatetimeIndex(self._blocks['index'].view('datetime64[ns]'), name=name)
+        return index.tz_localize('UTC').tz_convert(self._header['index_tz']) if self._header['index_tz'] else index
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.X.shape
+
+    def __len__(self):
+        return self.X.shape[0]
+
+    def fill_nan(self, value: float = 0.0) -> 'SharedFeatureMatrix':
+        """Replace NaN (and clip ±inf) in the features, in place for every attached process"""
+        np.nan_to_num(self.X, copy=False, nan=value)
+        return self
+
+    def constant_columns(self) -> np.ndarray:
+        """Boolean mask of feature columns holding a single value"""
+        if not len(self):
+            return np.ones(self.X.shape[1], dtype=bool)
+        return np.all(self.X == self.X[0], axis=0)
+
+    def time_series_folds(self, n_splits: int = 3, **kwargs) -> Iterator[Tuple[slice, slice]]:
+        """(train, test) row slices matching sklearn's TimeSeriesSplit"""
+        return time_series_folds(len(self), n_splits, **kwargs)
+
+    def fold_views(self, n_splits: int = 3, features: Optional[np.ndarray] = None,
+                   **kwargs) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Zero-copy (X_train, X_test, Y_train, Y_test) views per fold
+
+        features optionally replaces X (e.g. a column-selected matrix) and
+        is sliced the same way.
+        """
+        X = self.X if features is None else features
+        for train, test in self.time_series_folds(n_splits, **kwargs):
+            yield X[train], X[test], self.Y[train], self.Y[test]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Copy back out to a DataFrame (features then targets)"""
+        df = pd.DataFrame(self.X, columns=self.columns, index=self.index)
+        for j, column in enumerate(self.target_columns):
+            df[column] = self.Y[:, j]
+        return df
+
+    def close(self):
+        """Detach this process; views handed out earlier must be dropped first"""
+        if self._buffer is None:
+            return
+        self._blocks = {}
+        self._buffer = None
+        self._handle.close()
+
+    def unlink(self):
+        """Free the underlying segment or file (owner only)"""
+        if self.backend == 'shm':
+            self._handle.unlink()
+        elif os.path.exists(self.name):
+            os.unlink(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __reduce__(self):
+        # Pickles as a by-name reference; the receiver attaches instead of copying
+        return (SharedFeatureMatrix.attach, (self.name, self.backend))
@@ -0,0 +1,2 @@
+# __init__.py
+"""Enterprise AI Pipeline Module"""
\ No newline at end of file
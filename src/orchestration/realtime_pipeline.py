@@ -0,0 +1,382 @@
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import AsyncIterable, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from src.analytics_engine.report_generation import ReportGenerator
+from src.analytics_engine.signal_frame import SignalFrame
+from src.analytics_engine.trading_strategy import TradingStrategy
+from src.data_pipeline.replay_source import BarReplaySource
+from src.utils.latency import LatencyHistogram
+
+_STOP = object()
+
+# Every EnhancedFeatureEngine column except the target, in the engine's order,
+# so a model fitted on batch features can pick its selected columns by name
+FEATURE_COLUMNS = [
+    'Open', 'High', 'Low', 'Close', 'Volume', 'returns', 'log_returns',
+    'sma_5', 'ema_5', 'price_vs_sma_5', 'sma_10', 'ema_10', 'price_vs_sma_10',
+    'sma_20', 'ema_20', 'price_vs_sma_20', 'sma_50', 'ema_50', 'price_vs_sma_50',
+    'volatility_5d', 'volatility_20d', 'volatility_ratio',
+    'volume_sma_10', 'volume_ratio', 'volume_price_trend',
+    'momentum_5', 'momentum_10', 'rsi_14',
+    'resistance_20', 'support_20', 'price_vs_resistance', 'price_vs_support',
+    'trend_strength'
+]
+
+MA_WINDOWS = (5, 10, 20, 50)
+
+class Tick:
+    """A single quote or bar update; open/high/low default to the price for plain quotes"""
+
+    __slots__ = ('symbol', 'price', 'volume', 'timestamp', 'received', 'open', 'high', 'low')
+
+    def __init__(self, symbol: str, price: float, volume: float = 0.0,
+                 timestamp=None, received: Optional[float] = None,
+                 open_: Optional[float] = None, high: Optional[float] = None, low: Optional[float] = None):
+        self.symbol = symbol
+        self.price = price
+        self.volume = volume
+        self.timestamp = timestamp
+        self.received = time.perf_counter() if received is None else received
+        self.open = price if open_ is None else open_
+        self.high = price if high is None else high
+        self.low = price if low is None else low
+
+class CoalescingTickQueue:
+    """Bounded per-symbol buffer that keeps only the newest pending feature vector"""
+
+    def __init__(self, maxsize: int = 1000):
+        """Initialize with a cap on the number of symbols pending"""
+        self.maxsize = maxsize
+        self._pending: Dict[str, tuple] = {}
+        self._ready = asyncio.Event()
+        self._closed = False
+        self.coalesced = 0
+        self.dropped = 0
+
+    def put(self, tick: Tick, features: List[float]):
+        """Add a tick's features, replacing any pending entry for the same symbol"""
+        if tick.symbol in self._pending:
+            self.coalesced += 1
+        elif len(self._pending) >= self.maxsize:
+            self.dropped += 1
+            return
+        self._pending[tick.symbol] = (tick, features)
+        self._ready.set()
+
+    def close(self):
+        """Signal that no more ticks will arrive"""
+        self._closed = True
+        self._ready.set()
+
+    async def get(self):
+        """Pop the oldest pending (tick, features), or _STOP once closed and drained"""
+        while not self._pending:
+            if self._closed:
+                return _STOP
+            self._ready.clear()
+            await self._ready.wait()
+        symbol = next(iter(self._pending))
+        return self._pending.pop(symbol)
+
+class OnlineFeatureState:
+    """Incrementally maintained per-symbol FEATURE_COLUMNS matching EnhancedFeatureEngine"""
+
+    WARMUP = 50
+
+    def __init__(self):
+        self.closes = deque(maxlen=self.WARMUP)
+        self.highs = deque(maxlen=20)
+        self.lows = deque(maxlen=20)
+        self.volumes = deque(maxlen=10)
+        self.returns = deque(maxlen=20)
+        # pandas ewm(span).mean() (adjust=True) as running weighted sums over all bars
+        self.ema = {span: [0.0, 0.0] for span in MA_WINDOWS}
+
+    def update(self, price: float, volume: float, open_: Optional[float] = None,
+               high: Optional[float] = None, low: Optional[float] = None) -> Optional[List[float]]:
+        """Fold in a new bar and return the feature vector once warmed up"""
+        high = price if high is None else high
+        low = price if low is None else low
+        if self.closes:
+            self.returns.append(price / self.closes[-1] - 1)
+        self.closes.append(price)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.volumes.append(volume)
+        for span, sums in self.ema.items():
+            decay = 1 - 2 / (span + 1)
+            sums[0] = price + decay * sums[0]
+            sums[1] = 1 + decay * sums[1]
+
+        if len(self.closes) < self.WARMUP:
+            return None
+
+        closes = list(self.closes)
+        rets = list(self.returns)
+        features = [price if open_ is None else open_, high, low, price, volume,
+                    rets[-1], math.log(price / closes[-2])]
+        for window in MA_WINDOWS:
+            sma = sum(closes[-window:]) / window
+            numerator, weight = self.ema[window]
+            features += [sma, numerator / weight, price / sma - 1]
+
+        volatility_5d, volatility_20d = _std(rets[-5:]), _std(rets)
+        volume_mean = sum(self.volumes) / len(self.volumes)
+        deltas = [b - a for a, b in zip(closes[-15:-1], closes[-14:])]
+        gain = sum(d for d in deltas if d > 0) / 14
+        loss = -sum(d for d in deltas if d < 0) / 14
+        resistance, support = max(self.highs), min(self.lows)
+        trend = closes[-20:]
+
+        return features + [
+            volatility_5d,
+            volatility_20d,
+            volatility_5d / volatility_20d if volatility_20d > 0 else 1.0,
+            volume_mean,
+            volume / volume_mean if volume_mean > 0 else 1.0,
+            volume * rets[-1],
+            price / closes[-6] - 1,
+            price / closes[-11] - 1,
+            100 - 100 / (1 + gain / loss) if loss > 0 else 100.0,
+            resistance,
+            support,
+            price / resistance - 1,
+            price / support - 1,
+            (trend[-1] - trend[0]) / (_std(trend) + 1e-8)
+        ]
+
+def _std(values: List[float]) -> float:
+    """Sample standard deviation (pandas rolling std convention)"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean = sum(values) / n
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1))
+
+def momentum_scorer(features: np.ndarray) -> np.ndarray:
+    """Fallback scorer: logistic squash of 20-day trend and 5-day momentum"""
+    trend = features[:, FEATURE_COLUMNS.index('price_vs_sma_20')]
+    momentum = features[:, FEATURE_COLUMNS.index('momentum_5')]
+    return 1.0 / (1.0 + np.exp(-20.0 * (trend + momentum)))
+
+def model_scorer(fitted: Dict) -> Callable[[np.ndarray], np.ndarray]:
+    """Scorer for an OptimizedMLTrainingEngine.fit_final_model result
+
+    Picks the model's selected features out of each FEATURE_COLUMNS vector
+    and returns its up-move probability.
+    """
+    missing = [name for name in fitted['features'] if name not in FEATURE_COLUMNS]
+    if missing:
+        raise ValueError(f"Features not maintained online: {missing}")
+    columns = [FEATURE_COLUMNS.index(name) for name in fitted['features']]
+    pipeline = fitted['pipeline']
+    return lambda features: pipeline.predict_proba(np.nan_to_num(features[:, columns]))[:, -1]
+
+async def replay_ticks(financial_data: Union[Dict[str, pd.DataFrame], BarReplaySource],
+                       speed: Optional[float] = None):
+    """Replay recorded bars as ticks in timestamp order
+
+    speed=None replays as fast as possible, otherwise at speed x real time.
+    """
+    if isinstance(financial_data, BarReplaySource):
+        source = financial_data
+    else:
+        source = BarReplaySource(financial_data)
+
+    async for bar in source.areplay(speed):
+        yield Tick(bar.symbol, bar.close, bar.volume, bar.timestamp,
+                   open_=bar.open, high=bar.high, low=bar.low)
+
+class RealTimePipeline:
+    """Asyncio pipeline: ticks -> online features -> coalesced batched scoring -> signals -> reports
+
+    scorer maps an (n, len(FEATURE_COLUMNS)) array to up-move probabilities.
+    It may also be a fit_final_model result (see model_scorer) or an
+    estimator with predict_proba over all FEATURE_COLUMNS. The probability
+    fills SignalFrame.accuracy as well as probability, so min_confidence
+    and the strategy's BUY/STRONG_BUY cut-offs apply to the probability.
+    """
+
+    STAGES = ('features', 'scoring', 'signals', 'report')
+
+    def __init__(self, scorer: Optional[Callable] = None, portfolio_value: float = 10000,
+                 min_confidence: float = 0.55, batch_size: int = 64, batch_timeout: float = 0.005,
+                 queue_size: int = 256, max_pending_symbols: int = 10000,
+                 max_staleness: Optional[float] = 1.0,
+                 on_report: Optional[Callable] = None):
+        """Initialize stage settings, queues are created per run"""
+        if isinstance(scorer, dict):
+            scorer = model_scorer(scorer)
+        elif scorer is not None and hasattr(scorer, 'predict_proba'):
+            model = scorer
+            scorer = lambda X: model.predict_proba(X)[:, 1]
+        self.scorer = scorer or momentum_scorer
+        self.portfolio_value = portfolio_value
+        self.min_confidence = min_confidence
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.queue_size = queue_size
+        self.max_pending_symbols = max_pending_symbols
+        self.max_staleness = max_staleness
+        self.on_report = on_report
+
+        self.strategy = TradingStrategy()
+        self.report_generator = ReportGenerator()
+        self.feature_state: Dict[str, OnlineFeatureState] = {}
+        self.latest_features: Dict[str, List[float]] = {}
+        self.latest_scores: Dict[str, float] = {}
+        self.latency = {name: LatencyHistogram() for name in self.STAGES + ('end_to_end',)}
+        self.stats = {'ticks': 0, 'stale': 0, 'scored': 0, 'reports': 0}
+        self.ticks: Optional[CoalescingTickQueue] = None
+
+    async def run(self, source: AsyncIterable[Tick]):
+        """Drive the pipeline from a tick source until it is exhausted"""
+        self.ticks = CoalescingTickQueue(self.max_pending_symbols)
+        scoring_q = asyncio.Queue(self.queue_size)
+        signal_q = asyncio.Queue(self.queue_size)
+        report_q = asyncio.Queue(self.queue_size)
+        started = time.perf_counter()
+
+        await asyncio.gather(
+            self._features(source),
+            self._dispatch(scoring_q),
+            self._scoring(scoring_q, signal_q),
+            self._signals(signal_q, report_q),
+            self._reports(report_q)
+        )
+        return self.latency_report(time.perf_counter() - started)
+
+    async def _features(self, source: AsyncIterable[Tick]):
+        """Online feature update for every tick, in arrival order
+
+        Rolling windows must see every bar, so only the downstream scoring
+        work is coalesced: the buffer keeps the newest vector per symbol.
+        """
+        try:
+            async for tick in source:
+                self.stats['ticks'] += 1
+                t0 = time.perf_counter()
+                state = self.feature_state.get(tick.symbol)
+                if state is None:
+                    state = self.feature_state[tick.symbol] = OnlineFeatureState()
+                features = state.update(tick.price, tick.volume, tick.open, tick.high, tick.low)
+                self.latency['features'].record(time.perf_counter() - t0)
+
+                if features is not None:
+                    self.latest_features[tick.symbol] = features
+                    self.ticks.put(tick, features)
+        finally:
+            self.ticks.close()
+
+    async def _dispatch(self, out_q: asyncio.Queue):
+        """Forward the newest feature vector per symbol to scoring, skipping stale ones"""
+        while True:
+            item = await self.ticks.get()
+            if item is _STOP:
+                await out_q.put(_STOP)
+                return
+
+            tick, _ = item
+            if self.max_staleness is not None and time.perf_counter() - tick.received > self.max_staleness:
+                self.stats['stale'] += 1
+                continue
+            await out_q.put(item)
+
+    async def _scoring(self, in_q: asyncio.Queue, out_q: asyncio.Queue):
+        """Collect feature vectors into batches and score them together"""
+        done = False
+        while not done:
+            batch = []
+            item = await in_q.get()
+            if item is _STOP:
+                break
+            batch.append(item)
+
+            deadline = time.perf_counter() + self.batch_timeout
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(in_q.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    done = True
+                    break
+                batch.append(item)
+
+            t0 = time.perf_counter()
+            ticks = [tick for tick, _ in batch]
+            scores = np.asarray(self.scorer(np.array([f for _, f in batch], dtype=float)), dtype=float)
+            self.stats['scored'] += len(batch)
+            self.latency['scoring'].record(time.perf_counter() - t0)
+            await out_q.put((ticks, scores))
+
+        await out_q.put(_STOP)
+
+    async def _signals(self, in_q: asyncio.Queue, out_q: asyncio.Queue):
+        """Threshold the latest score of every symbol into trading signals
+
+        The probability stands in for model accuracy in the signal frame.
+        """
+        while True:
+            item = await in_q.get()
+            if item is _STOP:
+                await out_q.put(_STOP)
+                return
+
+            t0 = time.perf_counter()
+            ticks, scores = item
+            for tick, score in zip(ticks, scores):
+                self.latest_scores[tick.symbol] = float(score)
+
+            symbols = list(self.latest_scores)
+            probs = np.fromiter(self.latest_scores.values(), dtype=float, count=len(symbols))
+            frame = SignalFrame(symbols, probs, probability=probs)
+            self.strategy.generate_signal_frame(frame, self.min_confidence)
+            self.strategy.allocate(frame, self.portfolio_value)
+            self.latency['signals'].record(time.perf_counter() - t0)
+            await out_q.put((ticks, frame))
+
+    async def _reports(self, in_q: asyncio.Queue):
+        """Emit a trading report per scored batch and close out tick latency"""
+        while True:
+            item = await in_q.get()
+            if item is _STOP:
+                return
+
+            t0 = time.perf_counter()
+            ticks, frame = item
+            report = self.report_generator.generate_trading_report(
+                frame.to_dict(), frame.positions(), self.portfolio_value
+            )
+            if self.on_report is not None:
+                result = self.on_report(report)
+                if asyncio.iscoroutine(result):
+                    await result
+            self.stats['reports'] += 1
+
+            done = time.perf_counter()
+            self.latency['report'].record(done - t0)
+            for tick in ticks:
+                self.latency['end_to_end'].record(done - tick.received)
+
+    def latency_report(self, elapsed: float = None) -> Dict:
+        """Per-stage and end-to-end latency summary plus throughput counters"""
+        report = {name: hist.summary() for name, hist in self.latency.items()}
+        report['stats'] = dict(self.stats)
+        if self.ticks is not None:
+            report['stats']['coalesced'] = self.ticks.coalesced
+            report['stats']['dropped'] = self.ticks.dropped
+        if elapsed:
+            report['stats']['elapsed_s'] = elapsed
+            report['stats']['ticks_per_s'] = self.stats['ticks'] / elapsed
+        return report
@@ -0,0 +1,404 @@
+
+import inspect
+import json
+import os
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from src.orchestration.stage_pipeline import StagePipeline
+from src.utils.config_loader import ConfigLoader
+from src.utils.latency import LatencyHistogram
+
+@dataclass(frozen=True)
+class ServiceState:
+    """One immutable generation of prices, features and fitted models
+
+    Requests read whichever generation is current when they start; a
+    refresh builds the next one off to the side and swaps it in whole.
+    """
+    version: int = 0
+    prices: Dict = field(default_factory=dict)
+    features: Dict = field(default_factory=dict)
+    models: Dict = field(default_factory=dict)
+    model_results: Dict = field(default_factory=dict)
+    estimator: Any = None
+    loaded_at: str = field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+class TTLCache:
+    """Thread-safe response cache whose entries expire after ttl seconds"""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute: Callable[[], Any]):
+        """Cached value for key, computing (outside the lock) on miss or expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+class PipelineService:
+    """Keeps config, price panels, features and fitted models resident between requests"""
+
+    def __init__(self, config: Optional[ConfigLoader] = None, data_engine=None,
+                 cache_ttl: Optional[float] = None):
+        """Initialize with an optional data engine (defaults to DataIngestionEngine)"""
+        from src.analytics_engine.business_analytics import BusinessAnalytics
+        from src.analytics_engine.report_generation import ReportGenerator
+        from src.analytics_engine.trading_strategy import TradingStrategy
+        from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+        from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+
+        if data_engine is None:
+            from src.data_pipeline.data_ingestion import DataIngestionEngine
+            data_engine = DataIngestionEngine()
+
+        self.config = config or ConfigLoader()
+        self.data_engine = data_engine
+        self.feature_engine = EnhancedFeatureEngine()
+        self.ml_engine = OptimizedMLTrainingEngine()
+        self.strategy = TradingStrategy()
+        self.analytics = BusinessAnalytics()
+        self.reports = ReportGenerator()
+
+        self._fixed_cache_ttl = cache_ttl
+        self.cache = TTLCache(cache_ttl if cache_ttl is not None else self.config.get('service.cache_ttl', 30))
+        self.config.subscribe(self._on_config_change)
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.started_at = time.time()
+        self._state = ServiceState()
+        self._swap_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/stats'): self.stats,
+            ('POST', '/refresh'): self.refresh,
+            ('GET', '/score'): self.score,
+            ('GET', '/signals'): self.signals,
+            ('GET', '/report'): self.report
+        }
+
+    @staticmethod
+    def _build_optimizer(snap):
+        """Portfolio optimizer for one config generation"""
+        from src.analytics_engine.portfolio_optimizer import PortfolioOptimizer
+        return PortfolioOptimizer(
+            max_positions=snap.get('trading.max_positions', 5),
+            risk_per_trade=snap.get('trading.risk_per_trade', 0.02),
+            max_weight=snap.get('trading.max_weight'),
+            target_volatility=snap.get('trading.target_volatility', 0.10)
+        )
+
+    def _on_config_change(self, old, new):
+        """Apply a reloaded config: retune the cache TTL"""
+        if self._fixed_cache_ttl is None:
+            self.cache.ttl = new.get('service.cache_ttl', 30)
+
+    @property
+    def state(self) -> ServiceState:
+        return self._state
+
+    def swap_state(self, state: ServiceState):
+        """Publish a new generation; in-flight requests finish on the old one"""
+        with self._swap_lock:
+            self._state = replace(state, version=self._state.version + 1)
+
+    def refresh(self, symbols: Optional[List[str]] = None, period: Optional[str] = None,
+                retrain: bool = True) -> Dict:
+        """Re-fetch data and features, optionally refit models, then hot-swap the state
+
+        Symbols not in this refresh keep their previous data and models.
+        Only one refresh runs at a time; a concurrent call returns 'busy'.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return {'status': 'busy', 'version': self._state.version}
+        try:
+            return self._refresh(symbols, period, retrain)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self, symbols: Optional[List[str]], period: Optional[str], retrain: bool) -> Dict:
+        started = time.perf_counter()
+        current = self._state
+        snap = self.config.snapshot
+        symbols = symbols or snap.get('data_sources.symbols', ['AAPL', 'MSFT', 'GOOGL'])
+        period = period or snap.get('data_sources.period', '1y')
+        prices, features, models = {}, {}, {}
+
+        def fetch(symbol, _):
+            data = self.data_engine.get_financial_data([symbol], period=period).get(symbol)
+            if data is not None:
+                prices[symbol] = data
+            return data
+
+        def featurize(symbol, data):
+            features[symbol] = self.feature_engine.create_enhanced_features(data, symbol)
+            return features[symbol]
+
+        def train(symbol, features_df):
+            if 'target' not in features_df.columns or len(features_df) <= 30:
+                return None
+            X, y = features_df.drop('target', axis=1), features_df['target']
+            results = self.ml_engine.train_optimized_models(X, y)
+            if results:
+                best = max(results, key=lambda name: results[name]['accuracy'])
+                models[symbol] = self.ml_engine.fit_final_model(X, y, best)
+            return results
+
+        stages = [
+            ('fetch', fetch, snap.get('pipeline.fetch_workers', 8)),
+            ('features', featurize, snap.get('pipeline.feature_workers', 2))
+        ]
+        if retrain:
+            stages.append(('training', train, snap.get('pipeline.training_workers', 2)))
+        pipeline = StagePipeline(stages, queue_size=snap.get('pipeline.queue_size', 16))
+        outputs = pipeline.run((symbol, None) for symbol in symbols)
+
+        model_results = dict(current.model_results)
+        if retrain:
+            model_results.update(outputs)
+            models = dict(current.models, **models)
+        else:
+            models = dict(current.models)
+        prices = dict(current.prices, **prices)
+        features = dict(current.features, **features)
+        closes = {symbol: df[['Close']] for symbol, df in prices.items()}
+
+        self.swap_state(ServiceState(
+            prices=prices,
+            features=features,
+            models=models,
+            model_results=model_results,
+            estimator=self._estimator(current.estimator, closes)
+        ))
+
+        return {
+            'status': 'ok',
+            'version': self._state.version,
+            'refreshed': sorted(outputs),
+            'errors': pipeline.report['errors'],
+            'retrained': retrain,
+            'seconds': time.perf_counter() - started
+        }
+
+    @staticmethod
+    def _estimator(previous, closes: Dict):
+        """Merge only new bars into the previous generation's covariance estimate"""
+        from src.analytics_engine.portfolio_optimizer import IncrementalCovarianceEstimator
+
+        if not closes:
+            return None
+        if previous is None:
+            return IncrementalCovarianceEstimator.from_price_data(closes)
+        return previous.extended(closes)
+
+    def score(self, symbols: Optional[List[str]] = None) -> Dict:
+        """Up-move probability for each symbol's latest feature row"""
+        import numpy as np
+
+        state = self._state
+        symbols = symbols or sorted(state.models)
+        scores = {}
+
+        for symbol in symbols:
+            fitted, df = state.models.get(symbol), state.features.get(symbol)
+            if fitted is None or df is None or df.empty:
+                scores[symbol] = None
+                continue
+            row = np.nan_to_num(df[fitted['features']].iloc[-1:].to_numpy(dtype=float))
+            scores[symbol] = {
+                'probability_up': float(fitted['pipeline'].predict_proba(row)[0, -1]),
+                'model': fitted['model'],
+                'as_of': str(df.index[-1])
+            }
+
+        return {'version': state.version, 'scores': scores}
+
+    def _signal_frame(self, state: ServiceState, snap):
+        """Signals and allocation for a state generation under one config generation"""
+        frame = self.strategy.generate_signal_frame(
+            state.model_results, snap.get('model_training.min_confidence', 0.55)
+        )
+        portfolio_value = snap.get('trading.portfolio_value', 10000)
+        if state.estimator is not None:
+            self._build_optimizer(snap).allocate(frame, state.estimator, portfolio_value,
+                                                 snap.get('trading.allocation_method', 'risk_parity'))
+        else:
+            self.strategy.allocate(frame, portfolio_value)
+        return frame
+
+    def signals(self) -> Dict:
+        """Current trading signals and positions"""
+        state = self._state
+        frame = self._signal_frame(state, self.config.snapshot)
+        return {'version': state.version, 'signals': frame.to_dict(), 'positions': frame.positions()}
+
+    def report(self) -> Dict:
+        """Trading report plus performance metrics for the current state"""
+        state, snap = self._state, self.config.snapshot
+        frame = self._signal_frame(state, snap)
+        report = self.reports.generate_trading_report(
+            frame.to_dict(), frame.positions(), snap.get('trading.portfolio_value', 10000)
+        )
+        report['metrics'] = self.analytics.calculate_performance_metrics(frame)
+        report['version'] = state.version
+        return report
+
+    def health(self) -> Dict:
+        state = self._state
+        return {
+            'status': 'ok',
+            'version': state.version,
+            'loaded_at': state.loaded_at,
+            'symbols': sorted(state.prices),
+            'models': len(state.models),
+            'config_version': self.config.version,
+            'uptime_s': time.time() - self.started_at
+        }
+
+    def stats(self) -> Dict:
+        """Per-route latency percentiles and cache hit counts"""
+        with self._stats_lock:
+            latency = {route: hist.summary() for route, hist in self.latency.items()}
+        return {'latency_ms': latency, 'cache': {'hits': self.cache.hits, 'misses': self.cache.misses}}
+
+    def handle(self, method: str, path: str, params: Optional[Dict] = None) -> Tuple[int, Dict]:
+        """Dispatch one request to (status, JSON-able payload)"""
+        handler = self.routes.get((method, path))
+        if handler is None:
+            return 404, {'error': f"no route for {method} {path}"}
+
+        params = params or {}
+        try:
+            inspect.signature(handler).bind(**params)
+        except TypeError as e:
+            return 400, {'error': str(e)}
+
+        begin = time.perf_counter()
+        try:
+            if path in ('/refresh', '/health', '/stats'):
+                payload = handler(**params)
+            else:
+                # Keyed by state and config version, so a hot-swap or config
+                # reload never serves stale results
+                key = (path, json.dumps(params, sort_keys=True), self._state.version, self.config.version)
+                payload = self.cache.get_or_compute(key, lambda: handler(**params))
+            status = 409 if payload.get('status') == 'busy' else 200
+        except Exception as e:
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+        elapsed = time.perf_counter() - begin
+        with self._stats_lock:
+            self.latency.setdefault(path, LatencyHistogram()).record(elapsed)
+        return status, payload
+
+class _ServiceRequestHandler(BaseHTTPRequestHandler):
+    """JSON over HTTP: GET query strings or POST JSON bodies become handler kwargs"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {}
+        for key, values in parse_qs(url.query).items():
+            # symbols=AAPL,MSFT or symbols=AAPL&symbols=MSFT
+            params[key] = [v for value in values for v in value.split(',') if v] if key == 'symbols' else values[-1]
+        self._respond(*self.server.service.handle('GET', url.path, params))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}') if length else {}
+        except ValueError:
+            self._respond(400, {'error': 'body must be JSON'})
+            return
+        self._respond(*self.server.service.handle('POST', urlparse(self.path).path, params))
+
+    def _respond(self, status: int, payload: Dict):
+        body = json.dumps(payload, default=_json_default).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class _WorkerPoolMixin:
+    """Handles each accepted connection on a fixed-size thread pool"""
+
+    def init_pool(self, service: PipelineService, workers: int, verbose: bool):
+        self.service = service
+        self.verbose = verbose
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='autodata-worker')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+class PooledHTTPServer(_WorkerPoolMixin, HTTPServer):
+    pass
+
+class PooledUnixHTTPServer(_WorkerPoolMixin, socketserver.UnixStreamServer):
+    pass
+
+def create_server(service: PipelineService, host: str = '127.0.0.1', port: int = 8765,
+                  unix_socket: Optional[str] = None, workers: int = 4, verbose: bool = False):
+    """Bind a pooled HTTP server on host:port, or on a Unix socket path if given"""
+    if unix_socket:
+        # Only clear a stale socket left by a previous run, never a regular file
+        if os.path.exists(unix_socket):
+            if not stat.S_ISSOCK(os.stat(unix_socket).st_mode):
+                raise FileExistsError(f"{unix_socket} exists and is not a socket")
+            os.unlink(unix_socket)
+        server = PooledUnixHTTPServer(unix_socket, _ServiceRequestHandler)
+    else:
+        server = PooledHTTPServer((host, port), _ServiceRequestHandler)
+    server.init_pool(service, workers, verbose)
+    return server
+
+def _json_default(value):
+    """Serialize numpy scalars/arrays and timestamps"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,165 @@
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+_STOP = object()
+
+class _WorkItem:
+    """One symbol travelling through the stages, with its timing trail"""
+
+    __slots__ = ('key', 'value', 'enqueued', 'trail')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.enqueued = time.perf_counter()
+        self.trail: List[Tuple[str, float, float, float]] = []
+
+class StagePipeline:
+    """Streams items through thread-pooled stages connected by bounded queues
+
+    Each stage is (name, fn, workers). fn(key, value) returns the value passed
+    to the next stage, or None to drop the item. An item enters a stage as
+    soon as its previous stage finishes, so I/O-bound and CPU-bound stages
+    overlap instead of running as strict phases. An exception drops the
+    item and is recorded in errors; run() prints them once all stages finish.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any, Any], Any], int]], queue_size: int = 16):
+        """Initialize with ordered (name, fn, workers) stages"""
+        if not stages:
+            raise ValueError("StagePipeline needs at least one stage")
+        for name, _, workers in stages:
+            # A stage without workers never drains its queue, so run() would hang
+            if workers < 1:
+                raise ValueError(f"Stage {name!r} needs at least 1 worker, got {workers}")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.results: Dict[Any, Any] = {}
+        self.errors: Dict[Any, Tuple[str, Exception]] = {}
+        self.report: Dict = {}
+        self._completed: List[_WorkItem] = []
+        self._lock = threading.Lock()
+
+    def run(self, items: Iterable[Tuple[Any, Any]]) -> Dict[Any, Any]:
+        """Process (key, value) items and return final stage outputs by key"""
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        busy = {name: 0.0 for name, _, _ in self.stages}
+        processed = {name: 0 for name, _, _ in self.stages}
+        remaining = [workers for _, _, workers in self.stages]
+        started = time.perf_counter()
+
+        def worker(index: int):
+            name, fn, _ = self.stages[index]
+            out_q = queues[index + 1] if index + 1 < len(queues) else None
+
+            while True:
+                item = queues[index].get()
+                if item is _STOP:
+                    break
+
+                begin = time.perf_counter()
+                try:
+                    value = fn(item.key, item.value)
+                except Exception as e:
+                    value = None
+                    with self._lock:
+                        self.errors[item.key] = (name, e)
+                end = time.perf_counter()
+
+                item.trail.append((name, item.enqueued, begin, end))
+                with self._lock:
+                    busy[name] += end - begin
+                    processed[name] += 1
+
+                if value is None:
+                    continue
+                item.value = value
+                item.enqueued = end
+                if out_q is not None:
+                    out_q.put(item)
+                else:
+                    with self._lock:
+                        self.results[item.key] = value
+                        self._completed.append(item)
+
+            # Last worker out closes the next stage
+            with self._lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last and out_q is not None:
+                for _ in range(self.stages[index + 1][2]):
+                    out_q.put(_STOP)
+
+        threads = [
+            threading.Thread(target=worker, args=(i,), name=f"{name}-{w}", daemon=True)
+            for i, (name, _, workers) in enumerate(self.stages)
+            for w in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for key, value in items:
+            queues[0].put(_WorkItem(key, value))
+        for _ in range(self.stages[0][2]):
+            queues[0].put(_STOP)
+
+        for thread in threads:
+            thread.join()
+
+        self.report = self._build_report(time.perf_counter() - started, started, busy, processed)
+        for key, message in self.report['errors'].items():
+            print(f"   ❌ {key} failed in {message}")
+        return self.results
+
+    def _build_report(self, wall: float, started: float, busy: Dict[str, float],
+                      processed: Dict[str, int]) -> Dict:
+        """Stage utilization plus the critical path of the last item to finish"""
+        stages = {}
+        for name, _, workers in self.stages:
+            stages[name] = {
+                'workers': workers,
+                'items': processed[name],
+                'busy_s': busy[name],
+                'utilization': busy[name] / (workers * wall) if wall > 0 else 0.0
+            }
+
+        critical_path = []
+        if self._completed:
+            last = max(self._completed, key=lambda item: item.trail[-1][3])
+            for name, enqueued, begin, end in last.trail:
+                critical_path.append({
+                    'stage': name,
+                    'wait_s': begin - enqueued,
+                    'service_s': end - begin,
+                    'finished_at_s': end - started
+                })
+            critical_path = {'key': last.key, 'segments': critical_path}
+
+        return {
+            'wall_time_s': wall,
+            'completed': len(self.results),
+            'errors': {key: f"{stage}: {type(e).__name__}: {e}" for key, (stage, e) in self.errors.items()},
+            'stages': stages,
+            'critical_path': critical_path
+        }
+
+    def print_report(self):
+        """Print stage utilization and the critical path"""
+        report = self.report
+        print(f"   ⏱️ Wall time: {report['wall_time_s']:.2f}s, {report['completed']} completed, "
+              f"{len(report['errors'])} failed")
+        for name, stats in report['stages'].items():
+            print(f"      • {name}: {stats['items']} items, {stats['workers']} workers, "
+                  f"{stats['utilization']:.0%} utilization")
+        if report['critical_path']:
+            path = report['critical_path']
+            segments = " → ".join(
+                f"{s['stage']} (wait {s['wait_s']:.2f}s, run {s['service_s']:.2f}s)"
+                for s in path['segments']
+            )
+            print(f"   🧭 Critical path ({path['key']}): {segments}")
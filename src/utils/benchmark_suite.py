@@ -0,0 +1,304 @@
+
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.analytics_engine.report_generation import ReportGenerator
+from src.analytics_engine.trade_sink import TradeReportSink
+from src.analytics_engine.trading_strategy import TradingStrategy
+from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+from src.data_pipeline.replay_source import BarReplaySource
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+
+TRADING_DAYS = 252
+
+# Each grid times its per-symbol cases on at most sample_caps symbols per
+# scale (recorded as measured_symbols), so training stays seconds, not hours
+QUICK_SCALES = {'symbols': (10, 100), 'years': (1,), 'sample_caps': {'features': 50, 'training': 2}}
+FULL_SCALES = {'symbols': (10, 100, 1000, 10000), 'years': (1, 5, 30),
+               'sample_caps': {'ingestion': 200, 'features': 50, 'training': 2}}
+
+CASE_GROUPS = ('ingestion', 'features', 'training', 'signals', 'reporting')
+
+class BenchmarkSuite:
+    """Seeded offline benchmarks of every pipeline stage over a symbols x years grid"""
+
+    def __init__(self, seed: int = 42, repeat: int = 1, sample_caps: Optional[Dict[str, int]] = None,
+                 chunk_size: int = 250, verbose: bool = True):
+        """Initialize suite; repeat keeps the best of N timings per case
+
+        sample_caps opts per-symbol case groups (ingestion, features, training)
+        into timing at most that many symbols per scale; by default every case
+        runs at full size. Panel-wide cases (signals, reporting) are never capped.
+        """
+        self.seed = seed
+        self.repeat = max(1, repeat)
+        self.sample_caps = dict(sample_caps or {})
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+        self.features = EnhancedFeatureEngine()
+        self.strategy = TradingStrategy()
+        self.reports = ReportGenerator()
+
+    def run(self, symbol_counts: Sequence[int] = QUICK_SCALES['symbols'],
+            years: Sequence[int] = QUICK_SCALES['years'],
+            groups: Iterable[str] = CASE_GROUPS) -> Dict:
+        """Run the selected case groups at every scale and return one run record"""
+        groups = [g for g in CASE_GROUPS if g in set(groups)]
+        results = []
+        started = time.perf_counter()
+
+        for n_years in years:
+            for n_symbols in symbol_counts:
+                if self.verbose:
+                    print(f"⏱️ Benchmarking {n_symbols} symbols x {n_years}y...")
+                for group in groups:
+                    for case in getattr(self, f'_bench_{group}')(n_symbols, n_years):
+                        case.update(symbols=n_symbols, years=n_years)
+                        results.append(case)
+                        if self.verbose:
+                            sampled = (f" [sampled {case['measured_symbols']}]"
+                                       if case['measured_symbols'] != n_symbols else "")
+                            print(f"   • {case['case']}{sampled}: {case['seconds']:.4f}s "
+                                  f"({case['per_symbol_s'] * 1000:.3f} ms/symbol)")
+
+        return {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': self.seed,
+            'repeat': self.repeat,
+            'sample_caps': self.sample_caps,
+            'wall_time_s': time.perf_counter() - started,
+            'results': results
+        }
+
+    def _symbols(self, n_symbols: int, group: Optional[str] = None) -> List[str]:
+        """Symbol names for a scale, truncated to the group's sample cap if one is set"""
+        if group in self.sample_caps:
+            n_symbols = min(n_symbols, self.sample_caps[group])
+        return [f"SYN{i:05d}" for i in range(n_symbols)]
+
+    def _panels(self, symbols: List[str], n_years: int):
+        """Regime-switching synthetic panels streamed chunk by chunk"""
+        generator = SyntheticMarketGenerator(self.seed, regimes=True)
+        return generator.iter_panels(symbols, n_years * TRADING_DAYS, self.chunk_size)
+
+    def _time(self, fn, *args) -> float:
+        """Best-of-repeat wall time for fn(*args), engine prints silenced"""
+        best = float('inf')
+        for _ in range(self.repeat):
+            with redirect_stdout(io.StringIO()):
+                begin = time.perf_counter()
+                fn(*args)
+                best = min(best, time.perf_counter() - begin)
+        return best
+
+    def _case(self, name: str, seconds: float, measured: int, rows: int) -> Dict:
+        return {
+            'case': name,
+            'measured_symbols': measured,
+            'rows': rows,
+            'seconds': seconds,
+            'per_symbol_s': seconds / measured if measured else 0.0,
+            'rows_per_s': rows / seconds if seconds > 0 else 0.0
+        }
+
+    def _bench_ingestion(self, n_symbols: int, n_years: int) -> List[Dict]:
+        """Parse history() CSV dumps back into frames via BarReplaySource"""
+        symbols = self._symbols(n_symbols, 'ingestion')
+        seconds = rows = 0
+        for panel in self._panels(symbols, n_years):
+            directory = tempfile.mkdtemp(prefix='autodata_bench_')
+            try:
+                for symbol, df in panel.items():
+                    df.to_csv(os.path.join(directory, f"{symbol}.csv"))
+                    rows += len(df)
+                seconds += self._time(BarReplaySource.from_directory, directory)
+            finally:
+                shutil.rmtree(directory, ignore_errors=True)
+        return [self._case('ingestion.parse_csv', seconds, len(symbols), rows)]
+
+    def _bench_features(self, n_symbols: int, n_years: int) -> List[Dict]:
+        """Time each EnhancedFeatureEngine group separately, in pipeline order"""
+        symbols = self._symbols(n_symbols, 'features')
+        groups = EnhancedFeatureEngine.FEATURE_GROUPS
+        seconds = dict.fromkeys(groups, 0.0)
+        rows = 0
+
+        for panel in self._panels(symbols, n_years):
+            for df in panel.values():
+                rows += len(df)
+                for group in groups:
+                    method = getattr(self.features, f'add_{group}_features')
+                    best = float('inf')
+                    for _ in range(self.repeat):
+                        # Each repeat starts from the same upstream columns
+                        work = df.copy()
+                        for earlier in groups[:groups.index(group)]:
+                            getattr(self.features, f'add_{earlier}_features')(work)
+                        begin = time.perf_counter()
+                        method(work)
+                        best = min(best, time.perf_counter() - begin)
+                    seconds[group] += best
+
+        cases = [self._case(f'features.{group}', seconds[group], len(symbols), rows) for group in groups]
+        cases.append(self._case('features.total', sum(seconds.values()), len(symbols), rows))
+        return cases
+
+    def _bench_training(self, n_symbols: int, n_years: int) -> List[Dict]:
+        """Both training engines on enhanced features of a few symbols"""
+        from src.ml_pipeline.model_training import MLTrainingEngine
+        from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+
+        symbols = self._symbols(n_symbols, 'training')
+        engines = {
+            'training.ensemble': MLTrainingEngine().train_ensemble_model,
+            'training.optimized': OptimizedMLTrainingEngine().train_optimized_models
+        }
+        seconds = dict.fromkeys(engines, 0.0)
+        rows = 0
+
+        for panel in self._panels(symbols, n_years):
+            for df in panel.values():
+                data = self.features.create_enhanced_features(df)
+                X, y = data.drop(columns='target'), data['target']
+                rows += len(data)
+                for name, train in engines.items():
+                    seconds[name] += self._time(train, X, y)
+
+        return [self._case(name, seconds[name], len(symbols), rows) for name in engines]
+
+    def _bench_signals(self, n_symbols: int, n_years: int) -> List[Dict]:
+        """Signal thresholding and allocation over a full-size model_results dict"""
+        model_results = self._model_results(n_symbols)
+        signals = self._time(self.strategy.generate_signal_frame, model_results)
+        frame = self.strategy.generate_signal_frame(model_results)
+        allocation = self._time(self.strategy.allocate, frame, 100000)
+        return [
+            self._case('signals.generate', signals, n_symbols, n_symbols),
+            self._case('signals.allocate', allocation, n_symbols, n_symbols)
+        ]
+
+    def _bench_reporting(self, n_symbols: int, n_years: int) -> List[Dict]:
+        """Trading report at full size, execution report over monthly rebalance trades"""
+        frame = self.strategy.allocate(self.strategy.generate_signal_frame(self._model_results(n_symbols)), 100000)
+
+        def trading_report():
+            self.reports.generate_trading_report(frame.to_dict(), frame.positions(), 100000)
+
+        directory = tempfile.mkdtemp(prefix='autodata_bench_')
+        try:
+            sink = TradeReportSink(os.path.join(directory, 'trades.jsonl'))
+            n_trades = n_symbols * n_years * 12
+            rng = np.random.default_rng(self.seed)
+            actions = np.where(rng.random(n_trades) < 0.5, 'BUY', 'SELL')
+            prices = rng.uniform(20, 500, n_trades).round(2)
+            with sink:
+                for i in range(n_trades):
+                    sink.append({'symbol': f"SYN{i % n_symbols:05d}", 'action': str(actions[i]),
+                                 'quantity': 10, 'price': float(prices[i])})
+
+            def execution_report():
+                self.reports.generate_execution_report(sink)
+                sum(1 for _ in sink.iter_trades())
+
+            trading = self._time(trading_report)
+            execution = self._time(execution_report)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+        return [
+            self._case('reporting.trading', trading, n_symbols, n_symbols),
+            self._case('reporting.execution', execution, n_symbols, n_trades)
+        ]
+
+    def _model_results(self, n_symbols: int) -> Dict:
+        """Seeded training-output dict shaped like train_optimized_models per symbol"""
+        rng = np.random.default_rng(self.seed)
+        accuracy = rng.uniform(0.45, 0.70, (n_symbols, 2)).round(3)
+        return {
+            symbol: {
+                'random_forest': {'accuracy': accuracy[i, 0], 'samples': 500},
+                'gradient_boost': {'accuracy': accuracy[i, 1], 'samples': 500}
+            }
+            for i, symbol in enumerate(self._symbols(n_symbols))
+        }
+
+def load_history(path: str) -> List[Dict]:
+    """Recorded runs, oldest first"""
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return json.load(file)
+
+def append_history(path: str, run: Dict) -> List[Dict]:
+    """Append a run record and rewrite the history file atomically"""
+    history = load_history(path)
+    history.append(run)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    with os.fdopen(fd, 'w') as file:
+        json.dump(history, file, indent=2)
+    os.replace(tmp_path, path)
+    return history
+
+def compare_runs(baseline: Dict, current: Dict, threshold: float = 0.10,
+                 min_seconds: float = 0.001) -> List[Dict]:
+    """Per-symbol cost changes for cases present in both runs
+
+    A case is a regression when its per-symbol time grew by more than
+    threshold (0.10 = 10%). Cases faster than min_seconds in both runs are
+    reported but never flagged, since their timings are mostly noise.
+    Cases only match when they timed the same number of symbols, so a
+    sampled run is never compared against a full-size one.
+    """
+    key = lambda r: (r['case'], r['symbols'], r.get('measured_symbols', r['symbols']), r['years'])
+    before = {key(r): r for r in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        ratio = result['per_symbol_s'] / old['per_symbol_s'] if old['per_symbol_s'] > 0 else float('inf')
+        noisy = max(result['seconds'], old['seconds']) < min_seconds
+        if not noisy and ratio > 1 + threshold:
+            status = 'regression'
+        elif not noisy and ratio < 1 - threshold:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({
+            'case': result['case'],
+            'symbols': result['symbols'],
+            'measured_symbols': result['measured_symbols'],
+            'years': result['years'],
+            'baseline_per_symbol_s': old['per_symbol_s'],
+            'current_per_symbol_s': result['per_symbol_s'],
+            'ratio': ratio,
+            'status': status
+        })
+
+    return rows
+
+def _git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, if run inside a git work tree"""
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
@@ -1,29 +1,128 @@
 
 import yaml
 import os
-from typing import Dict, Any
+import tempfile
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+_MISSING = object()
+_NOT_CACHED = object()
+
+def deep_merge(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """New dict with updates merged into base, recursing into nested dicts"""
+    merged = dict(base)
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def _freeze(value):
+    """Read-only copy: dicts become mappingproxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _thaw(value):
+    """Plain dict/list copy of a frozen value"""
+    if isinstance(value, MappingProxyType):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+class ConfigSnapshot:
+    """Immutable configuration generation with memoized dotted-key lookups"""
+
+    __slots__ = ('data', 'version', '_lookups')
+
+    def __init__(self, data: Dict[str, Any], version: int = 0):
+        self.data = _freeze(data)
+        self.version = version
+        self._lookups: Dict[str, Any] = {}
+
+    def get(self, key: str, default=None):
+        """Value at a dotted key; the path is walked once per snapshot
+
+        Dicts and lists come back as fresh plain copies, so callers may
+        mutate or serialize them without touching the snapshot.
+        """
+        value = self._lookups.get(key, _NOT_CACHED)
+        if value is _NOT_CACHED:
+            # Racing readers compute the same value, so no lock is needed
+            value = self._lookups[key] = self._resolve(key)
+        return default if value is _MISSING else _thaw(value)
+
+    def _resolve(self, key: str):
+        value = self.data
+        for k in key.split('.'):
+            if isinstance(value, MappingProxyType) and k in value:
+                value = value[k]
+            else:
+                return _MISSING
+        return value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _thaw(self.data)
 
 class ConfigLoader:
-    """Configuration loader for the trading pipeline"""
-    
+    """Configuration loader for the trading pipeline
+
+    Readers see an immutable ConfigSnapshot: defaults deep-merged with the
+    YAML file. update_config(), reload() and the optional file watcher
+    publish a new snapshot and notify subscribers; get() never takes a lock.
+    """
+
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize config loader with path to config file"""
         self.config_path = config_path
-        self.config = self._load_config()
-    
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[ConfigSnapshot, ConfigSnapshot], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+        self._file_config = self._load_config()
+        self._stamp = self._file_stamp()
+        self._snapshot = ConfigSnapshot(deep_merge(self._get_default_config(), self._file_config))
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """Current configuration generation"""
+        return self._snapshot
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current merged configuration as a plain dict copy"""
+        return self._snapshot.to_dict()
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
             if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as file:
-                    return yaml.safe_load(file) or {}
+                return self._read_file()
             else:
                 print(f"⚠️ Config file not found at {self.config_path}, using defaults")
-                return self._get_default_config()
+                return {}
         except Exception as e:
             print(f"❌ Error loading config: {e}, using defaults")
-            return self._get_default_config()
-    
+            return {}
+
+    def _read_file(self) -> Dict[str, Any]:
+        """Parse the YAML file; raises on invalid content"""
+        with open(self.config_path, 'r') as file:
+            data = yaml.safe_load(file) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{self.config_path} must contain a mapping, got {type(data).__name__}")
+        return data
+
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
         return {
@@ -40,33 +139,118 @@ class ConfigLoader:
             'trading': {
                 'portfolio_value': 10000,
                 'max_positions': 5,
-                'risk_per_trade': 0.02
+                'risk_per_trade': 0.02,
+                'target_volatility': 0.10,
+                'allocation_method': 'risk_parity'
+            },
+            'analytics': {
+                'rollup_path': 'reports/metrics_rollups.sqlite',
+                'bucket_seconds': 3600,
+                'retention_days': 30
+            },
+            'pipeline': {
+                'fetch_workers': 8,
+                'feature_workers': 2,
+                'training_workers': 2,
+                'queue_size': 16
+            },
+            'service': {
+                'host': '127.0.0.1',
+                'port': 8765,
+                'workers': 4,
+                'cache_ttl': 30
             }
         }
-    
+
     def get(self, key: str, default=None):
         """Get configuration value by key"""
-        keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
-    
+        return self._snapshot.get(key, default)
+
     def update_config(self, updates: Dict[str, Any]):
-        """Update configuration with new values"""
-        self.config.update(updates)
-        self._save_config()
-    
+        """Deep-merge new values into the config file and publish them"""
+        with self._lock:
+            self._file_config = deep_merge(self._file_config, updates)
+            self._save_config()
+            self._stamp = self._file_stamp()
+            self._publish()
+
+    def reload(self) -> bool:
+        """Re-read the file and publish it; an unreadable file keeps the current snapshot"""
+        with self._lock:
+            self._stamp = self._file_stamp()
+            try:
+                self._file_config = self._read_file() if self._stamp is not None else {}
+            except Exception as e:
+                print(f"❌ Error reloading config: {e}, keeping version {self._snapshot.version}")
+                return False
+            self._publish()
+            return True
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot, ConfigSnapshot], None]):
+        """Call callback(old, new) after each published change"""
+        with self._lock:
+            self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[ConfigSnapshot, ConfigSnapshot], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def start_watching(self, interval: float = 1.0):
+        """Poll the file's mtime/size in a daemon thread and reload on change"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                         name='config-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._stop_watching.wait(interval):
+            if self._file_stamp() != self._stamp:
+                self.reload()
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _publish(self):
+        """Swap in a snapshot of the current file layer and notify subscribers"""
+        old = self._snapshot
+        new = ConfigSnapshot(deep_merge(self._get_default_config(), self._file_config), old.version + 1)
+        self._snapshot = new
+
+        for callback in list(self._subscribers):
+            try:
+                callback(old, new)
+            except Exception as e:
+                print(f"❌ Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
     def _save_config(self):
-        """Save configuration to file"""
+        """Save file-layer configuration via write-to-temp then atomic rename"""
+        directory = os.path.dirname(self.config_path) or '.'
+        tmp_path = None
         try:
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            with open(self.config_path, 'w') as file:
-                yaml.dump(self.config, file, default_flow_style=False)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.config-', suffix='.tmp')
+            with os.fdopen(fd, 'w') as file:
+                yaml.safe_dump(_thaw(_freeze(self._file_config)), file, default_flow_style=False)
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(self.config_path):
+                os.chmod(tmp_path, os.stat(self.config_path).st_mode & 0o777)
+            os.replace(tmp_path, self.config_path)
         except Exception as e:
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
             print(f"❌ Error saving config: {e}")
@@ -0,0 +1,288 @@
+
+import cProfile
+import contextvars
+import functools
+import heapq
+import inspect
+import io
+import itertools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_NULL = nullcontext()
+_current_symbol = contextvars.ContextVar('autodata_symbol', default=None)
+_profiler_slot = threading.Lock()
+_memory_lock = threading.Lock()
+_open_memory_timers = []
+# tracemalloc.reset_peak() is Python 3.9+; without it per-timer peaks are not recorded
+_CAN_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+class Instrumentation:
+    """Per-stage / per-symbol timers, counters and memory gauges
+
+    Disabled by default: timer() then returns a shared no-op context, so
+    instrumented hot paths pay one attribute check per call. With
+    trace_memory each timer records the peak traced allocation above its
+    starting point, kept per stage and per symbol; timers running
+    concurrently in other threads share the tracemalloc peak, so their
+    allocations overlap. Peaks need Python 3.9+ (tracemalloc.reset_peak).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.profile_top_n = 0
+        self.trace_memory = False
+        self._owns_tracemalloc = False
+        self.reset()
+
+    def reset(self):
+        """Drop all recorded measurements"""
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.symbols: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = {}
+        self.peak_alloc: Dict[str, int] = {}
+        self.symbol_peak_alloc: Dict[str, Dict[str, int]] = {}
+        self.profiles = []
+        self._sequence = itertools.count()
+
+    def enable(self, profile_top_n: int = 0, trace_memory: bool = False):
+        """Turn recording on, optionally profiling the slowest N symbol runs"""
+        self.enabled = True
+        self.profile_top_n = profile_top_n
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def disable(self):
+        """Turn recording off, stopping tracemalloc only if enable() started it"""
+        self.enabled = False
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def configure_from_env(self):
+        """Enable from AUTODATA_INSTRUMENT / AUTODATA_PROFILE_TOP_N / AUTODATA_TRACE_MEMORY"""
+        if os.environ.get('AUTODATA_INSTRUMENT', '').lower() in ('1', 'true', 'yes'):
+            self.enable(
+                profile_top_n=int(os.environ.get('AUTODATA_PROFILE_TOP_N', 0)),
+                trace_memory=os.environ.get('AUTODATA_TRACE_MEMORY', '').lower() in ('1', 'true', 'yes')
+            )
+        return self
+
+    def timer(self, stage: str, symbol: Optional[str] = None):
+        """Context manager timing one stage run, attributed to a symbol if given"""
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, stage, symbol)
+
+    def symbol_scope(self, symbol: str):
+        """Attribute nested instrumented calls to a symbol"""
+        if not self.enabled:
+            return _NULL
+        return _SymbolScope(symbol)
+
+    def count(self, name: str, value: float = 1):
+        """Increment a named counter"""
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def _record(self, stage: str, symbol: Optional[str], seconds: float, profile=None, memory=None,
+                peak_alloc: Optional[int] = None):
+        """Fold one timed run into the aggregates"""
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = {'count': 0, 'total_s': 0.0, 'max_s': 0.0}
+            stats['count'] += 1
+            stats['total_s'] += seconds
+            stats['max_s'] = max(stats['max_s'], seconds)
+            if peak_alloc is not None:
+                self.peak_alloc[stage] = max(self.peak_alloc.get(stage, 0), peak_alloc)
+
+            if symbol is not None:
+                per_symbol = self.symbols.setdefault(stage, {})
+                per_symbol[symbol] = per_symbol.get(symbol, 0.0) + seconds
+                if peak_alloc is not None:
+                    peaks = self.symbol_peak_alloc.setdefault(stage, {})
+                    peaks[symbol] = max(peaks.get(symbol, 0), peak_alloc)
+
+            if profile is not None:
+                entry = (seconds, next(self._sequence), stage, str(symbol), profile, memory)
+                if len(self.profiles) < self.profile_top_n:
+                    heapq.heappush(self.profiles, entry)
+                elif seconds > self.profiles[0][0]:
+                    heapq.heapreplace(self.profiles, entry)
+
+    def to_dict(self) -> Dict:
+        """All measurements as a JSON-serializable dict"""
+        with self._lock:
+            stages = {}
+            for stage, stats in self.stages.items():
+                stages[stage] = dict(stats, mean_s=stats['total_s'] / stats['count'])
+                if stage in self.peak_alloc:
+                    stages[stage]['peak_alloc_bytes'] = self.peak_alloc[stage]
+            return {
+                'process_peak_rss_bytes': _process_peak_rss(),
+                'stages': stages,
+                'symbols': {stage: dict(values) for stage, values in self.symbols.items()},
+                'symbol_peak_alloc_bytes': {stage: dict(peaks) for stage, peaks in self.symbol_peak_alloc.items()},
+                'counters': dict(self.counters),
+                'slowest_profiles': [
+                    {'seconds': s, 'stage': stage, 'symbol': symbol, 'profile': profile, 'memory': memory}
+                    for s, _, stage, symbol, profile, memory in sorted(self.profiles, reverse=True)
+                ]
+            }
+
+    def to_prometheus(self) -> str:
+        """Measurements in the Prometheus text exposition format"""
+        data = self.to_dict()
+        lines = [
+            "# TYPE autodata_stage_seconds_total counter",
+            *(f'autodata_stage_seconds_total{{stage="{k}"}} {v["total_s"]}' for k, v in data['stages'].items()),
+            "# TYPE autodata_stage_calls_total counter",
+            *(f'autodata_stage_calls_total{{stage="{k}"}} {v["count"]}' for k, v in data['stages'].items()),
+            "# TYPE autodata_stage_seconds_max gauge",
+            *(f'autodata_stage_seconds_max{{stage="{k}"}} {v["max_s"]}' for k, v in data['stages'].items()),
+            "# TYPE autodata_stage_peak_alloc_bytes gauge",
+            *(f'autodata_stage_peak_alloc_bytes{{stage="{k}"}} {v["peak_alloc_bytes"]}'
+              for k, v in data['stages'].items() if 'peak_alloc_bytes' in v),
+            "# TYPE autodata_process_peak_rss_bytes gauge",
+            f'autodata_process_peak_rss_bytes {data["process_peak_rss_bytes"]}',
+            "# TYPE autodata_symbol_seconds_total counter",
+            *(f'autodata_symbol_seconds_total{{stage="{stage}",symbol="{symbol}"}} {seconds}'
+              for stage, values in data['symbols'].items() for symbol, seconds in values.items()),
+            "# TYPE autodata_symbol_peak_alloc_bytes gauge",
+            *(f'autodata_symbol_peak_alloc_bytes{{stage="{stage}",symbol="{symbol}"}} {peak}'
+              for stage, peaks in data['symbol_peak_alloc_bytes'].items() for symbol, peak in peaks.items()),
+            "# TYPE autodata_events_total counter",
+            *(f'autodata_events_total{{name="{k}"}} {v}' for k, v in data['counters'].items())
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str = "reports", name: str = "instrumentation"):
+        """Write <name>.json and <name>.prom into directory"""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{name}.json"), 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+        with open(os.path.join(directory, f"{name}.prom"), 'w') as file:
+            file.write(self.to_prometheus())
+
+def _process_peak_rss() -> int:
+    """Lifetime high-water RSS of this process in bytes (0 if unavailable)"""
+    if resource is None:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+class _SymbolScope:
+    """Sets the current symbol for nested instrumented calls"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+    def __enter__(self):
+        self._token = _current_symbol.set(self.symbol)
+        return self
+
+    def __exit__(self, *exc):
+        _current_symbol.reset(self._token)
+
+class _Timer:
+    """Times one block; optionally captures cProfile/tracemalloc detail"""
+
+    def __init__(self, owner: Instrumentation, stage: str, symbol: Optional[str]):
+        self.owner = owner
+        self.stage = stage
+        self.symbol = symbol if symbol is not None else _current_symbol.get()
+        self.profiler = None
+        self.snapshot = None
+        self.alloc_base = None
+        self.alloc_peak = 0
+
+    def __enter__(self):
+        if self.symbol is not None:
+            self._token = _current_symbol.set(self.symbol)
+            # One profiler at a time; nested or concurrent timers go unprofiled
+            if self.owner.profile_top_n and _profiler_slot.acquire(blocking=False):
+                self.profiler = cProfile.Profile()
+                if self.owner.trace_memory and tracemalloc.is_tracing():
+                    self.snapshot = tracemalloc.take_snapshot()
+                self.profiler.enable()
+        if self.owner.trace_memory and _CAN_RESET_PEAK and tracemalloc.is_tracing():
+            with _memory_lock:
+                current, peak = tracemalloc.get_traced_memory()
+                # Resetting the shared peak would lose it for enclosing timers, so fold it in first
+                for timer in _open_memory_timers:
+                    timer.alloc_peak = max(timer.alloc_peak, peak)
+                tracemalloc.reset_peak()
+                self.alloc_base = self.alloc_peak = current
+                _open_memory_timers.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        profile = memory = peak_alloc = None
+
+        if self.alloc_base is not None:
+            with _memory_lock:
+                if tracemalloc.is_tracing():
+                    self.alloc_peak = max(self.alloc_peak, tracemalloc.get_traced_memory()[1])
+                _open_memory_timers.remove(self)
+            peak_alloc = self.alloc_peak - self.alloc_base
+
+        if self.profiler is not None:
+            self.profiler.disable()
+            if self.snapshot is not None:
+                ignore = [tracemalloc.Filter(False, f) for f in (tracemalloc.__file__, cProfile.__file__)]
+                diff = tracemalloc.take_snapshot().filter_traces(ignore).compare_to(
+                    self.snapshot.filter_traces(ignore), 'lineno'
+                )
+                memory = [str(stat) for stat in diff[:10]]
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats('cumulative').print_stats(15)
+            profile = out.getvalue()
+            _profiler_slot.release()
+
+        if self.symbol is not None:
+            _current_symbol.reset(self._token)
+        self.owner._record(self.stage, self.symbol, seconds, profile, memory, peak_alloc)
+
+instrumentation = Instrumentation()
+
+def instrumented(stage: str):
+    """Decorator timing a method under stage, picking up a 'symbol' argument if present"""
+
+    def decorator(func: Callable):
+        params = list(inspect.signature(func).parameters)
+        symbol_index = params.index('symbol') if 'symbol' in params else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return func(*args, **kwargs)
+            symbol = kwargs.get('symbol')
+            if symbol is None and symbol_index is not None and len(args) > symbol_index:
+                symbol = args[symbol_index]
+            with instrumentation.timer(stage, symbol or None):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,68 @@
+
+import math
+from typing import Dict, Iterable
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with constant-time recording"""
+
+    # Buckets grow by ~19% each, from 1 microsecond up to ~100 seconds
+    BUCKETS_PER_DOUBLING = 4
+    MIN_SECONDS = 1e-6
+    NUM_BUCKETS = 4 * 27
+
+    def __init__(self):
+        """Initialize an empty histogram"""
+        self.counts = [0] * (self.NUM_BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """Record one latency sample"""
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.counts[self._bucket(seconds)] += 1
+
+    def _bucket(self, seconds: float) -> int:
+        """Bucket index for a latency value"""
+        if seconds <= self.MIN_SECONDS:
+            return 0
+        idx = int(math.log2(seconds / self.MIN_SECONDS) * self.BUCKETS_PER_DOUBLING) + 1
+        return min(idx, self.NUM_BUCKETS)
+
+    def _upper_bound(self, idx: int) -> float:
+        """Upper latency bound of a bucket"""
+        return self.MIN_SECONDS * 2 ** (idx / self.BUCKETS_PER_DOUBLING)
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile (0-100) from bucket upper bounds"""
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(self.count * q / 100.0)
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self._upper_bound(idx), self.max)
+        return self.max
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Fold another histogram into this one"""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def summary(self, percentiles: Iterable[float] = (50, 90, 99)) -> Dict[str, float]:
+        """Count, mean, max and percentiles in milliseconds"""
+        result = {
+            'count': self.count,
+            'mean_ms': (self.total / self.count * 1000) if self.count else 0.0,
+            'max_ms': self.max * 1000
+        }
+        for q in percentiles:
+            result[f'p{q:g}_ms'] = self.percentile(q) * 1000
+        return result
@@ -0,0 +1,91 @@
+# test_benchmark_suite.py
+"""Benchmark history and regression comparison tests"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.data_pipeline import synthetic_data
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+from src.utils.benchmark_suite import BenchmarkSuite, append_history, compare_runs, load_history
+
+def run_record(*cases):
+    """A run record from (case, symbols, measured, seconds) tuples"""
+    return {'results': [
+        {'case': case, 'symbols': symbols, 'measured_symbols': measured, 'years': 1,
+         'seconds': seconds, 'per_symbol_s': seconds / measured}
+        for case, symbols, measured, seconds in cases
+    ]}
+
+def test_compare_flags_changes_beyond_threshold():
+    baseline = run_record(('slow', 10, 10, 1.0), ('fast', 10, 10, 1.0), ('same', 10, 10, 1.0))
+    current = run_record(('slow', 10, 10, 1.2), ('fast', 10, 10, 0.8), ('same', 10, 10, 1.05))
+
+    statuses = {row['case']: row['status'] for row in compare_runs(baseline, current, threshold=0.10)}
+    assert statuses == {'slow': 'regression', 'fast': 'improvement', 'same': 'ok'}
+    assert {row['case']: row['status'] for row in compare_runs(baseline, current, threshold=0.25)}['slow'] == 'ok'
+
+def test_compare_never_flags_cases_under_the_noise_floor():
+    rows = compare_runs(run_record(('tiny', 10, 10, 0.0001)), run_record(('tiny', 10, 10, 0.0005)))
+    assert rows[0]['ratio'] == pytest.approx(5.0)
+    assert rows[0]['status'] == 'ok'
+
+def test_compare_keys_on_measured_symbols():
+    baseline = run_record(('training', 100, 2, 1.0), ('ingestion', 100, 100, 1.0))
+    current = run_record(('training', 100, 100, 50.0), ('ingestion', 100, 100, 1.0))
+
+    rows = compare_runs(baseline, current)
+    assert [row['case'] for row in rows] == ['ingestion']
+
+    # Records from before measured_symbols was keyed match on the full count
+    legacy = run_record(('ingestion', 100, 100, 1.0))
+    del legacy['results'][0]['measured_symbols']
+    assert [row['case'] for row in compare_runs(legacy, current)] == ['ingestion']
+
+def test_append_history_round_trip(tmp_path):
+    path = str(tmp_path / 'runs' / 'history.json')
+    assert load_history(path) == []
+
+    append_history(path, {'timestamp': 'a', 'results': []})
+    history = append_history(path, {'timestamp': 'b', 'results': []})
+
+    assert [run['timestamp'] for run in history] == ['a', 'b']
+    assert load_history(path) == history
+    assert os.listdir(tmp_path / 'runs') == ['history.json']
+
+def test_iter_panels_share_one_regime_path(monkeypatch):
+    seen = []
+    generate = SyntheticMarketGenerator.generate
+
+    def spy(self, symbols, days=252, start="2020-01-01", regimes=None):
+        seen.append(regimes)
+        return generate(self, symbols, days, start, regimes)
+    monkeypatch.setattr(synthetic_data.SyntheticMarketGenerator, 'generate', spy)
+
+    symbols = [f"S{i}" for i in range(5)]
+    generator = SyntheticMarketGenerator(7, regimes=True)
+    panels = list(generator.iter_panels(symbols, days=300, chunk_size=2))
+
+    assert [list(panel) for panel in panels] == [['S0', 'S1'], ['S2', 'S3'], ['S4']]
+    assert len(seen) == 3
+    for regimes in seen:
+        assert regimes is generator.last_regimes
+    np.testing.assert_array_equal(
+        generator.last_regimes, generator.regime_path(300, np.random.default_rng(7))
+    )
+
+    # Same seed, same panels
+    again = list(SyntheticMarketGenerator(7, regimes=True).iter_panels(symbols, days=300, chunk_size=2))
+    for panel, other in zip(panels, again):
+        for symbol in panel:
+            assert panel[symbol].equals(other[symbol])
+
+def test_run_records_sampled_and_full_cases():
+    suite = BenchmarkSuite(verbose=False, sample_caps={'features': 1})
+    run = suite.run((3,), (1,), ('features', 'signals'))
+
+    measured = {case['case']: case['measured_symbols'] for case in run['results']}
+    assert measured['features.total'] == 1
+    assert measured['signals.generate'] == 3
+    assert all(case['symbols'] == 3 for case in run['results'])
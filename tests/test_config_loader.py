@@ -0,0 +1,86 @@
+# test_config_loader.py
+"""Config loader tests"""
+
+import json
+import os
+import threading
+
+import yaml
+
+from src.utils.config_loader import ConfigLoader, deep_merge
+
+def write_yaml(path, data):
+    """Atomic external edit, the way editors and deploy tools replace files"""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as file:
+        yaml.safe_dump(data, file)
+    os.replace(tmp, path)
+
+def test_deep_merge_recurses_without_mutating():
+    base = {'trading': {'portfolio_value': 10000, 'max_positions': 5}, 'symbols': ['AAPL']}
+    updates = {'trading': {'max_positions': 3}, 'symbols': ['MSFT', 'TSLA'], 'new': 1}
+    merged = deep_merge(base, updates)
+
+    assert merged == {'trading': {'portfolio_value': 10000, 'max_positions': 3},
+                      'symbols': ['MSFT', 'TSLA'], 'new': 1}
+    assert base['trading']['max_positions'] == 5
+
+def test_get_returns_plain_containers(tmp_path):
+    config = ConfigLoader(str(tmp_path / 'config.yaml'))
+
+    symbols = config.get('data_sources.symbols')
+    assert isinstance(symbols, list)
+    symbols.append('NVDA')
+    assert 'NVDA' not in config.get('data_sources.symbols')
+
+    trading = config.get('trading')
+    assert isinstance(trading, dict)
+    assert json.loads(json.dumps(trading)) == trading
+    assert isinstance(config.config, dict)
+
+def test_update_config_round_trip(tmp_path):
+    path = str(tmp_path / 'config.yaml')
+    write_yaml(path, {'trading': {'portfolio_value': 50000}})
+    config = ConfigLoader(path)
+    changes = []
+    config.subscribe(lambda old, new: changes.append((old.version, new.version)))
+
+    config.update_config({'trading': {'max_positions': 3}, 'data_sources': {'symbols': ['AAPL']}})
+
+    assert changes == [(0, 1)]
+    with open(path) as file:
+        assert yaml.safe_load(file) == {'trading': {'portfolio_value': 50000, 'max_positions': 3},
+                                        'data_sources': {'symbols': ['AAPL']}}
+    reloaded = ConfigLoader(path)
+    assert reloaded.get('trading.portfolio_value') == 50000
+    assert reloaded.get('trading.max_positions') == 3
+    # Untouched defaults survive the nested merge
+    assert reloaded.get('trading.risk_per_trade') == 0.02
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+def test_watcher_reloads_on_change(tmp_path):
+    path = str(tmp_path / 'config.yaml')
+    write_yaml(path, {'trading': {'portfolio_value': 10000}})
+    config = ConfigLoader(path)
+    reloaded = threading.Event()
+    config.subscribe(lambda old, new: reloaded.set())
+
+    config.start_watching(interval=0.02)
+    try:
+        write_yaml(path, {'trading': {'portfolio_value': 25000, 'padding': 'x' * 10}})
+        assert reloaded.wait(5)
+    finally:
+        config.stop_watching()
+
+    assert config.get('trading.portfolio_value') == 25000
+    assert config.version == 1
+
+def test_invalid_file_keeps_current_snapshot(tmp_path):
+    path = str(tmp_path / 'config.yaml')
+    write_yaml(path, {'trading': {'portfolio_value': 10000}})
+    config = ConfigLoader(path)
+
+    with open(path, 'w') as file:
+        file.write("- just\n- a list\n")
+    assert config.reload() is False
+    assert config.get('trading.portfolio_value') == 10000
@@ -0,0 +1,63 @@
+# test_evaluation.py
+"""Batch evaluation engine tests"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ml_pipeline.evaluation import BatchEvaluationEngine
+
+metrics = pytest.importorskip('sklearn.metrics')
+
+@pytest.fixture(scope='module')
+def predictions():
+    """Stacked predictions for 3 symbols x 2 models x 3 folds, with tied scores"""
+    rng = np.random.default_rng(5)
+    frames = []
+    for symbol in ('AAA', 'BBB', 'CCC'):
+        for model in ('random_forest', 'gradient_boost'):
+            for fold in range(3):
+                n = int(rng.integers(40, 120))
+                y_true = rng.integers(0, 2, n)
+                y_score = np.round(np.clip(0.5 * y_true + rng.normal(0.25, 0.3, n), 0, 1), 1)
+                frames.append(pd.DataFrame({
+                    'symbol': symbol, 'model': model, 'fold': fold,
+                    'y_true': y_true, 'y_pred': (y_score > 0.5).astype(int), 'y_score': y_score
+                }))
+    return pd.concat(frames, ignore_index=True)
+
+def test_metrics_match_sklearn(predictions):
+    results = BatchEvaluationEngine(n_bootstrap=0).evaluate(predictions)
+    assert len(results) == 18
+
+    for _, row in results.iterrows():
+        group = predictions[(predictions['symbol'] == row['symbol']) & (predictions['model'] == row['model'])
+                            & (predictions['fold'] == row['fold'])]
+        y_true, y_pred = group['y_true'], group['y_pred']
+        assert row['n'] == len(group)
+        assert row['accuracy'] == pytest.approx(metrics.accuracy_score(y_true, y_pred))
+        assert row['precision'] == pytest.approx(metrics.precision_score(y_true, y_pred, zero_division=0))
+        assert row['recall'] == pytest.approx(metrics.recall_score(y_true, y_pred, zero_division=0))
+        assert row['f1'] == pytest.approx(metrics.f1_score(y_true, y_pred, zero_division=0))
+        assert row['roc_auc'] == pytest.approx(metrics.roc_auc_score(y_true, group['y_score']))
+        np.testing.assert_array_equal(row[['tn', 'fp', 'fn', 'tp']].to_numpy(dtype=int),
+                                      metrics.confusion_matrix(y_true, y_pred, labels=[0, 1]).ravel())
+
+def test_single_class_group_has_nan_auc():
+    predictions = pd.DataFrame({'y_true': [1, 1, 1], 'y_pred': [1, 0, 1], 'y_score': [0.9, 0.2, 0.7]})
+    row = BatchEvaluationEngine(n_bootstrap=0).evaluate(predictions).iloc[0]
+    assert np.isnan(row['roc_auc'])
+    assert row['precision'] == 1.0
+
+def test_bootstrap_intervals_bracket_point_estimates(predictions):
+    results = BatchEvaluationEngine(n_bootstrap=200).evaluate(predictions)
+    for name in ('accuracy', 'f1', 'roc_auc'):
+        assert (results[f'{name}_ci_low'] <= results[name] + 1e-12).all()
+        assert (results[name] <= results[f'{name}_ci_high'] + 1e-12).all()
+
+@pytest.mark.parametrize('column,values', [('y_true', [1, 2, 0]), ('y_pred', [-1, 1, 1]), ('y_true', [0.5, 1, 0])])
+def test_non_binary_labels_raise(column, values):
+    predictions = pd.DataFrame({'symbol': ['a', 'a', 'b'], 'y_true': [1, 0, 0], 'y_pred': [1, 1, 0]})
+    predictions[column] = values
+    with pytest.raises(ValueError, match=column):
+        BatchEvaluationEngine(n_bootstrap=0).evaluate(predictions)
@@ -0,0 +1,68 @@
+# test_instrumentation.py
+"""Instrumentation tests"""
+
+import tracemalloc
+
+import pytest
+
+from src.utils.instrumentation import Instrumentation
+
+MB = 1024 * 1024
+
+needs_reset_peak = pytest.mark.skipif(not hasattr(tracemalloc, 'reset_peak'), reason="needs Python 3.9+")
+
+@needs_reset_peak
+def test_peak_alloc_is_per_timer():
+    inst = Instrumentation()
+    inst.enable(trace_memory=True)
+    try:
+        with inst.timer('outer'):
+            with inst.timer('big'):
+                block = bytearray(20 * MB)
+                del block
+            with inst.timer('small'):
+                block = bytearray(1 * MB)
+                del block
+    finally:
+        inst.disable()
+
+    stages = inst.to_dict()['stages']
+    assert stages['big']['peak_alloc_bytes'] >= 20 * MB
+    assert stages['small']['peak_alloc_bytes'] == pytest.approx(1 * MB, rel=0.1)
+    # The enclosing timer still sees the nested peak
+    assert stages['outer']['peak_alloc_bytes'] >= 20 * MB
+
+@needs_reset_peak
+def test_peak_alloc_is_exported_per_symbol(tmp_path):
+    inst = Instrumentation()
+    inst.enable(trace_memory=True)
+    try:
+        for symbol, size in (('AAA', 8 * MB), ('BBB', 1 * MB), ('AAA', 2 * MB)):
+            with inst.timer('features', symbol):
+                block = bytearray(size)
+                del block
+    finally:
+        inst.disable()
+
+    peaks = inst.to_dict()['symbol_peak_alloc_bytes']['features']
+    assert peaks['AAA'] == pytest.approx(8 * MB, rel=0.1)
+    assert peaks['BBB'] == pytest.approx(1 * MB, rel=0.1)
+
+    inst.write(str(tmp_path))
+    prom = (tmp_path / 'instrumentation.prom').read_text()
+    assert f'autodata_symbol_peak_alloc_bytes{{stage="features",symbol="AAA"}} {peaks["AAA"]}' in prom
+    assert f'autodata_symbol_peak_alloc_bytes{{stage="features",symbol="BBB"}} {peaks["BBB"]}' in prom
+
+def test_disable_keeps_caller_tracemalloc_session():
+    tracemalloc.start()
+    try:
+        inst = Instrumentation()
+        inst.enable(trace_memory=True)
+        inst.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    inst.enable(trace_memory=True)
+    inst.disable()
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,54 @@
+# test_labels.py
+"""Label matrix tests"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+from src.data_pipeline.feature_engineering import FeatureEngine
+from src.data_pipeline.labels import LabelEngine
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+
+@pytest.fixture(scope='module')
+def prices():
+    return SyntheticMarketGenerator(seed=11).generate(['SYN'], days=300)['SYN']
+
+def legacy_target(close, horizon, threshold):
+    """The shift-based target the feature engines used before LabelEngine"""
+    return (close.shift(-horizon) > close * (1 + threshold)).astype(int)
+
+@pytest.mark.parametrize('horizon,threshold', [(5, 0.02), (5, 0.0), (1, 0.0), (20, 0.05)])
+def test_create_target_matches_legacy_shift(prices, horizon, threshold):
+    target = LabelEngine().create_target(prices['Close'], horizon, threshold)
+    pd.testing.assert_series_equal(target, legacy_target(prices['Close'], horizon, threshold), check_names=False)
+
+def test_feature_engines_keep_legacy_target(prices):
+    enhanced = EnhancedFeatureEngine().create_enhanced_features(prices)
+    basic = FeatureEngine().create_advanced_features(prices)
+
+    pd.testing.assert_series_equal(enhanced['target'], legacy_target(prices['Close'], 5, 0.02).loc[enhanced.index],
+                                   check_names=False)
+    pd.testing.assert_series_equal(basic['target'], legacy_target(prices['Close'], 5, 0.0).loc[basic.index],
+                                   check_names=False)
+
+def test_label_matrix_shape_and_columns(prices):
+    horizons, thresholds = (1, 5, 20), (0.0, 0.01, 0.02, 0.05)
+    labels = LabelEngine().create_label_matrix(prices['Close'], horizons, thresholds)
+
+    assert labels.shape == (len(prices), len(horizons) * len(thresholds))
+    assert list(labels.columns) == [LabelEngine.label_name(h, t) for h in horizons for t in thresholds]
+    for h in horizons:
+        # Exactly the last h rows have no future price
+        assert labels[LabelEngine.label_name(h, 0.0)].isna().sum() == h
+        for t in thresholds:
+            column = labels[LabelEngine.label_name(h, t)].iloc[:-h]
+            np.testing.assert_array_equal(column, legacy_target(prices['Close'], h, t).iloc[:-h])
+
+def test_feature_label_matrix_drops_incomplete_rows(prices):
+    features, labels = EnhancedFeatureEngine().create_feature_label_matrix(prices, (5, 20), (0.0, 0.02))
+
+    assert features.index.equals(labels.index)
+    assert labels.shape[1] == 4
+    assert labels.index[-1] == prices.index[-21]
+    assert 'target' not in features.columns
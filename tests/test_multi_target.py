@@ -0,0 +1,53 @@
+# test_multi_target.py
+"""Multi-target training tests"""
+
+import pytest
+
+from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+from src.ml_pipeline.model_training import MLTrainingEngine
+from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+from src.ml_pipeline.shared_features import SharedFeatureMatrix
+
+pytest.importorskip('sklearn')
+
+BOTH_MODELS = ('random_forest', 'gradient_boost')
+
+@pytest.fixture(scope='module')
+def features():
+    prices = SyntheticMarketGenerator(seed=31).generate(['SYN'], days=300)['SYN']
+    return EnhancedFeatureEngine().create_enhanced_features(prices)
+
+@pytest.fixture(scope='module')
+def sweep():
+    prices = SyntheticMarketGenerator(seed=32).generate(['SYN'], days=300)['SYN']
+    return EnhancedFeatureEngine().create_feature_label_matrix(prices, (1, 5), (0.0, 0.02))
+
+def test_single_label_matches_single_target_training(features):
+    X, Y = features.drop(columns='target'), features[['target']]
+
+    optimized = OptimizedMLTrainingEngine()
+    assert optimized.train_multi_target(X, Y, BOTH_MODELS)['target'] == optimized.train_optimized_models(X, Y['target'])
+
+    ensemble = MLTrainingEngine()
+    assert ensemble.train_multi_target(X, Y, BOTH_MODELS)['target'] == ensemble.train_ensemble_model(X, Y['target'])
+
+@pytest.mark.parametrize('engine', [OptimizedMLTrainingEngine, MLTrainingEngine])
+def test_sweep_covers_every_label(engine, sweep):
+    X, Y = sweep
+    results = engine().train_multi_target(X, Y)
+
+    assert list(results) == list(Y.columns)
+    for label, by_model in results.items():
+        assert list(by_model) == ['random_forest']
+        assert 0 <= by_model['random_forest']['accuracy'] <= 1
+        # Three folds of n // 4 test rows each
+        assert by_model['random_forest']['samples'] == 3 * (len(X) // 4)
+
+@pytest.mark.parametrize('engine', [OptimizedMLTrainingEngine, MLTrainingEngine])
+def test_shared_matrix_matches_frames(engine, sweep):
+    X, Y = sweep
+    expected = engine().train_multi_target(X, Y)
+
+    with SharedFeatureMatrix.from_frame(X.join(Y), target_columns=list(Y.columns)) as matrix:
+        assert engine().train_multi_target(matrix) == expected
@@ -0,0 +1,87 @@
+# test_portfolio_optimizer.py
+"""Portfolio optimizer and covariance estimator tests"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics_engine.portfolio_optimizer import IncrementalCovarianceEstimator, PortfolioOptimizer
+from src.analytics_engine.signal_frame import SignalFrame
+
+SYMBOLS = [f"SYN{i}" for i in range(8)]
+
+def correlated_returns(n_days=300, seed=0):
+    """Daily returns driven by one market factor plus noise"""
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0005, 0.01, (n_days, 1))
+    return market * rng.uniform(0.5, 1.5, len(SYMBOLS)) + rng.normal(0, 0.01, (n_days, len(SYMBOLS)))
+
+def price_data(returns):
+    index = pd.bdate_range('2024-01-01', periods=len(returns) + 1, tz='UTC')
+    closes = 100 * np.vstack([np.ones(len(SYMBOLS)), np.cumprod(1 + returns, axis=0)])
+    return {symbol: pd.DataFrame({'Close': closes[:, i]}, index=index) for i, symbol in enumerate(SYMBOLS)}
+
+def buy_frame():
+    return SignalFrame(SYMBOLS, np.linspace(0.70, 0.62, len(SYMBOLS)), codes=np.full(len(SYMBOLS), 2))
+
+def test_block_updates_match_np_cov():
+    returns = correlated_returns()
+    estimator = IncrementalCovarianceEstimator(SYMBOLS)
+    for block in np.array_split(returns, 7):
+        estimator.update(block)
+    estimator.update(correlated_returns(1, seed=1)[0])
+    everything = np.vstack([returns, correlated_returns(1, seed=1)])
+
+    np.testing.assert_allclose(estimator.covariance(), np.cov(everything, rowvar=False))
+    np.testing.assert_allclose(estimator.mean, everything.mean(axis=0))
+
+def test_shrunk_covariance_matches_sklearn_oas():
+    OAS = pytest.importorskip('sklearn.covariance').OAS
+    returns = correlated_returns(60)
+    estimator = IncrementalCovarianceEstimator(SYMBOLS).update(returns)
+    oas = OAS().fit(returns)
+
+    np.testing.assert_allclose(estimator.shrunk_covariance(), oas.covariance_)
+    assert estimator.shrinkage == pytest.approx(oas.shrinkage_)
+    assert 0 < estimator.shrinkage < 1
+
+def test_extended_merges_only_new_bars():
+    data = price_data(correlated_returns())
+    head = {symbol: df.iloc[:200] for symbol, df in data.items()}
+
+    extended = IncrementalCovarianceEstimator.from_price_data(head).extended(data)
+    full = IncrementalCovarianceEstimator.from_price_data(data)
+
+    assert extended.count == full.count
+    np.testing.assert_allclose(extended.covariance(), full.covariance())
+    assert extended.extended(data) is extended
+
+@pytest.mark.parametrize('method', PortfolioOptimizer.METHODS)
+def test_positions_are_capped(method):
+    estimator = IncrementalCovarianceEstimator.from_price_data(price_data(correlated_returns()))
+    frame = PortfolioOptimizer(max_positions=5).allocate(buy_frame(), estimator, 10000, method)
+
+    assert np.count_nonzero(frame.allocation) <= 5
+    assert frame.allocation.max() <= 2000 + 1e-6
+    assert frame.allocation.sum() <= 10000 + 1e-6
+
+def test_volatility_target_scales_exposure():
+    estimator = IncrementalCovarianceEstimator.from_price_data(price_data(correlated_returns()))
+    optimizer = PortfolioOptimizer(max_positions=5, max_weight=1.0, risk_per_trade=0, target_volatility=0.05)
+    frame = optimizer.allocate(buy_frame(), estimator, 1.0, 'volatility_target')
+
+    idx = estimator.indices(SYMBOLS)
+    cov = estimator.shrunk_covariance()[np.ix_(idx, idx)]
+    realized = np.sqrt(frame.allocation @ cov @ frame.allocation * 252)
+    assert realized == pytest.approx(0.05)
+    assert frame.allocation.sum() < 1.0
+
+@pytest.mark.parametrize('method', PortfolioOptimizer.METHODS)
+def test_short_history_falls_back_to_equal_risk(method):
+    # Two bars give one return observation: the shrunk covariance is all zeros
+    estimator = IncrementalCovarianceEstimator.from_price_data(price_data(correlated_returns(1)))
+    assert estimator.count == 1
+    frame = PortfolioOptimizer(max_positions=5).allocate(buy_frame(), estimator, 10000, method)
+
+    np.testing.assert_allclose(np.sort(frame.allocation)[-5:], 2000)
+    assert np.count_nonzero(frame.allocation) == 5
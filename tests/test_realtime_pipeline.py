@@ -0,0 +1,57 @@
+# test_realtime_pipeline.py
+"""Real-time pipeline tests"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+from src.orchestration.realtime_pipeline import FEATURE_COLUMNS, RealTimePipeline, model_scorer, replay_ticks
+
+def batch_features(df):
+    """Last-row online feature columns computed by the batch engine"""
+    engine = EnhancedFeatureEngine()
+    df = df.copy()
+    for group in engine.FEATURE_GROUPS:
+        if group != 'target':
+            getattr(engine, f'add_{group}_features')(df)
+    return df[FEATURE_COLUMNS].iloc[-1].to_numpy(dtype=float)
+
+def test_coalescing_replay_keeps_every_bar_in_feature_state():
+    symbols = [f"SYN{i:02d}" for i in range(50)]
+    data = SyntheticMarketGenerator(seed=7).generate(symbols, days=100)
+
+    # Batch collection falls behind a full-speed replay, so ticks coalesce
+    pipeline = RealTimePipeline(batch_timeout=0.05, max_staleness=None)
+    report = asyncio.run(pipeline.run(replay_ticks(data)))
+
+    assert report['stats']['ticks'] == 50 * 100
+    assert report['stats']['coalesced'] > 0
+    for symbol, df in data.items():
+        np.testing.assert_allclose(pipeline.latest_features[symbol], batch_features(df), rtol=1e-9)
+
+def test_online_columns_match_the_batch_engine():
+    prices = SyntheticMarketGenerator(seed=8).generate(['SYN'], days=80)['SYN']
+    batch = EnhancedFeatureEngine().create_enhanced_features(prices)
+    assert FEATURE_COLUMNS == [column for column in batch.columns if column != 'target']
+
+def test_scores_with_a_fitted_model():
+    pytest.importorskip('sklearn')
+    history = SyntheticMarketGenerator(seed=9).generate(['AAA', 'BBB'], days=260)
+    features = EnhancedFeatureEngine().create_enhanced_features(history['AAA'])
+    fitted = OptimizedMLTrainingEngine().fit_final_model(features.drop(columns='target'), features['target'])
+
+    pipeline = RealTimePipeline(scorer=fitted, max_staleness=None)
+    asyncio.run(pipeline.run(replay_ticks(history)))
+
+    for symbol, df in history.items():
+        row = batch_features(df)[[FEATURE_COLUMNS.index(name) for name in fitted['features']]]
+        expected = fitted['pipeline'].predict_proba(np.nan_to_num(row[None, :]))[0, -1]
+        assert pipeline.latest_scores[symbol] == pytest.approx(expected)
+
+def test_model_scorer_rejects_features_not_kept_online():
+    with pytest.raises(ValueError, match='Dividends'):
+        model_scorer({'features': ['Close', 'Dividends'], 'pipeline': None})
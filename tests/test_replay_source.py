@@ -0,0 +1,123 @@
+# test_replay_source.py
+"""Bar replay source tests"""
+
+import asyncio
+import inspect
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from AutoDataAnalyst.RealTimeExtractor import RealTimeExtractor
+from src.data_pipeline.data_ingestion import DataIngestionEngine
+from src.data_pipeline.replay_source import BarReplaySource, ReplayDataIngestionEngine, ReplayRealTimeExtractor
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+
+def bars(timestamps, start_price=100.0):
+    index = pd.DatetimeIndex(timestamps, tz='UTC')
+    close = start_price + np.arange(len(index), dtype=float)
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': np.full(len(index), 1000.0)}, index=index)
+
+def test_replay_merges_symbols_in_timestamp_order():
+    source = BarReplaySource({
+        'BBB': bars(['2024-01-02 09:30', '2024-01-02 09:32', '2024-01-02 09:34']),
+        'AAA': bars(['2024-01-02 09:31', '2024-01-02 09:32', '2024-01-02 09:33', '2024-01-02 09:35'], 200)
+    })
+    events = list(source.replay())
+
+    assert len(events) == 7
+    assert [e.timestamp for e in events] == sorted(e.timestamp for e in events)
+    # Ties break by symbol, and each symbol keeps its own bar order
+    assert [e.symbol for e in events] == ['BBB', 'AAA', 'AAA', 'BBB', 'AAA', 'BBB', 'AAA']
+    for symbol, df in source.data.items():
+        assert [e.close for e in events if e.symbol == symbol] == df['Close'].tolist()
+    assert source.cursor['AAA'] == events[-1]
+
+def test_bar_event_time_matches_history_index():
+    data = SyntheticMarketGenerator(seed=3).generate(['SYN'], days=5)
+    data['SYN'].index = data['SYN'].index.tz_localize('America/New_York')
+    events = list(BarReplaySource(data).replay())
+
+    assert isinstance(events[0].timestamp, int)
+    assert [e.time for e in events] == list(data['SYN'].index)
+
+def test_speed_paces_replay():
+    source = BarReplaySource({'AAA': bars(['2024-01-02 09:30:00', '2024-01-02 09:30:01', '2024-01-02 09:30:02'])})
+
+    begin = time.perf_counter()
+    list(source.replay(speed=20))
+    assert time.perf_counter() - begin >= 0.09
+
+    async def drain():
+        return [bar async for bar in source.areplay(speed=20)]
+    begin = time.perf_counter()
+    assert len(asyncio.run(drain())) == 3
+    assert time.perf_counter() - begin >= 0.09
+
+def test_last_stats_count_consumed_events():
+    source = BarReplaySource.synthetic(['AAA', 'BBB'], days=10)
+    list(source.replay())
+    assert source.last_stats['events'] == 20
+    assert source.last_stats['events_per_s'] > 0
+
+    replay = source.replay()
+    for _ in range(3):
+        next(replay)
+    replay.close()
+    assert source.last_stats['events'] == 3
+
+def test_from_directory_round_trip(tmp_path):
+    data = SyntheticMarketGenerator(seed=4).generate(['AAA', 'BBB'], days=30)
+    for symbol, df in data.items():
+        df.index = df.index.tz_localize('America/New_York')
+        df.to_csv(tmp_path / f"{symbol}.csv")
+    (tmp_path / 'notes.txt').write_text('ignored')
+
+    source = BarReplaySource.from_directory(str(tmp_path))
+    assert source.symbols == ['AAA', 'BBB']
+    for symbol, df in data.items():
+        expected = df.tz_convert('UTC')
+        expected.index = expected.index.as_unit(source.data[symbol].index.unit)
+        pd.testing.assert_frame_equal(source.data[symbol], expected, check_freq=False, check_names=False)
+
+    assert BarReplaySource.from_directory(str(tmp_path), symbols=['BBB']).symbols == ['BBB']
+
+@pytest.mark.parametrize('period,first', [
+    ('5d', '2024-06-24'), ('1wk', '2024-06-24'), ('1mo', '2024-05-29'),
+    ('1y', '2023-06-29'), ('ytd', '2024-01-01'), ('max', '2023-01-02'), (None, '2023-01-02')
+])
+def test_history_trims_to_period(period, first):
+    index = pd.bdate_range('2023-01-02', '2024-06-28', tz='UTC')
+    source = BarReplaySource({'AAA': bars(index)})
+
+    history = source.history('AAA', period)
+    assert history.index[0] == pd.Timestamp(first, tz='UTC')
+    assert history.index[-1] == index[-1]
+    assert source.history('MISSING', '1y') is None
+
+@pytest.mark.parametrize('replay,real', [
+    (ReplayDataIngestionEngine, DataIngestionEngine),
+    (ReplayRealTimeExtractor, RealTimeExtractor)
+])
+def test_replay_engines_match_real_interfaces(replay, real):
+    public = lambda cls: {name for name in vars(cls) if not name.startswith('_')}
+    assert public(replay) == public(real)
+    for name in public(real):
+        assert inspect.signature(getattr(replay, name)) == inspect.signature(getattr(real, name))
+
+def test_replay_engines_serve_recorded_data():
+    source = BarReplaySource.synthetic(['AAA', 'BBB'], days=300)
+    engine = ReplayDataIngestionEngine(source)
+
+    assert set(engine.get_financial_data(['AAA', 'BBB', 'CCC'], period='1y')) == {'AAA', 'BBB'}
+    assert engine.get_intraday_data(['AAA'], period='5d')['AAA'].equals(source.history('AAA', '5d'))
+
+    extractor = ReplayRealTimeExtractor(source)
+    before = extractor.get_financial_data(['AAA'])['AAA']['current_price']
+    assert before == source.data['AAA']['Close'].iloc[-1]
+    # Once replay starts, quotes follow the cursor
+    bar = next(source.replay())
+    assert extractor.get_financial_data([bar.symbol])[bar.symbol]['current_price'] == bar.close
+    assert extractor.get_financial_data(['CCC'])['CCC'] is None
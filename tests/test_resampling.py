@@ -0,0 +1,59 @@
+# test_resampling.py
+"""Intraday bar resampling tests"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_pipeline.resampling import BarResampler
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+
+OHLCV = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+def intraday_bars(days=5, drop_fraction=0.1, seed=3):
+    """Minute bars with random missing bars, one missing session and pre-market noise"""
+    _, bars = next(SyntheticMarketGenerator(seed).iter_intraday(['SYN'], days=days))
+    rng = np.random.default_rng(seed)
+    bars = bars[rng.random(len(bars)) > drop_fraction]
+    bars = bars[bars.index.normalize() != bars.index.normalize()[len(bars) // 2]]
+
+    premarket = bars.iloc[:3].copy()
+    premarket.index = premarket.index - pd.Timedelta('2h')
+    return pd.concat([premarket, bars]).sort_index()
+
+def pandas_reference(bars, rule, offset=None):
+    local = bars.tz_convert('America/New_York').between_time('09:30', '15:59')
+    expected = local.resample(rule, offset=offset).agg(OHLCV).dropna(subset=['Open'])
+    expected.index = expected.index.as_unit('ns')
+    return expected
+
+@pytest.mark.parametrize('rule,offset', [('5min', None), ('15min', None), ('1h', '30min')])
+def test_resample_matches_pandas(rule, offset):
+    bars = intraday_bars()
+    result = BarResampler().resample(bars, rule)
+    pd.testing.assert_frame_equal(result, pandas_reference(bars, rule, offset), check_freq=False)
+
+def test_utc_input_matches_local_input():
+    bars = intraday_bars()
+    resampler = BarResampler()
+    utc = bars.tz_convert('UTC')
+
+    pd.testing.assert_frame_equal(resampler.resample(utc, '5min'), resampler.resample(bars, '5min'))
+    pd.testing.assert_frame_equal(resampler.to_daily(utc), resampler.to_daily(bars))
+
+def test_to_daily_matches_pandas_and_skips_missing_sessions():
+    bars = intraday_bars()
+    result = BarResampler().to_daily(bars)
+
+    pd.testing.assert_frame_equal(result, pandas_reference(bars, '1D'), check_freq=False)
+    assert len(result) == 4
+
+def test_fill_gaps_flags_missing_bars():
+    bars = intraday_bars(drop_fraction=0.2)
+    resampler = BarResampler()
+    filled = resampler.fill_gaps(bars)
+
+    in_session = len(pandas_reference(bars, '1min'))
+    assert len(filled) == 4 * resampler.calendar.minutes_per_session()
+    assert filled['gap'].sum() == len(filled) - in_session
+    assert not filled[['Open', 'High', 'Low', 'Close']].iloc[1:].isna().any().any()
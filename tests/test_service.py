@@ -0,0 +1,49 @@
+# test_service.py
+"""Pipeline service dispatch tests"""
+
+import dataclasses
+
+import pytest
+
+from src.orchestration.service import PipelineService, ServiceState, create_server
+from src.utils.config_loader import ConfigLoader
+
+@pytest.fixture
+def service(tmp_path):
+    return PipelineService(ConfigLoader(str(tmp_path / 'config.yaml')), data_engine=object(), cache_ttl=0)
+
+def test_bad_params_are_400_before_the_handler_runs(service):
+    status, payload = service.handle('GET', '/score', {'symbol': 'AAPL'})
+    assert status == 400
+    assert 'symbol' in payload['error']
+    assert '/score' not in service.latency
+
+def test_internal_type_error_is_500(service):
+    def broken(symbols=None):
+        return None + 1
+    service.routes[('GET', '/score')] = broken
+
+    status, payload = service.handle('GET', '/score', {'symbols': ['AAPL']})
+    assert status == 500
+    assert payload['error'].startswith('TypeError')
+
+def test_swap_state_publishes_a_new_frozen_generation(service):
+    first = ServiceState(prices={'AAPL': None})
+    service.swap_state(first)
+
+    assert service.state.version == 1 and first.version == 0
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        service.state.version = 5
+
+def test_create_server_refuses_to_unlink_regular_files(service, tmp_path):
+    path = tmp_path / 'service.sock'
+    path.write_text('keep me')
+
+    with pytest.raises(FileExistsError):
+        create_server(service, unix_socket=str(path))
+    assert path.read_text() == 'keep me'
+
+    path.unlink()
+    create_server(service, unix_socket=str(path)).server_close()
+    server = create_server(service, unix_socket=str(path))
+    server.server_close()
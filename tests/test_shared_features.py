@@ -0,0 +1,81 @@
+# test_shared_features.py
+"""Shared-memory feature matrix tests"""
+
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_pipeline.enhanced_features import EnhancedFeatureEngine
+from src.data_pipeline.synthetic_data import SyntheticMarketGenerator
+from src.ml_pipeline.shared_features import SharedFeatureMatrix, time_series_folds
+
+model_selection = pytest.importorskip('sklearn.model_selection')
+
+@pytest.fixture(scope='module')
+def features():
+    prices = SyntheticMarketGenerator(seed=21).generate(['SYN'], days=400)['SYN']
+    return EnhancedFeatureEngine().create_enhanced_features(prices)
+
+def train_in_worker(matrix):
+    """Runs in a child process that attaches to the matrix by name"""
+    from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+    return OptimizedMLTrainingEngine().train_optimized_models(matrix)
+
+@pytest.mark.parametrize('n_samples,kwargs', [
+    (100, {'n_splits': 3}),
+    (101, {'n_splits': 5}),
+    (250, {'n_splits': 4, 'test_size': 20, 'gap': 3}),
+    (250, {'n_splits': 3, 'max_train_size': 50})
+])
+def test_folds_match_time_series_split(n_samples, kwargs):
+    expected = model_selection.TimeSeriesSplit(**kwargs).split(np.zeros(n_samples))
+    folds = list(time_series_folds(n_samples, **kwargs))
+
+    expected = list(expected)
+    assert len(folds) == len(expected)
+    for (train, test), (train_idx, test_idx) in zip(folds, expected):
+        np.testing.assert_array_equal(np.arange(n_samples)[train], train_idx)
+        np.testing.assert_array_equal(np.arange(n_samples)[test], test_idx)
+
+def test_too_many_splits_raise():
+    with pytest.raises(ValueError):
+        list(time_series_folds(3, n_splits=3))
+
+def test_round_trip_and_zero_copy_folds(features):
+    # Timestamps are stored as int64 nanoseconds
+    expected = features.copy()
+    expected.index = expected.index.as_unit('ns')
+
+    with SharedFeatureMatrix.from_frame(features) as matrix:
+        pd.testing.assert_frame_equal(matrix.to_frame(), expected, check_dtype=False, check_freq=False)
+
+        X_train, X_test, _, _ = next(matrix.fold_views())
+        assert np.shares_memory(X_train, matrix.X) and np.shares_memory(X_test, matrix.X)
+
+        attached = pickle.loads(pickle.dumps(matrix))
+        try:
+            assert attached.owner is False
+            np.testing.assert_array_equal(attached.X, matrix.X)
+        finally:
+            attached.close()
+
+def test_shared_training_matches_in_process(features):
+    from src.ml_pipeline.model_training import MLTrainingEngine
+    from src.ml_pipeline.optimized_training import OptimizedMLTrainingEngine
+
+    X, y = features.drop(columns='target'), features['target']
+    expected_optimized = OptimizedMLTrainingEngine().train_optimized_models(X, y)
+    expected_ensemble = MLTrainingEngine().train_ensemble_model(X, y)
+
+    with SharedFeatureMatrix.from_frame(features) as matrix:
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            from_worker = pool.submit(train_in_worker, matrix).result()
+        in_process = MLTrainingEngine().train_ensemble_model(matrix)
+
+    assert from_worker == expected_optimized
+    assert in_process == expected_ensemble
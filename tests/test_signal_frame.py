@@ -0,0 +1,94 @@
+# test_signal_frame.py
+"""Columnar signal frame tests against the dict-based strategy it replaced"""
+
+import numpy as np
+import pytest
+
+from src.analytics_engine.signal_frame import BUY, HOLD, STRONG_BUY, SignalFrame
+from src.analytics_engine.trading_strategy import TradingStrategy
+
+def legacy_signals(model_results, min_confidence=0.55):
+    """The per-symbol loop generate_signals ran before SignalFrame"""
+    signals = {}
+    for symbol, results in model_results.items():
+        if results:
+            best_acc = max(r['accuracy'] for r in results.values())
+            if best_acc >= min_confidence and best_acc > 0.60:
+                signal, confidence = "STRONG_BUY", "HIGH"
+            elif best_acc >= min_confidence and best_acc > 0.55:
+                signal, confidence = "BUY", "MEDIUM"
+            else:
+                signal, confidence = "HOLD", "LOW"
+            signals[symbol] = {
+                'signal': signal,
+                'confidence': confidence,
+                'accuracy': best_acc,
+                'action': 'BUY' if signal in ['STRONG_BUY', 'BUY'] else 'HOLD'
+            }
+    return signals
+
+def legacy_positions(signals, portfolio_value=10000):
+    """The per-symbol loop calculate_position_size ran before SignalFrame"""
+    strong = [s for s in signals.values() if s['signal'] == 'STRONG_BUY']
+    medium = [s for s in signals.values() if s['signal'] == 'BUY']
+    if strong:
+        strong_allocation = portfolio_value * 0.6 / len(strong)
+        medium_allocation = portfolio_value * 0.4 / len(medium) if medium else 0
+    else:
+        strong_allocation = 0
+        medium_allocation = portfolio_value * 1.0 / len(medium) if medium else 0
+    return {
+        symbol: strong_allocation if s['signal'] == 'STRONG_BUY' else medium_allocation if s['signal'] == 'BUY' else 0
+        for symbol, s in signals.items()
+    }
+
+def random_model_results(seed):
+    """Model results with boundary accuracies, and some symbols without any models"""
+    rng = np.random.default_rng(seed)
+    grid = [0.5, 0.549, 0.55, 0.551, 0.58, 0.6, 0.601, 0.7]
+    results = {}
+    for i in range(int(rng.integers(0, 25))):
+        n_models = int(rng.integers(0, 3))
+        results[f"SYM{i}"] = {
+            f"model_{m}": {'accuracy': float(rng.choice(grid)) if rng.random() < 0.5 else float(rng.uniform(0.45, 0.7))}
+            for m in range(n_models)
+        }
+    return results
+
+@pytest.mark.parametrize('seed', range(40))
+@pytest.mark.parametrize('min_confidence', [0.5, 0.55, 0.58])
+def test_matches_legacy_signals_and_positions(seed, min_confidence):
+    model_results = random_model_results(seed)
+    strategy = TradingStrategy()
+    expected = legacy_signals(model_results, min_confidence)
+
+    signals = strategy.generate_signals(model_results, min_confidence)
+    assert signals == expected
+    assert strategy.calculate_position_size(signals, 25000) == pytest.approx(legacy_positions(expected, 25000))
+
+    frame = strategy.allocate(strategy.generate_signal_frame(model_results, min_confidence), 25000)
+    assert frame.positions() == pytest.approx(legacy_positions(expected, 25000))
+    assert SignalFrame.from_signals(signals).to_dict() == expected
+
+@pytest.mark.parametrize('accuracy,code', [
+    (0.549, HOLD), (0.55, HOLD), (0.551, BUY), (0.60, BUY), (0.601, STRONG_BUY)
+])
+def test_threshold_boundaries(accuracy, code):
+    frame = TradingStrategy().generate_signal_frame({'AAA': {'rf': {'accuracy': accuracy}}})
+    assert frame.codes.tolist() == [code]
+
+def test_empty_results_and_symbols_without_models():
+    strategy = TradingStrategy()
+    assert strategy.generate_signals({}) == {}
+    assert strategy.calculate_position_size({}) == {}
+
+    frame = strategy.generate_signal_frame({'AAA': {}, 'BBB': None})
+    assert len(frame) == 0
+    assert strategy.allocate(frame).positions() == {}
+
+def test_frame_argument_is_updated_in_place():
+    frame = SignalFrame(['AAA', 'BBB', 'CCC'], [0.70, 0.57, 0.40])
+    returned = TradingStrategy().generate_signal_frame(frame)
+
+    assert returned is frame
+    assert frame.codes.tolist() == [STRONG_BUY, BUY, HOLD]
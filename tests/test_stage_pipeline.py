@@ -0,0 +1,92 @@
+# test_stage_pipeline.py
+"""Stage pipeline tests"""
+
+import threading
+import time
+
+import pytest
+
+from src.orchestration.stage_pipeline import StagePipeline
+
+def test_worker_errors_are_reported_and_printed(capsys):
+    def parse(key, value):
+        return int(value)
+
+    def double(key, value):
+        return value * 2
+
+    pipeline = StagePipeline([('parse', parse, 2), ('double', double, 1)], queue_size=2)
+    results = pipeline.run([('a', '1'), ('b', 'x'), ('c', '3')])
+
+    assert results == {'a': 2, 'c': 6}
+    assert list(pipeline.report['errors']) == ['b']
+    assert pipeline.report['errors']['b'].startswith('parse: ValueError')
+    assert "b failed in parse: ValueError" in capsys.readouterr().out
+
+def tracked(name, seconds, log, active, peak, lock):
+    """Stage fn that sleeps and records its (name, start, end) and peak concurrency"""
+    def fn(key, value):
+        with lock:
+            active[name] += 1
+            peak[name] = max(peak[name], active[name])
+        start = time.perf_counter()
+        time.sleep(seconds)
+        end = time.perf_counter()
+        with lock:
+            active[name] -= 1
+            log.append((name, key, start, end))
+        return value
+    return fn
+
+@pytest.fixture
+def timed_run():
+    log, lock = [], threading.Lock()
+    active, peak = {'fetch': 0, 'train': 0}, {'fetch': 0, 'train': 0}
+    pipeline = StagePipeline([
+        ('fetch', tracked('fetch', 0.03, log, active, peak, lock), 3),
+        ('train', tracked('train', 0.03, log, active, peak, lock), 1)
+    ], queue_size=2)
+    results = pipeline.run((i, i) for i in range(9))
+    return pipeline, results, log, peak
+
+def test_stages_overlap(timed_run):
+    _, results, log, _ = timed_run
+    assert results == {i: i for i in range(9)}
+
+    last_fetch_end = max(end for name, _, _, end in log if name == 'fetch')
+    first_train_start = min(start for name, _, start, _ in log if name == 'train')
+    assert first_train_start < last_fetch_end
+
+def test_per_stage_concurrency_is_honored(timed_run):
+    _, _, _, peak = timed_run
+    assert peak == {'fetch': 3, 'train': 1}
+
+def test_report_utilization_and_critical_path(timed_run):
+    pipeline, _, log, _ = timed_run
+    report = pipeline.report
+
+    assert report['completed'] == 9 and report['errors'] == {}
+    for name, workers in (('fetch', 3), ('train', 1)):
+        stats = report['stages'][name]
+        busy = sum(end - start for stage, _, start, end in log if stage == name)
+        assert stats['items'] == 9 and stats['workers'] == workers
+        assert stats['busy_s'] == pytest.approx(busy, rel=0.2)
+        assert stats['utilization'] == pytest.approx(busy / (workers * report['wall_time_s']), rel=0.2)
+    # The single trainer is the bottleneck
+    assert report['stages']['train']['utilization'] > report['stages']['fetch']['utilization']
+
+    path = report['critical_path']
+    last_key = max((entry for entry in log if entry[0] == 'train'), key=lambda entry: entry[3])[1]
+    assert path['key'] == last_key
+    assert [segment['stage'] for segment in path['segments']] == ['fetch', 'train']
+    assert all(segment['wait_s'] >= 0 and segment['service_s'] >= 0.03 for segment in path['segments'])
+    assert path['segments'][-1]['finished_at_s'] <= report['wall_time_s']
+
+@pytest.mark.parametrize('stages,queue_size', [
+    ([('fetch', lambda k, v: v, 0)], 4),
+    ([('fetch', lambda k, v: v, 1)], 0),
+    ([], 4)
+])
+def test_invalid_configuration_raises(stages, queue_size):
+    with pytest.raises(ValueError):
+        StagePipeline(stages, queue_size=queue_size)
@@ -0,0 +1,70 @@
+# test_streaming_metrics.py
+"""Streaming metrics rollup tests"""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.analytics_engine.business_analytics import BusinessAnalytics
+from src.analytics_engine.streaming_metrics import MetricAccumulator, StreamingAnalytics
+
+HOUR = 3600
+
+def stored_buckets(path):
+    conn = sqlite3.connect(path)
+    try:
+        return sorted(b for (b,) in conn.execute("SELECT bucket FROM rollups WHERE metric = 'x'"))
+    finally:
+        conn.close()
+
+def test_accumulator_matches_numpy():
+    values = np.random.default_rng(0).normal(0.5, 0.1, 1000)
+    acc = MetricAccumulator()
+    for value in values:
+        acc.update(value)
+    summary = acc.summary()
+
+    assert summary['mean'] == pytest.approx(values.mean())
+    assert summary['std'] == pytest.approx(values.std(ddof=1))
+    assert summary['p50'] == pytest.approx(np.quantile(values, 0.5), rel=0.02)
+
+def test_rollover_flushes_and_evicts(tmp_path):
+    path = str(tmp_path / 'rollups.sqlite')
+    streaming = StreamingAnalytics(path, bucket_seconds=HOUR, retention_seconds=2 * HOUR)
+
+    for hour in range(5):
+        streaming.record('x', hour, timestamp=hour * HOUR)
+
+    # Every closed bucket is on disk; memory keeps only the retention window
+    assert stored_buckets(path) == [0, HOUR, 2 * HOUR, 3 * HOUR]
+    assert sorted(streaming.buckets['x']) == [2 * HOUR, 3 * HOUR, 4 * HOUR]
+
+    streaming.record('x', 99, timestamp=0)
+    assert streaming.late == 1
+
+    streaming.close()
+    assert stored_buckets(path) == [0, HOUR, 2 * HOUR, 3 * HOUR, 4 * HOUR]
+
+def test_reload_restores_retained_buckets(tmp_path):
+    path = str(tmp_path / 'rollups.sqlite')
+    with StreamingAnalytics(path, bucket_seconds=HOUR, retention_seconds=HOUR) as streaming:
+        for hour in range(4):
+            streaming.record('x', hour, timestamp=hour * HOUR)
+
+    reloaded = StreamingAnalytics(path, bucket_seconds=HOUR, retention_seconds=HOUR)
+    assert sorted(reloaded.buckets['x']) == [2 * HOUR, 3 * HOUR]
+    assert reloaded.query('x', HOUR, end=3 * HOUR).stats.mean == pytest.approx(2.5)
+
+def test_metrics_and_reports_do_not_record_results():
+    analytics = BusinessAnalytics(StreamingAnalytics())
+    model_results = {'AAA': {'rf': {'accuracy': 0.6}}, 'BBB': {'rf': {'accuracy': 0.5}}}
+
+    analytics.calculate_performance_metrics(model_results)
+    analytics.generate_performance_report(model_results)
+    assert analytics.rolling_performance_metrics() == {}
+
+    analytics.record_results(model_results)
+    rolling = analytics.rolling_performance_metrics()
+    assert rolling['total_observations'] == 2
+    assert rolling['success_rate'] == pytest.approx(0.5)
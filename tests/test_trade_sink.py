@@ -0,0 +1,51 @@
+# test_trade_sink.py
+"""Trade sink and execution report tests"""
+
+import json
+
+from src.analytics_engine.report_generation import ReportGenerator
+from src.analytics_engine.trade_sink import TradeReportSink
+
+TRADES = [
+    {'symbol': 'AAPL', 'action': 'BUY', 'quantity': 10, 'price': 150.0},
+    {'symbol': 'MSFT', 'action': 'SELL', 'quantity': 5, 'price': 300.0},
+    {'symbol': 'AAPL', 'action': 'SELL', 'quantity': 10, 'price': 155.0}
+]
+
+def test_reopened_sink_summary_matches_file(tmp_path):
+    path = str(tmp_path / 'trades.jsonl')
+    with TradeReportSink(path) as sink:
+        sink.extend(TRADES)
+    with TradeReportSink(path) as sink:
+        sink.extend(TRADES)
+
+    assert sink.summary()['total_trades'] == 6
+    assert sink.summary()['sell_trades'] == 4
+    assert sum(1 for _ in sink.iter_trades()) == 6
+
+def test_sink_without_append_truncates(tmp_path):
+    path = str(tmp_path / 'trades.jsonl')
+    with TradeReportSink(path) as sink:
+        sink.extend(TRADES)
+    with TradeReportSink(path, append=False) as sink:
+        sink.extend(TRADES[:1])
+
+    assert len(sink) == 1
+    assert list(sink.iter_trades()) == TRADES[:1]
+
+def test_execution_report_from_sink_is_json_serializable(tmp_path):
+    with TradeReportSink(str(tmp_path / 'trades.jsonl')) as sink:
+        sink.extend(TRADES)
+    generator = ReportGenerator()
+
+    summary = generator.generate_execution_report(sink)
+    assert 'trades' not in summary
+    assert json.loads(json.dumps(summary))['total_trades'] == 3
+
+    detailed = generator.generate_execution_report(sink, include_trades=True)
+    assert json.loads(json.dumps(detailed))['trades'] == TRADES
+
+def test_execution_report_from_list_includes_trades():
+    report = ReportGenerator().generate_execution_report(TRADES)
+    assert report['trades'] == TRADES
+    assert (report['buy_trades'], report['sell_trades']) == (1, 2)